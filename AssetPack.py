@@ -0,0 +1,137 @@
+# AssetPack.py
+# Binary sprite packs for the Raspberry Pi Pico Game Boy
+#
+# A pack is a small index followed by raw pixel data, so a game loads only
+# the sprites its current scene needs instead of importing bytearray
+# literals of every asset:
+#
+#   header   '<4sHH'         magic b'PGBA', version, number of entries
+#   entry    '<16sHHBBHII'   name, width, height, framebuf format, flags,
+#                            number of palette colors, data offset, data size
+#   data     raw pixels of each entry, followed by its palette (one
+#            little-endian word per color, as returned by Chimera.color)
+#            and, if the KEYED flag is set, by its transparent key color
+#            (or palette index) as one more word
+#
+# Sounds are entries of format PCM8: unsigned 8-bit mono samples, with the
+# sample rate as width and a height of 1.
+#
+# Entry names are at most 16 bytes and are also the names the sprites get
+# in the PicoGameBoy registry, so prefix them with the name of the game.
+# tools/pgb_assets.py builds packs from images and WAV files.
+
+import struct
+
+MAGIC = b'PGBA'
+VERSION = 1
+HEADER = '<4sHH'
+ENTRY = '<16sHHBBHII'
+HEADER_SIZE = struct.calcsize(HEADER)
+ENTRY_SIZE = struct.calcsize(ENTRY)
+PCM8 = 0x80  # Format of sound entries, not a framebuf format
+KEYED = 0x01  # Entry flag: a transparent key follows the palette
+
+
+class AssetPack:
+    def __init__(self, path):
+        """
+        Open the pack at `path` and read its index. The pixel data stays on
+        the file system until read() asks for it.
+        """
+        self.path = path
+        self._file = open(path, 'rb')
+        magic, version, count = struct.unpack(HEADER, self._file.read(HEADER_SIZE))
+        if magic != MAGIC:
+            self._file.close()
+            raise ValueError('%s is not an asset pack.' % path)
+        if version != VERSION:
+            self._file.close()
+            raise ValueError('Unsupported asset pack version %d.' % version)
+        index = self._file.read(ENTRY_SIZE * count)
+        self._entries = {}
+        for i in range(count):
+            name, w, h, fmt, flags, colors, offset, size = struct.unpack_from(
+                ENTRY, index, i * ENTRY_SIZE)
+            self._entries[name.rstrip(b'\x00').decode()] = (w, h, fmt, flags, colors, offset, size)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self._file.close()
+
+    def names(self):
+        return list(self._entries)
+
+    def info(self, name):
+        # (width, height, framebuf format, size of the pixel data in bytes)
+        w, h, fmt, _, _, _, size = self._entries[name]
+        return w, h, fmt, size
+
+    def read(self, name, buffer=None):
+        """
+        Read the pixels of entry `name` into `buffer`, which must hold at
+        least info(name)[3] bytes, or into a new bytearray. Reusing one
+        buffer between scenes avoids fragmenting the heap.
+        """
+        size = self._entries[name][6]
+        if buffer is None:
+            buffer = bytearray(size)
+        elif len(buffer) < size:
+            raise ValueError('Buffer too small for %s (%d bytes).' % (name, size))
+        self._file.seek(self._entries[name][5])
+        if self._file.readinto(memoryview(buffer)[:size]) != size:
+            raise OSError('Truncated asset pack %s.' % self.path)
+        return buffer
+
+    def key(self, name):
+        # The transparent key of an entry, -1 if it has none
+        _, _, _, flags, colors, offset, size = self._entries[name]
+        if not flags & KEYED:
+            return -1
+        self._file.seek(offset + size + 2 * colors)
+        return struct.unpack('<H', self._file.read(2))[0]
+
+    def palette(self, name):
+        # The colors of a palettized entry as a list, None for RGB565 entries
+        _, _, _, _, colors, offset, size = self._entries[name]
+        if colors == 0:
+            return None
+        self._file.seek(offset + size)
+        return list(struct.unpack('<%dH' % colors, self._file.read(2 * colors)))
+
+
+def write_pack(path, assets):
+    """
+    Write a pack from `assets`, a list of (name, width, height, format, data,
+    palette[, key]) tuples where palette is None or a list of colors and key
+    the transparent color or index (-1 for none). Used by the asset tools on
+    the host; the games only read packs.
+    """
+    offset = HEADER_SIZE + ENTRY_SIZE * len(assets)
+    index = []
+    for asset in assets:
+        name, w, h, fmt, data, palette = asset[:6]
+        key = asset[6] if len(asset) > 6 else -1
+        raw = name.encode()
+        if len(raw) > 16:
+            raise ValueError('Asset name %s is longer than 16 bytes.' % name)
+        colors = len(palette) if palette else 0
+        flags = KEYED if key != -1 else 0
+        index.append(struct.pack(ENTRY, raw, w, h, fmt, flags, colors, offset, len(data)))
+        offset += len(data) + 2 * colors + (2 if flags else 0)
+    with open(path, 'wb') as f:
+        f.write(struct.pack(HEADER, MAGIC, VERSION, len(assets)))
+        for entry in index:
+            f.write(entry)
+        for asset in assets:
+            data, palette = asset[4], asset[5]
+            key = asset[6] if len(asset) > 6 else -1
+            f.write(data)
+            if palette:
+                f.write(struct.pack('<%dH' % len(palette), *palette))
+            if key != -1:
+                f.write(struct.pack('<H', key))
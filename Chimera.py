@@ -2,6 +2,7 @@ from machine import Pin, PWM, SPI
 from time import sleep
 import framebuf
 import gc
+import _thread
 
 # Subclassing FrameBuffer provides support for graphics primitives
 # http://docs.micropython.org/en/latest/pyboard/library/framebuf.html
@@ -73,12 +74,50 @@ class Chimera(framebuf.FrameBuffer):
     ENABLE3G = b'\xF2'  # Enable 3 gamma control
     PUMPRC = b'\xF7'  # Pump ratio control
 
+    MAX_DIRTY = 4  # Damaged rectangles kept before they get merged together
+    PIPELINE_HEADROOM = 16 * 1024  # Heap left free after allocating a back buffer
+    CHUNK_ROWS = 8  # Rows expanded to RGB565 at a time when showing an indexed buffer
+
+    # Bits per pixel -> frame buffer format
+    FORMATS = {
+        16: framebuf.RGB565,
+        8: framebuf.GS8,
+        4: framebuf.GS4_HMSB
+    }
+
 
     def __init__(self, width=320, height=240, id_=0, sck=18, mosi=19,
-                 dc=15, rst=14, cs=17, baudrate=62500000, rotation=90):
+                 dc=15, rst=14, cs=17, baudrate=62500000, rotation=90,
+                 partial=True, framebuffer=True, bpp=16):
 
         self.width = width
         self.height = height
+        # With bpp=8 or 4 the frame buffer holds palette indices, expanded to
+        # RGB565 chunk by chunk in show() (see set_palette and palette_index)
+        if bpp not in self.FORMATS:
+            raise RuntimeError('bpp must be 16, 8 or 4.')
+        self.bpp = bpp
+        self._format = self.FORMATS[bpp]
+        if bpp != 16:
+            self._palette_buf = bytearray(2 << bpp)
+            self.palette = framebuf.FrameBuffer(self._palette_buf, 1 << bpp, 1, framebuf.RGB565)
+            self._colors = [0]  # index 0 starts out black
+            self._chunk = memoryview(bytearray(width * self.CHUNK_ROWS * 2))
+        # When partial is True, show() only sends the regions touched by the
+        # drawing primitives since the previous show()
+        self.partial = partial
+        self._dirty = []  # [x0, y0, x1, y1] rectangles, end exclusive
+        self._win = bytearray(4)
+        # Pipelined presentation (see start_pipeline)
+        self.pipelined = False
+        self._buffers = None
+        self._job = None
+        # Strip rendering (see render): drawing origin and the strip buffer
+        self._ox = 0
+        self._oy = 0
+        self._offscreen = False  # True while strips are drawn: no damage
+        self._strip = None
+        self._scroll = None  # [area start, area length, offset] (see scroll_area)
         self.spi = SPI(id_, sck=Pin(sck), mosi=Pin(mosi), baudrate=baudrate, polarity=0, phase=0)
         self.dc = Pin(dc, Pin.OUT)
         self.rst = Pin(rst, Pin.OUT)
@@ -89,7 +128,11 @@ class Chimera(framebuf.FrameBuffer):
         else:
             self.rotation = self.ANGLES[rotation]
         
-        self.create_buffer()
+        # Without a frame buffer the screen can only be drawn with render()
+        if framebuffer:
+            self.create_buffer()
+        else:
+            self.reset_buffer()
         self.init_display()
 
 
@@ -115,7 +158,7 @@ class Chimera(framebuf.FrameBuffer):
         self.write_cmd(self.VMCTR2, b'0\x86')  # VCOM ctrl 2
         self.write_cmd(self.MADCTL, bytes([self.rotation]))  # Memory access ctrl
         sleep(0.1)
-        self.write_cmd(self.VSCRSADD, b'\x00')  # Vertical scrolling start address
+        self.write_cmd(self.VSCRSADD, b'\x00\x00')  # Vertical scrolling start address
         self.write_cmd(self.PIXFMT, b'\x55')  # COLMOD: Pixel format
         self.write_cmd(self.FRMCTR1, b'\x00\x18')  # Frame rate ctrl
         self.write_cmd(self.DFUNCTR, b'\x08\x82\x27')
@@ -128,22 +171,54 @@ class Chimera(framebuf.FrameBuffer):
         sleep(.1)
         self.write_cmd(self.DISPLAY_ON)  # Display on
         sleep(.1)
-        super().fill(0)
-        self.show()
+        if len(self.buffer) == self.width * self.height * self.bpp // 8:
+            super().fill(0)
+            self.show(full=True)
+        else:
+            self.render(lambda fb: fb.fill(0))
         
         
     def reset_buffer(self):
         """
         Reduce the buffer to store two bytes (minimum), freeing up space for other things
         """
-        self.buffer = memoryview(bytearray(b'\x00\x00'))
-        super().__init__(self.buffer, 1, 1, framebuf.RGB565)
+        self.stop_pipeline()
+        self._bind(memoryview(bytearray(b'\x00\x00')), 1, 1)
+        self._dirty = []
         gc.collect()
         
         
     def create_buffer(self):
-        self.buffer = memoryview(bytearray(self.width * self.height * 2))
-        super().__init__(self.buffer, self.width, self.height, framebuf.RGB565)
+        self.stop_pipeline()
+        self._bind(memoryview(bytearray(self.width * self.height * self.bpp // 8)),
+                   self.width, self.height)
+
+    def _bind(self, buf, w, h):
+        # Point the FrameBuffer (and self.buffer) at another pixel buffer
+        self.buffer = buf
+        self._size = (w, h)
+        super().__init__(buf, w, h, self._format)
+
+    def set_palette(self, index, color):
+        # Set palette entry `index` to an RGB565 color from color(); the whole
+        # screen is sent again on the next show(), so palette swaps are free
+        self.palette.pixel(index, 0, color)
+        while len(self._colors) <= index:
+            self._colors.append(0)
+        self._colors[index] = color
+        self._dirty = [[0, 0, self.width, self.height]]
+
+    def palette_index(self, color):
+        # Index for an RGB565 color, adding it to the palette the first time
+        if self.bpp == 16:
+            return color
+        if color in self._colors:
+            return self._colors.index(color)
+        index = len(self._colors)
+        if index >= 1 << self.bpp:
+            raise RuntimeError('Palette is full.')
+        self.set_palette(index, color)
+        return index
          
          
     def reset(self):
@@ -167,18 +242,579 @@ class Chimera(framebuf.FrameBuffer):
 
     def rotate(self , angle):
         # Apply a new rotation to the screen
-        newAngle = 0x00
         if angle not in self.ANGLES.keys():
             raise RuntimeError('Angle must be 0, 90, 180 or 270.')
         else:
-            newAngle = self.ANGULOS[angle]
-        self.write_cmd(self.MADCTL, bytes([newAngle]))
+            self.rotation = self.ANGLES[angle]
+        self.wait()
+        self.write_cmd(self.MADCTL, bytes([self.rotation]))
+
+
+    def damage(self, x, y, w, h):
+        """
+        Mark the rectangle (x, y, w, h) as changed so the next show() sends it.
+        The drawing primitives call it themselves; call it directly only after
+        writing to self.buffer by hand.
+        """
+        x0 = x if x > 0 else 0
+        y0 = y if y > 0 else 0
+        x1 = x + w if x + w < self.width else self.width
+        y1 = y + h if y + h < self.height else self.height
+        if x1 <= x0 or y1 <= y0:
+            return
+        dirty = self._dirty
+        for r in dirty:
+            if x0 <= r[2] and r[0] <= x1 and y0 <= r[3] and r[1] <= y1:
+                # Overlapping or touching: grow the existing rectangle
+                if x0 < r[0]: r[0] = x0
+                if y0 < r[1]: r[1] = y0
+                if x1 > r[2]: r[2] = x1
+                if y1 > r[3]: r[3] = y1
+                return
+        dirty.append([x0, y0, x1, y1])
+        if len(dirty) > self.MAX_DIRTY:
+            self._merge_dirty()
+
+    def _merge_dirty(self):
+        # Merge the two rectangles whose bounding box wastes the least area
+        dirty = self._dirty
+        best = None
+        for i in range(len(dirty) - 1):
+            a = dirty[i]
+            for j in range(i + 1, len(dirty)):
+                b = dirty[j]
+                w = max(a[2], b[2]) - min(a[0], b[0])
+                h = max(a[3], b[3]) - min(a[1], b[1])
+                waste = w * h - (a[2] - a[0]) * (a[3] - a[1]) - (b[2] - b[0]) * (b[3] - b[1])
+                if best is None or waste < best:
+                    best = waste
+                    bi = i
+                    bj = j
+        a = dirty[bi]
+        b = dirty.pop(bj)
+        a[0] = min(a[0], b[0])
+        a[1] = min(a[1], b[1])
+        a[2] = max(a[2], b[2])
+        a[3] = max(a[3], b[3])
+
+    def set_window(self, x0, y0, x1, y1):
+        # Select the panel area (inclusive corners) that WRITE_RAM fills
+        win = self._win
+        win[0] = x0 >> 8
+        win[1] = x0 & 0xFF
+        win[2] = x1 >> 8
+        win[3] = x1 & 0xFF
+        self.write_cmd(self.SET_COLUMN, win)
+        win[0] = y0 >> 8
+        win[1] = y0 & 0xFF
+        win[2] = y1 >> 8
+        win[3] = y1 & 0xFF
+        self.write_cmd(self.SET_PAGE, win)
+
+    def _flush(self, buf, x0, y0, x1, y1):
+        # Send the area [x0, x1) x [y0, y1) of the frame buffer buf to the
+        # same place on the panel
+        if self.bpp != 16:
+            self._flush_indexed(buf, x0, y0, x1, y1)
+            return
+        if (x1 - x0) * 4 >= self.width * 3:
+            # Nearly full width: one contiguous transfer beats one per row
+            x0 = 0
+            x1 = self.width
+        self.set_window(x0, y0, x1 - 1, y1 - 1)
+        stride = self.width * 2
+        self.cs(0)
+        self.dc(0)
+        self.spi.write(self.WRITE_RAM)
+        self.dc(1)
+        if x1 - x0 == self.width:
+            self.spi.write(buf[y0 * stride:y1 * stride])
+        else:
+            start = y0 * stride + x0 * 2
+            end = start + (x1 - x0) * 2
+            for _ in range(y1 - y0):
+                self.spi.write(buf[start:end])
+                start += stride
+                end += stride
+        self.cs(1)
+
+    def _flush_indexed(self, buf, x0, y0, x1, y1):
+        # Expand palette indices to RGB565 a few rows at a time with the
+        # palette blit of FrameBuffer, sending each chunk as it is done
+        if buf is self.buffer:
+            src = self
+        else:
+            src = framebuf.FrameBuffer(buf, self.width, len(buf) * 8 // self.bpp // self.width,
+                                       self._format)
+        w = x1 - x0
+        rows = len(self._chunk) // (w * 2)
+        self.set_window(x0, y0, x1 - 1, y1 - 1)
+        self.cs(0)
+        self.dc(0)
+        self.spi.write(self.WRITE_RAM)
+        self.dc(1)
+        y = y0
+        while y < y1:
+            n = rows if y + rows <= y1 else y1 - y
+            chunk = framebuf.FrameBuffer(self._chunk, w, n, framebuf.RGB565)
+            chunk.blit(src, -x0, -y, -1, self.palette)
+            self.spi.write(self._chunk[:w * n * 2])
+            y += n
+        self.cs(1)
+
+    def _take_damage(self, full):
+        # Hand over the damage record as a list of rectangles to send
+        dirty = self._dirty
+        self._dirty = []
+        if full or not self.partial:
+            return [[0, 0, self.width, self.height]]
+        area = 0
+        for r in dirty:
+            area += (r[2] - r[0]) * (r[3] - r[1])
+        if area * 4 >= self.width * self.height * 3:
+            return [[0, 0, self.width, self.height]]
+        return dirty
+
+    def show(self, region=None, full=False):
+        """
+        Send the frame buffer to the screen.
+
+        By default only the rectangles damaged since the previous show() are
+        sent. region=(x, y, w, h) sends exactly that window instead and leaves
+        the damage record alone; full=True (or partial=False) sends the whole
+        frame in one transfer. With the pipeline running, show() is swap().
+        """
+        if region is not None:
+            x, y, w, h = region
+            x0 = max(x, 0)
+            y0 = max(y, 0)
+            x1 = min(x + w, self.width)
+            y1 = min(y + h, self.height)
+            if x1 > x0 and y1 > y0:
+                self.wait()
+                self._flush(self.buffer, x0, y0, x1, y1)
+            return
+        if self.pipelined:
+            self.swap(full)
+            return
+        for r in self._take_damage(full):
+            self._flush(self.buffer, r[0], r[1], r[2], r[3])
+
+    def start_pipeline(self):
+        """
+        Present frames from core 1 while core 0 draws the next one.
+
+        A second frame buffer is allocated and show() becomes swap(): the
+        finished frame is handed to core 1 for the SPI transfer and drawing
+        continues at once in the other buffer. Returns False, staying in
+        single-buffer mode, when the back buffer does not fit in the heap or
+        core 1 is already running something else (e.g. music).
+        """
+        if self.pipelined:
+            return True
+        size = self.width * self.height * self.bpp // 8
+        if len(self.buffer) != size:
+            return False
+        gc.collect()
+        if gc.mem_free() < size + self.PIPELINE_HEADROOM:
+            return False
+        try:
+            back = memoryview(bytearray(size))
+        except MemoryError:
+            return False
+        self._idle = _thread.allocate_lock()
+        self._pending = _thread.allocate_lock()
+        self._pending.acquire()
+        self._job = None
+        try:
+            _thread.start_new_thread(self._present_loop, ())
+        except OSError:
+            # core 1 is busy
+            self._idle = self._pending = None
+            gc.collect()
+            return False
+        back[:] = self.buffer
+        self._buffers = (self.buffer, back)
+        self.pipelined = True
+        return True
+
+    def stop_pipeline(self):
+        # Stop the core 1 presenter and free the spare buffer
+        if not self.pipelined:
+            return
+        self._idle.acquire()
+        self._job = None
+        self._pending.release()  # an empty job ends the loop
+        self._idle.acquire()
+        self._idle.release()
+        self.pipelined = False
+        self._buffers = None
+        self._idle = self._pending = None
+        gc.collect()
+
+    def wait(self):
+        # Fence: return once core 1 has finished sending the last frame
+        if self.pipelined:
+            self._idle.acquire()
+            self._idle.release()
+
+    def swap(self, full=False):
+        """
+        Queue the current buffer for presentation on core 1 and continue
+        drawing into the other one. Blocks only while the other buffer is
+        still being sent, so a buffer is never drawn into mid-transfer.
+        """
+        front = self.buffer
+        rects = self._take_damage(full)
+        self._idle.acquire()
+        self._job = (front, rects)
+        self._pending.release()
+        a, b = self._buffers
+        back = b if front is a else a
+        # back still holds the previous frame; bring it up to date by copying
+        # only what changed in this one (whole rows for packed indexed pixels)
+        stride = self.width * self.bpp // 8
+        for r in rects:
+            if r[2] - r[0] == self.width or self.bpp != 16:
+                back[r[1] * stride:r[3] * stride] = front[r[1] * stride:r[3] * stride]
+            else:
+                start = r[1] * stride + r[0] * 2
+                end = start + (r[2] - r[0]) * 2
+                for _ in range(r[3] - r[1]):
+                    back[start:end] = front[start:end]
+                    start += stride
+                    end += stride
+        self._bind(back, self.width, self.height)
+
+    def _present_loop(self):
+        # Runs on core 1: send every queued frame until an empty job arrives
+        while True:
+            self._pending.acquire()
+            job = self._job
+            if job is None:
+                break
+            buf, rects = job
+            for r in rects:
+                self._flush(buf, r[0], r[1], r[2], r[3])
+            self._idle.release()
+        self._idle.release()
+
+    def render(self, draw, band=16):
+        """
+        Draw the screen in horizontal strips of `band` rows using one small
+        buffer, so no full-screen frame buffer is needed (see reset_buffer()).
+
+        draw(self) is called once per strip and draws the whole frame in
+        screen coordinates with the usual primitives; whatever falls outside
+        the current strip is clipped away. visible(y, h) lets it skip work for
+        rows that are not in the strip.
+        """
+        saved = self._begin_offscreen(band)
+        try:
+            for y in range(0, self.height, band):
+                h = band if y + band <= self.height else self.height - y
+                self._draw_window(draw, 0, y, self.width, h, 0, y)
+        finally:
+            self._end_offscreen(saved)
+
+    def _begin_offscreen(self, band):
+        # Make sure the strip buffer holds at least `band` full rows and
+        # save the frame buffer state that _draw_window() changes
+        size = self.width * band * self.bpp // 8
+        if self._strip is None or len(self._strip) < size:
+            self._strip = None
+            gc.collect()
+            self._strip = memoryview(bytearray(size))
+        self.wait()
+        saved = (self.buffer, self._size, self._dirty)
+        # what the strips draw goes straight to the panel: the primitives
+        # skip damage() and what fill() or scroll() mark is dropped
+        self._dirty = []
+        self._offscreen = True
+        return saved
+
+    def _end_offscreen(self, saved):
+        buf, size, dirty = saved
+        self._ox = 0
+        self._oy = 0
+        self._bind(buf, size[0], size[1])
+        self._dirty = dirty
+        self._offscreen = False
+
+    def _draw_window(self, draw, x, y, w, h, px, py):
+        # Draw the screen area (x, y, w, h) into the strip buffer with
+        # draw(self), as many rows at a time as fit, and send it to the panel
+        # window whose top left corner is (px, py)
+        strip = self._strip
+        rows = len(strip) * 8 // (w * self.bpp)
+        while h > 0:
+            n = rows if rows < h else h
+            self._bind(strip, w, n)
+            self._ox = x
+            self._oy = y
+            draw(self)
+            self.set_window(px, py, px + w - 1, py + n - 1)
+            self.cs(0)
+            self.dc(0)
+            self.spi.write(self.WRITE_RAM)
+            self.dc(1)
+            if self.bpp == 16:
+                self.spi.write(strip[:w * n * 2])
+            else:
+                rows_chunk = len(self._chunk) // (w * 2)
+                done = 0
+                while done < n:
+                    k = rows_chunk if done + rows_chunk <= n else n - done
+                    chunk = framebuf.FrameBuffer(self._chunk, w, k, framebuf.RGB565)
+                    chunk.blit(self, 0, -done, -1, self.palette)
+                    self.spi.write(self._chunk[:w * k * 2])
+                    done += k
+            self.cs(1)
+            y += n
+            py += n
+            h -= n
+
+    def visible(self, y, h, x=0, w=None):
+        # True if rows [y, y + h) (and columns [x, x + w) when w is given)
+        # are inside the area being drawn by render() or refresh()
+        if w is not None and (x >= self._ox + self._size[0] or x + w <= self._ox):
+            return False
+        return y < self._oy + self._size[1] and y + h > self._oy
+
+    # Hardware scrolling. The panel scrolls along its 320 line axis, which is
+    # x in the 90/270 rotations and y in the 0/180 ones. Everything below
+    # works in screen coordinates along that axis; the MY bit of MADCTL
+    # mirrors the frame memory lines, which only flips the sign of the
+    # start address written to the panel.
+
+    def _scroll_axis(self):
+        # (scroll axis is x, length of the axis, frame memory lines mirrored)
+        horizontal = bool(self.rotation & 0x20)
+        return horizontal, self.width if horizontal else self.height, bool(self.rotation & 0x80)
+
+    def scroll_area(self, start=0, end=0):
+        """
+        Set up hardware scrolling: `start` lines at the beginning and `end`
+        lines at the end of the scroll axis stay fixed, the rest scrolls.
+        Scrolling starts at offset 0.
+
+        While the offset is not 0, show() writes frame memory without taking
+        it into account; draw with scroll_by() and refresh() instead.
+        """
+        horizontal, n, mirrored = self._scroll_axis()
+        length = n - start - end
+        if mirrored:
+            start, end = end, start
+        self.wait()  # Not in the middle of a frame on core 1
+        self.write_cmd(self.VSCRDEF, bytes([start >> 8, start & 0xFF, length >> 8,
+                                            length & 0xFF, end >> 8, end & 0xFF]))
+        self._scroll = [end if mirrored else start, length, 0]
+        self.scroll_to(0)
+
+    def scroll_to(self, offset):
+        # Show the scroll area moved back by `offset` lines: the screen line
+        # at s shows what refresh() drew for line s + offset before the move
+        if self._scroll is None:
+            self.scroll_area()
+        horizontal, n, mirrored = self._scroll_axis()
+        start, length, _ = self._scroll
+        offset %= length
+        self._scroll[2] = offset
+        # TFA is the fixed area at the start of frame memory
+        tfa = n - start - length if mirrored else start
+        vsp = tfa + ((length - offset) % length if mirrored else offset)
+        self.wait()
+        self.write_cmd(self.VSCRSADD, bytes([vsp >> 8, vsp & 0xFF]))
+
+    def scroll_reset(self):
+        # Back to a plain, unscrolled screen
+        self.scroll_area()
+        self._scroll = None
+
+    def scroll_by(self, step, draw):
+        """
+        Scroll by `step` lines (positive moves the content towards 0) and draw
+        only the band of lines this uncovers at the other end, with
+        draw(self) as in render(). A side-scroller frame then costs a band of
+        step x 240 pixels instead of a full screen.
+        """
+        if self._scroll is None:
+            self.scroll_area()
+        start, length, offset = self._scroll
+        self.scroll_to(offset + step)
+        if step >= length or -step >= length:
+            band = (start, length)
+        elif step > 0:
+            band = (start + length - step, step)
+        else:
+            band = (start, -step)
+        if band[1] == 0:
+            return
+        if self._scroll_axis()[0]:
+            self.refresh(band[0], 0, band[1], self.height, draw)
+        else:
+            self.refresh(0, band[0], self.width, band[1], draw)
+
+    def refresh(self, x, y, w, h, draw, band=16):
+        """
+        Redraw the screen area (x, y, w, h) with draw(self), as in render(),
+        straight to the panel through the small strip buffer. It follows the
+        hardware scroll offset, so this is how sprites move over a scrolled
+        background.
+        """
+        x0 = max(x, 0)
+        y0 = max(y, 0)
+        x1 = min(x + w, self.width)
+        y1 = min(y + h, self.height)
+        if x1 <= x0 or y1 <= y0:
+            return
+        horizontal = self._scroll_axis()[0]
+        saved = self._begin_offscreen(band)
+        try:
+            if horizontal:
+                for a, b, p in self._scroll_pieces(x0, x1):
+                    self._draw_window(draw, a, y0, b - a, y1 - y0, p, y0)
+            else:
+                for a, b, p in self._scroll_pieces(y0, y1):
+                    self._draw_window(draw, x0, a, x1 - x0, b - a, x0, p)
+        finally:
+            self._end_offscreen(saved)
+
+    def _scroll_pieces(self, l0, l1):
+        # Split screen lines [l0, l1) into runs that are contiguous in frame
+        # memory: (first line, end line, frame memory line of the first)
+        if self._scroll is None or self._scroll[2] == 0:
+            return ((l0, l1, l0),)
+        start, length, offset = self._scroll
+        pieces = []
+        l = l0
+        while l < l1:
+            if l < start:
+                end = min(l1, start)
+                pieces.append((l, end, l))
+            elif l >= start + length:
+                end = l1
+                pieces.append((l, end, l))
+            else:
+                k = (l - start + offset) % length
+                end = min(l1, start + length, l + length - k)
+                pieces.append((l, end, start + k))
+            l = end
+        return pieces
+
+    # Drawing primitives inherited from FrameBuffer, wrapped to record damage
+    # (except on the strips of render() or refresh(), sent as they are drawn)
+    # and to move them to the drawing origin while those run
+
+    def fill(self, c):
+        self._dirty = [[0, 0, self.width, self.height]]
+        super().fill(c)
+
+    def fill_rect(self, x, y, w, h, c):
+        x -= self._ox
+        y -= self._oy
+        if not self._offscreen:
+            self.damage(x, y, w, h)
+        super().fill_rect(x, y, w, h, c)
+
+    def rect(self, x, y, w, h, c, f=False):
+        x -= self._ox
+        y -= self._oy
+        if not self._offscreen:
+            self.damage(x, y, w, h)
+        if f:
+            super().fill_rect(x, y, w, h, c)
+        else:
+            super().rect(x, y, w, h, c)
+
+    def hline(self, x, y, w, c):
+        x -= self._ox
+        y -= self._oy
+        if not self._offscreen:
+            self.damage(x, y, w, 1)
+        super().hline(x, y, w, c)
+
+    def vline(self, x, y, h, c):
+        x -= self._ox
+        y -= self._oy
+        if not self._offscreen:
+            self.damage(x, y, 1, h)
+        super().vline(x, y, h, c)
+
+    def line(self, x1, y1, x2, y2, c):
+        x1 -= self._ox
+        x2 -= self._ox
+        y1 -= self._oy
+        y2 -= self._oy
+        if not self._offscreen:
+            self.damage(min(x1, x2), min(y1, y2), abs(x2 - x1) + 1, abs(y2 - y1) + 1)
+        super().line(x1, y1, x2, y2, c)
+
+    def pixel(self, x, y, c=None):
+        x -= self._ox
+        y -= self._oy
+        if c is None:
+            return super().pixel(x, y)
+        if not self._offscreen:
+            self.damage(x, y, 1, 1)
+        super().pixel(x, y, c)
+
+    def ellipse(self, x, y, xr, yr, c, f=False, m=0xF):
+        x -= self._ox
+        y -= self._oy
+        if not self._offscreen:
+            self.damage(x - xr, y - yr, 2 * xr + 1, 2 * yr + 1)
+        super().ellipse(x, y, xr, yr, c, f, m)
+
+    def poly(self, x, y, coords, c, f=False):
+        x -= self._ox
+        y -= self._oy
+        if len(coords) > 1 and not self._offscreen:
+            # bounding box of the vertices
+            x0 = x1 = coords[0]
+            y0 = y1 = coords[1]
+            for i in range(2, len(coords) - 1, 2):
+                v = coords[i]
+                x0 = v if v < x0 else x0
+                x1 = v if v > x1 else x1
+                v = coords[i + 1]
+                y0 = v if v < y0 else y0
+                y1 = v if v > y1 else y1
+            self.damage(x + x0, y + y0, x1 - x0 + 1, y1 - y0 + 1)
+        super().poly(x, y, coords, c, f)
+
+    def text(self, s, x, y, c=1):
+        x -= self._ox
+        y -= self._oy
+        if not self._offscreen:
+            self.damage(x, y, 8 * len(s), 8)
+        super().text(s, x, y, c)
+
+    def scroll(self, xstep, ystep):
+        self._dirty = [[0, 0, self.width, self.height]]
+        super().scroll(xstep, ystep)
+
+    def blit(self, fbuf, x, y, key=-1, palette=None, w=None, h=None):
+        # A FrameBuffer does not expose its size, so pass w and h to limit
+        # the damage to the blitted area; without them the whole screen is
+        # marked (unless fbuf is a (buffer, w, h, format) tuple)
+        x -= self._ox
+        y -= self._oy
+        if w is None and isinstance(fbuf, tuple):
+            w = fbuf[1]
+            h = fbuf[2]
+        if self._offscreen:
+            pass  # A strip: sent as it is drawn
+        elif w is None:
+            self._dirty = [[0, 0, self.width, self.height]]
+        else:
+            self.damage(x, y, w, h)
+        if palette is None:
+            super().blit(fbuf, x, y, key)
+        else:
+            super().blit(fbuf, x, y, key, palette)
 
 
-    def show(self):
-        self.write_cmd(self.WRITE_RAM, self.buffer)
-        
-        
     def color(r , g , b):
         """
         color(r, g, b) returns a 16 bits integer color code for the ST7789 display
@@ -208,9 +844,13 @@ class Chimera(framebuf.FrameBuffer):
         # Apparently, this function does not work as it should; the image comes out corrupted
         with open(filename , "rb") as file:
             file.readinto(self.buffer)
+        self._dirty = [[0, 0, self.width, self.height]]
 
 
     def get_pixel(self , x , y):
+        # RGB565 color of a pixel, as color() returns it, in every bpp
+        if self.bpp != 16:
+            return self.palette.pixel(super().pixel(x, y), 0)
         byte1 = self.buffer[2 * (y * self.width + x)]
         byte2 = self.buffer[2 * (y * self.width + x) + 1]
         return byte2 * 256 + byte1
@@ -2,35 +2,73 @@
 # Flappy Bird game for the Raspberry Pi Pico Game Boy
 
 from PicoGameBoy import PicoGameBoy
+from AssetPack import AssetPack
 import time
 from random import randint
 import gc
 
-
-def FlapBird_main ():
-    gc.collect()
+HOLE_SIZE = 130 # pixels
+Y_F = 210 # top of the floor
+BACKGROUND_COLOR = PicoGameBoy.color(112,197,206)
+FLOOR_COLOR = PicoGameBoy.color(219,218,150)
+
+
+def load_sprites(pgb):
+    #Picture importation: (BIRD, PIPE, FLOOR)
+    # the sky around the bird and the pipes is transparent
+    SKY = BACKGROUND_COLOR
+    with AssetPack("FlapBird.pgba") as pack:
+        # the three frames of the bird animation
+        BIRD = [pgb.load_sprite(pack, "flap_bird1", key=SKY),
+                pgb.load_sprite(pack, "flap_bird2", key=SKY),
+                pgb.load_sprite(pack, "flap_bird3", key=SKY)]
+        PIPE = pgb.load_sprite(pack, "flap_pipe", key=SKY)
+        FLOOR = pgb.load_sprite(pack, "flap_floor")
+    return BIRD, PIPE, FLOOR
+
+
+def print_pipe(fb, PIPE, x_p1, y_p1) :
+    y = y_p1
+    fb.sprite(PIPE, x_p1 ,y)
     
-    pgb = PicoGameBoy()
-
-    #Picture importation
-    sprite1_34x24=bytearray(b'v9v9v9v9v9v9v9v9v9v9v9v9Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9Q\xc8Q\xc8Q\xc8Q\xc8\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16Q\xc8Q\xc8\xef\xfb\xef\xfb\xef\xfb\xef\xfbQ\xc8Q\xc8v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9Q\xc8Q\xc8Q\xc8Q\xc8\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16Q\xc8Q\xc8\xef\xfb\xef\xfb\xef\xfb\xef\xfbQ\xc8Q\xc8v9v9v9v9v9v9v9v9v9v9v9v9v9v9Q\xc8Q\xc8\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4Q\xc8Q\xc8\xef\xfb\xef\xfb\xef\xfb\xef\xfb\xef\xfb\xef\xfb\xef\xfb\xef\xfbQ\xc8Q\xc8v9v9v9v9v9v9v9v9v9v9v9v9Q\xc8Q\xc8\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4Q\xc8Q\xc8\xef\xfb\xef\xfb\xef\xfb\xef\xfb\xef\xfb\xef\xfb\xef\xfb\xef\xfbQ\xc8Q\xc8v9v9v9v9v9v9v9v9v9v9Q\xc8Q\xc8\xdf\x16\xdf\x16\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4Q\xc8Q\xc8\xce\x18\xce\x18\xef\xfb\xef\xfb\xef\xfb\xef\xfbQ\xc8Q\xc8\xef\xfb\xef\xfbQ\xc8Q\xc8v9v9v9v9v9v9v9v9Q\xc8Q\xc8\xdf\x16\xdf\x16\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4Q\xc8Q\xc8\xce\x18\xce\x18\xef\xfb\xef\xfb\xef\xfb\xef\xfbQ\xc8Q\xc8\xef\xfb\xef\xfbQ\xc8Q\xc8v9v9v9v9v9v9Q\xc8Q\xc8\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4Q\xc8Q\xc8\xce\x18\xce\x18\xef\xfb\xef\xfb\xef\xfb\xef\xfbQ\xc8Q\xc8\xef\xfb\xef\xfbQ\xc8Q\xc8v9v9v9v9v9v9Q\xc8Q\xc8\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4Q\xc8Q\xc8\xce\x18\xce\x18\xef\xfb\xef\xfb\xef\xfb\xef\xfbQ\xc8Q\xc8\xef\xfb\xef\xfbQ\xc8Q\xc8v9v9v9v9v9v9Q\xc8Q\xc8\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4Q\xc8Q\xc8\xce\x18\xce\x18\xef\xfb\xef\xfb\xef\xfb\xef\xfb\xef\xfb\xef\xfbQ\xc8Q\xc8v9v9v9v9v9v9Q\xc8Q\xc8\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4Q\xc8Q\xc8\xce\x18\xce\x18\xef\xfb\xef\xfb\xef\xfb\xef\xfb\xef\xfb\xef\xfbQ\xc8Q\xc8v9v9v9v9v9v9Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8v9v9Q\xc8Q\xc8\xd5\xe4\xd5\xe4\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xd5\xe4\xd5\xe4Q\xc8Q\xc8\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4Q\xc8Q\xc8\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88Q\xc8Q\xc8Q\xc8Q\xc8\xd5\xe4\xd5\xe4\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xd5\xe4\xd5\xe4Q\xc8Q\xc8\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4Q\xc8Q\xc8\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88Q\xc8Q\xc8Q\xc8Q\xc8\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16Q\xc8Q\xc8\xe4\x02\xe4\x02\xe4\x02\xe4\x02Q\xc8Q\xc8\xea\x88\xea\x88Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8v9v9Q\xc8Q\xc8\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16Q\xc8Q\xc8\xe4\x02\xe4\x02\xe4\x02\xe4\x02Q\xc8Q\xc8\xea\x88\xea\x88Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8v9v9Q\xc8Q\xc8\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xd5\xe4\xd5\xe4Q\xc8Q\xc8\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02Q\xc8Q\xc8\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88Q\xc8Q\xc8v9v9Q\xc8Q\xc8\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xd5\xe4\xd5\xe4Q\xc8Q\xc8\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02Q\xc8Q\xc8\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8v9v9v9v9v9v9Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8v9v9v9v9v9v9v9v9v9v9v9v9v9v9Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8v9v9v9v9v9v9v9v9v9v9v9v9v9v9')
-    pgb.add_sprite(sprite1_34x24,34,24) # sprite #0
-    gc.collect()
-
-    sprite2_34x24=bytearray(b'v9v9v9v9v9v9v9v9v9v9v9v9Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9Q\xc8Q\xc8Q\xc8Q\xc8\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16Q\xc8Q\xc8\xef\xfb\xef\xfb\xef\xfb\xef\xfbQ\xc8Q\xc8v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9Q\xc8Q\xc8Q\xc8Q\xc8\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16Q\xc8Q\xc8\xef\xfb\xef\xfb\xef\xfb\xef\xfbQ\xc8Q\xc8v9v9v9v9v9v9v9v9v9v9v9v9v9v9Q\xc8Q\xc8\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4Q\xc8Q\xc8\xef\xfb\xef\xfb\xef\xfb\xef\xfb\xef\xfb\xef\xfb\xef\xfb\xef\xfbQ\xc8Q\xc8v9v9v9v9v9v9v9v9v9v9v9v9Q\xc8Q\xc8\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4Q\xc8Q\xc8\xef\xfb\xef\xfb\xef\xfb\xef\xfb\xef\xfb\xef\xfb\xef\xfb\xef\xfbQ\xc8Q\xc8v9v9v9v9v9v9v9v9v9v9Q\xc8Q\xc8\xdf\x16\xdf\x16\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4Q\xc8Q\xc8\xce\x18\xce\x18\xef\xfb\xef\xfb\xef\xfb\xef\xfbQ\xc8Q\xc8\xef\xfb\xef\xfbQ\xc8Q\xc8v9v9v9v9v9v9v9v9Q\xc8Q\xc8\xdf\x16\xdf\x16\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4Q\xc8Q\xc8\xce\x18\xce\x18\xef\xfb\xef\xfb\xef\xfb\xef\xfbQ\xc8Q\xc8\xef\xfb\xef\xfbQ\xc8Q\xc8v9v9v9v9v9v9Q\xc8Q\xc8\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4Q\xc8Q\xc8\xce\x18\xce\x18\xef\xfb\xef\xfb\xef\xfb\xef\xfbQ\xc8Q\xc8\xef\xfb\xef\xfbQ\xc8Q\xc8v9v9v9v9v9v9Q\xc8Q\xc8\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4Q\xc8Q\xc8\xce\x18\xce\x18\xef\xfb\xef\xfb\xef\xfb\xef\xfbQ\xc8Q\xc8\xef\xfb\xef\xfbQ\xc8Q\xc8v9v9v9v9v9v9Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4Q\xc8Q\xc8\xce\x18\xce\x18\xef\xfb\xef\xfb\xef\xfb\xef\xfb\xef\xfb\xef\xfbQ\xc8Q\xc8v9v9v9v9v9v9Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4Q\xc8Q\xc8\xce\x18\xce\x18\xef\xfb\xef\xfb\xef\xfb\xef\xfb\xef\xfb\xef\xfbQ\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16Q\xc8Q\xc8\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8v9v9Q\xc8Q\xc8\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16Q\xc8Q\xc8\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8v9v9Q\xc8Q\xc8\xd5\xe4\xd5\xe4\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xd5\xe4\xd5\xe4Q\xc8Q\xc8\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4Q\xc8Q\xc8\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88Q\xc8Q\xc8Q\xc8Q\xc8\xd5\xe4\xd5\xe4\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xd5\xe4\xd5\xe4Q\xc8Q\xc8\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4Q\xc8Q\xc8\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88Q\xc8Q\xc8v9v9Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8\xe4\x02\xe4\x02\xe4\x02\xe4\x02Q\xc8Q\xc8\xea\x88\xea\x88Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8\xe4\x02\xe4\x02\xe4\x02\xe4\x02Q\xc8Q\xc8\xea\x88\xea\x88Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8v9v9v9v9v9v9Q\xc8Q\xc8\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02Q\xc8Q\xc8\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88Q\xc8Q\xc8v9v9v9v9v9v9Q\xc8Q\xc8\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02Q\xc8Q\xc8\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88Q\xc8Q\xc8v9v9v9v9v9v9v9v9Q\xc8Q\xc8Q\xc8Q\xc8\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8v9v9v9v9v9v9v9v9v9v9Q\xc8Q\xc8Q\xc8Q\xc8\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8v9v9v9v9v9v9v9v9v9v9v9v9v9v9Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8v9v9v9v9v9v9v9v9v9v9v9v9v9v9')
-    pgb.add_sprite(sprite2_34x24,34,24) # sprite #1
-    gc.collect()
+    
+    while y>=-52:
+        y = y - 52
+        fb.sprite(PIPE, x_p1 ,y)
+    
+    y = y_p1 + HOLE_SIZE
+    fb.sprite(PIPE, x_p1, y)
+    
+    while y<320:
+        y = y + 52
+        fb.sprite(PIPE, x_p1 ,y)
+
+
+def draw_world(fb, sprites, x_p1, y_p1, x_p2, y_p2, x_f, sprite, x, y):
+    # the whole scene, for render(), refresh() and scroll_by()
+    BIRD, PIPE, FLOOR = sprites
+    #the background
+    fb.fill(BACKGROUND_COLOR)
+    #pipe 1
+    print_pipe(fb, PIPE, x_p1, y_p1)
+    #pipe 2
+    print_pipe(fb, PIPE, x_p2, y_p2)
+    #floor
+    for i in range(0,5):
+        fb.sprite(FLOOR,x_f+i*98,Y_F)
+    fb.fill_rect(0,Y_F+14,320,240-Y_F-14,FLOOR_COLOR)
+    #the main sprite, over the pipes
+    fb.sprite(BIRD[sprite], int(x), int(y))
 
-    sprite3_34x24=bytearray(b'v9v9v9v9v9v9v9v9v9v9v9v9Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9Q\xc8Q\xc8Q\xc8Q\xc8\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16Q\xc8Q\xc8\xef\xfb\xef\xfb\xef\xfb\xef\xfbQ\xc8Q\xc8v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9Q\xc8Q\xc8Q\xc8Q\xc8\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16Q\xc8Q\xc8\xef\xfb\xef\xfb\xef\xfb\xef\xfbQ\xc8Q\xc8v9v9v9v9v9v9v9v9v9v9v9v9v9v9Q\xc8Q\xc8\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4Q\xc8Q\xc8\xef\xfb\xef\xfb\xef\xfb\xef\xfb\xef\xfb\xef\xfb\xef\xfb\xef\xfbQ\xc8Q\xc8v9v9v9v9v9v9v9v9v9v9v9v9Q\xc8Q\xc8\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4Q\xc8Q\xc8\xef\xfb\xef\xfb\xef\xfb\xef\xfb\xef\xfb\xef\xfb\xef\xfb\xef\xfbQ\xc8Q\xc8v9v9v9v9v9v9v9v9Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4Q\xc8Q\xc8\xce\x18\xce\x18\xef\xfb\xef\xfb\xef\xfb\xef\xfbQ\xc8Q\xc8\xef\xfb\xef\xfbQ\xc8Q\xc8v9v9v9v9v9v9Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4Q\xc8Q\xc8\xce\x18\xce\x18\xef\xfb\xef\xfb\xef\xfb\xef\xfbQ\xc8Q\xc8\xef\xfb\xef\xfbQ\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16Q\xc8Q\xc8\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4Q\xc8Q\xc8\xce\x18\xce\x18\xef\xfb\xef\xfb\xef\xfb\xef\xfbQ\xc8Q\xc8\xef\xfb\xef\xfbQ\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16Q\xc8Q\xc8\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4Q\xc8Q\xc8\xce\x18\xce\x18\xef\xfb\xef\xfb\xef\xfb\xef\xfbQ\xc8Q\xc8\xef\xfb\xef\xfbQ\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16Q\xc8Q\xc8\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4Q\xc8Q\xc8\xce\x18\xce\x18\xef\xfb\xef\xfb\xef\xfb\xef\xfb\xef\xfb\xef\xfbQ\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16Q\xc8Q\xc8\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4Q\xc8Q\xc8\xce\x18\xce\x18\xef\xfb\xef\xfb\xef\xfb\xef\xfb\xef\xfb\xef\xfbQ\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\xd5\xe4\xd5\xe4\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xd5\xe4\xd5\xe4Q\xc8Q\xc8\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8v9v9Q\xc8Q\xc8\xd5\xe4\xd5\xe4\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xdf\x16\xd5\xe4\xd5\xe4Q\xc8Q\xc8\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4Q\xc8Q\xc8\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4Q\xc8Q\xc8\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88Q\xc8Q\xc8v9v9Q\xc8Q\xc8\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4Q\xc8Q\xc8\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4\xd5\xe4Q\xc8Q\xc8\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02Q\xc8Q\xc8\xea\x88\xea\x88Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8v9v9v9v9v9v9Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02Q\xc8Q\xc8\xea\x88\xea\x88Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8v9v9v9v9v9v9Q\xc8Q\xc8\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02Q\xc8Q\xc8\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88Q\xc8Q\xc8v9v9v9v9v9v9Q\xc8Q\xc8\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02Q\xc8Q\xc8\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88\xea\x88Q\xc8Q\xc8v9v9v9v9v9v9v9v9Q\xc8Q\xc8Q\xc8Q\xc8\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8v9v9v9v9v9v9v9v9v9v9Q\xc8Q\xc8Q\xc8Q\xc8\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02\xe4\x02Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8v9v9v9v9v9v9v9v9v9v9v9v9v9v9Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9v9Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8v9v9v9v9v9v9v9v9v9v9v9v9v9v9')
-    pgb.add_sprite(sprite3_34x24,34,24) # sprite #2
-    gc.collect()
 
-    pipe_52x52=bytearray(b'v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9v9v9Q\xc8Q\xc8\x9f+\x9f+\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5T\x04T\x04u\xe5u\xe5T\x04T\x04T\x04T\x04Q\xc8Q\xc8v9v9')
-    pgb.add_sprite(pipe_52x52,52,52) # sprite #3
+def FlapBird_main ():
     gc.collect()
     
-    floor_98x14=bytearray(b'Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8Q\xc8\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\xe7\xf1\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5u\xe5\x9f+\x9f+\x9f+\x9f+\x9f+\x9f+T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04T\x04\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I\xd5I')
-    pgb.add_sprite(floor_98x14,98,14) # sprite #5
+    # No frame buffer: the pipes and the floor move with hardware scrolling
+    # and only the uncovered band and the bird are drawn each frame
+    pgb = PicoGameBoy(framebuffer=False)
+
+    sprites = load_sprites(pgb)
     gc.collect()
 
 
@@ -38,11 +76,10 @@ def FlapBird_main ():
     while True:
         
         #game settings
-        HOLE_SIZE = 130 # pixels
         SPEED = 3
+        UPS = 33 # game steps per second
         counter = 0
         sprite_condition = False
-        gameover=False
 
         #sprite settings
         sprite = 0
@@ -52,30 +89,7 @@ def FlapBird_main ():
 
         #floor settings
         x_f=0
-        Y_F=210
-
-        BACKGROUND_COLOR = PicoGameBoy.color(112,197,206)
-        FLOOR_COLOR = PicoGameBoy.color(219,218,150)
-        
-        button_pressed = False
-        prev_button_pressed = False
 
-        def print_pipe(x_p1, y_p1) :
-            y = y_p1
-            pgb.sprite(3, x_p1 ,y)
-            
-            
-            while y>=-52:
-                y = y - 52
-                pgb.sprite(3, x_p1 ,y)
-            
-            y = y_p1 + HOLE_SIZE
-            pgb.sprite(3, x_p1, y)
-            
-            while y<320:
-                y = y + 52
-                pgb.sprite(3, x_p1 ,y)
-                
         def intersect(x1,y1,w1,h1,x2,y2,w2,h2):
             
             if x1+w1 < x2:
@@ -98,16 +112,20 @@ def FlapBird_main ():
         x_p2 = 320 + 180
 
 
-        #part_game loop
-        while True:
-                   
-            # update the screen :
-               
-            #the background
-            pgb.fill(BACKGROUND_COLOR)
-            #the main sprite
-            pgb.sprite(sprite, int(x), int(y))
-            
+        def draw(fb):
+            draw_world(fb, sprites, x_p1, y_p1, x_p2, y_p2, x_f, sprite, x, y)
+
+        pgb.scroll_area()
+        pgb.refresh(0, 0, 320, 240, draw)
+
+        # pixels scrolled by the updates since the last render and the
+        # bird position that render drew
+        shift = 0
+        drawn_y = int(y)
+
+        def update():
+            nonlocal sprite, counter, sprite_condition, y, vy
+            nonlocal x_p1, y_p1, x_p2, y_p2, x_f, shift
             if sprite_condition == True :
                 counter = counter + 1
                 
@@ -119,35 +137,18 @@ def FlapBird_main ():
                     sprite = sprite + 1
                     counter = 0
                         
-            #pipe 1
-            print_pipe(x_p1, y_p1)
-            #pipe 2
-            print_pipe(x_p2, y_p2)
-            
-            #floor
-            for i in range(0,5):        
-                pgb.sprite(4,x_f+i*98,Y_F)
-                pgb.fill_rect(0,Y_F+14,320,240-Y_F-14,FLOOR_COLOR)
-
-            pgb.show()
-           
             vy = vy + 0.20
             y = y + vy
                  
-            prev_button_pressed = button_pressed
-            
-            if pgb.button_A() or pgb.button_B():
-                button_pressed = True
-            else:
-                button_pressed = False
-                
-            if prev_button_pressed==False and button_pressed==True:
+            pgb.update_input()
+            if pgb.just_pressed(pgb.A | pgb.B):
                 sprite_condition = True
                 vy = -4.4
                 
             #update the pipes position
             x_p1 = x_p1 - SPEED
             x_p2 = x_p2 - SPEED
+            shift = shift + SPEED
             
             #generate pipe 1
             if x_p1 < -82 :                    
@@ -164,26 +165,40 @@ def FlapBird_main ():
             x_f = x_f - SPEED
             if x_f<=-98:
                 x_f=x_f+98    
-         
+
             #Hit Box verification...
             
             if intersect(x,y,32,20,x_p1+1,y_p1-2,52,240):
-                gameover=True
+                return True
             if intersect(x,y,32,22,x_p1+1,y_p1 + HOLE_SIZE+12,52-3,0):
-                gameover=True
+                return True
             if intersect(x,y,32,20,x_p2+1,y_p2-4,52  ,240):
-                gameover=True
+                return True
             if intersect(x,y,32,22,x_p2+1,y_p2 + HOLE_SIZE+12,52-3,0):
-                gameover=True
+                return True
             if y > Y_F :
-                gameover=True
-            if gameover:
-                break
-            
+                return True
+            return False
+
+        def render():
+            # scroll the scene and draw the new band on the right, then
+            # redraw the bird over where it was and where it is now
+            nonlocal shift, drawn_y
+            pgb.scroll_by(shift, draw)
+            pgb.refresh(int(x) - shift, min(drawn_y, int(y)), 34 + shift,
+                        abs(int(y) - drawn_y) + 24, draw)
+            shift = 0
+            drawn_y = int(y)
+
+        #part_game loop
+        pgb.run_loop(update, render, UPS)
+        render()
+
         #Game over
-        pgb.fill_rect(100,85,120,60,PicoGameBoy.color(0,0,0))
-        pgb.text("GAME OVER",123,113,PicoGameBoy.color(255,255,255))        
-        pgb.show()
+        def draw_game_over(fb):
+            fb.fill_rect(100,85,120,60,PicoGameBoy.color(0,0,0))
+            fb.text("GAME OVER",123,113,PicoGameBoy.color(255,255,255))
+        pgb.refresh(100, 85, 120, 60, draw_game_over)
         
         time.sleep(1)
 
@@ -193,6 +208,7 @@ def FlapBird_main ():
         if pgb.button_down():
             break
         
+    pgb.scroll_reset()
     pgb.clear_ghost_array()
     return
                 
@@ -1,90 +1,100 @@
 from micropython import const
 from PicoGameBoy import PicoGameBoy
 import time
-import random
+from Life import Life
+
+# Predefined colors
+BLACK = PicoGameBoy.color(0,0,0)
+WHITE = PicoGameBoy.color(255,255,255)
+RED = PicoGameBoy.color(255,0,0)
+GREEN = PicoGameBoy.color(0,255,0)
+BLUE = PicoGameBoy.color(0,0,255)
+
+# Game parameters
+CELL_SIZE = 8            # width and height of cells in pixels
+POPULATION_PERCENT = 12  # Initial population size as function of total surface in %
+GENERATIONS_PER_SECOND = 8
+BACKGROUND_COLOR = BLACK
+CELL_COLOR = GREEN
+
+
+def new_board(width, height):
+    # A board of cells for a screen of width x height pixels, with a random
+    # initial population
+    board = Life(width // CELL_SIZE, height // CELL_SIZE)
+    board.randomize(POPULATION_PERCENT)
+    return board
+
+
+def draw_cells(pgb, bits, y, color):
+    # Fill the cells of the bits of a row at y with color, one rectangle
+    # per run of set bits, empty bytes skipped at once
+    j = 0
+    while bits:
+        if not bits & 0xFF:
+            bits >>= 8
+            j += 8
+        elif bits & 1:
+            start = j
+            while bits & 1:
+                bits >>= 1
+                j += 1
+            pgb.fill_rect(start*CELL_SIZE,y,(j-start)*CELL_SIZE,CELL_SIZE,color)
+        else:
+            bits >>= 1
+            j += 1
+
+
+def draw_board(pgb, board):
+    pgb.fill(BACKGROUND_COLOR)
+    y = 0
+    for row in board.rows:
+        draw_cells(pgb, row, y, CELL_COLOR)
+        y += CELL_SIZE
+
+
+def draw_changes(pgb, board):
+    # Paint only the cells born or dead in the last generation and send
+    # every band of consecutive changed rows to the screen on its own, so
+    # a frame costs what changed instead of the whole board
+    band = False
+    y = 0
+    for i in range(board.height):
+        changed = board.changed[i]
+        if changed:
+            row = board.rows[i]
+            draw_cells(pgb, changed & row, y, CELL_COLOR)
+            draw_cells(pgb, changed & ~row, y, BACKGROUND_COLOR)
+            band = True
+        elif band:
+            pgb.show()
+            band = False
+        y += CELL_SIZE
+    if band:
+        pgb.show()
+
+
+def next_generation(pgb, board):
+    # One generation; True when the player leaves
+    board.step()
+    return pgb.update_input() & pgb.DOWN != 0
+
 
 def gameoflife_main(gameboy):
     
     pgb = gameboy
-    # Predefined colors
-    BLACK = PicoGameBoy.color(0,0,0)
-    WHITE = PicoGameBoy.color(255,255,255)
-    RED = PicoGameBoy.color(255,0,0)
-    GREEN = PicoGameBoy.color(0,255,0)
-    BLUE = PicoGameBoy.color(0,0,255)
-
-    # Game parameters
-    WIDTH = pgb.width        # screen width in pixels
-    HEIGHT = pgb.height      # screen height in pixels
-    CELL_SIZE = 8            # width and height of cells in pixels
-    POPULATION_PERCENT = 12  # Initial population size as function of total surface in %
-    BACKGROUND_COLOR = BLACK
-    CELL_COLOR = GREEN
-
-    # Board initialisation
-    BOARD_SIZE_X = int(WIDTH/CELL_SIZE)
-    BOARD_SIZE_Y = int(HEIGHT/CELL_SIZE)
-    BOARD_SURFACE = BOARD_SIZE_X * BOARD_SIZE_Y
-
-    board=[]
-    for i in range(0,BOARD_SIZE_Y):
-        line = []
-        for j in range(0,BOARD_SIZE_X):
-            line.append(0)
-        board.append(line)
-
-
-    # Initial number of cells 
-    NUMBER_OF_CELLS = int((POPULATION_PERCENT)/100 * BOARD_SURFACE);
-
-    # Create the initial population
-    for i in range(0,NUMBER_OF_CELLS):
-        # Randomly place cells on the board
-        board[random.randint(0,BOARD_SIZE_Y-1)][random.randint(0,BOARD_SIZE_X-1)] = CELL_COLOR
-        
-    # run the animation
-    while True:
-        # Update the screen
-        pgb.fill(BACKGROUND_COLOR)
-        for i in range(0,BOARD_SIZE_Y):
-            for j in range(0,BOARD_SIZE_X):
-                if board[i][j]!=0:
-                    pgb.fill_rect(j*CELL_SIZE,i*CELL_SIZE,CELL_SIZE,CELL_SIZE,board[i][j])
-        pgb.show()
-        
-        # count number of neighbors for each position
-        for i in range(0,BOARD_SIZE_Y):
-            for j in range(0,BOARD_SIZE_X):
-                number_neighbors = 0
-                
-                if i>1 and j>1 and board[i-1][j-1]!=0:
-                    number_neighbors+=1
-                if i>1 and board[i-1][j]!=0:
-                    number_neighbors+=1
-                if i>1 and j<BOARD_SIZE_X-1 and board[i-1][j+1]!=0:
-                    number_neighbors+=1
-                if i<BOARD_SIZE_Y-1 and j>1 and board[i+1][j-1]!=0:
-                    number_neighbors+=1
-                if i<BOARD_SIZE_Y-1 and board[i+1][j]!=0:
-                    number_neighbors+=1
-                if i<BOARD_SIZE_Y-1 and j<BOARD_SIZE_Y-1 and board[i+1][j+1]!=0:
-                    number_neighbors+=1
-                if j>1 and board[i][j-1]!=0:
-                    number_neighbors+=1
-                if j<BOARD_SIZE_X-1 and board[i][j+1]!=0:
-                    number_neighbors+=1
-                
-                # The game's rules
-                if board[i][j]!=BLACK:
-                    # There is a living cell at row #i col #j
-                    # It survives only if it surrounded by 2 or 3 neighbors
-                    if number_neighbors<2 or number_neighbors>3:
-                        board[i][j] = 0
-                else:
-                    # row #i col #j is empty
-                    # Create a new cell at (i,j) if it is surrounded by exactly 3 neighbors
-                    if number_neighbors==3:
-                        board[i][j] = CELL_COLOR
-                        
-                if pgb.button_down():
-                    return
+    board = new_board(pgb.width, pgb.height)
+
+    # Update the screen with what the last generation changed
+    def render():
+        draw_changes(pgb, board)
+
+    def update():
+        return next_generation(pgb, board)
+
+    # run the animation at GENERATIONS_PER_SECOND, slower when a
+    # generation takes longer than that, with every generation drawn
+    # (one update per frame, the changes are those of one generation)
+    draw_board(pgb, board)
+    pgb.show()
+    pgb.run_loop(update, render, GENERATIONS_PER_SECOND, max_updates=1)
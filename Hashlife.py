@@ -0,0 +1,334 @@
+# Hashlife.py
+# Hashlife engine for worlds far larger than the screen
+#
+# The unbounded Life plane is a quadtree of nodes. Identical subtrees are
+# one node (hash-consing), so empty space and repeated structure cost
+# nothing. The result of every node -- its central half a number of
+# generations later -- is memoized, and most of a pattern's future is
+# built from results already known. step(n) jumps n generations in
+# chunks of powers of two, exponentially faster than stepping one
+# generation at a time for most patterns.
+#
+# A node is a tuple (nw, ne, sw, se, level, population, id) covering a
+# square of 2 ** level cells; the two leaves are the cells themselves.
+# The root is centered on the world origin, so cell (x, y) is anywhere in
+# [-2 ** (level - 1), 2 ** (level - 1)). Nodes and results live until the
+# node count passes max_nodes; collect() then drops everything the
+# current world no longer uses.
+
+import gc
+
+NW = 0
+NE = 1
+SW = 2
+SE = 3
+LEVEL = 4
+POP = 5
+ID = 6
+
+OFF = (None, None, None, None, 0, 0, 0)
+ON = (None, None, None, None, 0, 1, 1)
+
+NODE_BYTES = 128  # Heap used by a node, its table entry and its result
+
+
+class Hashlife:
+    def __init__(self, max_nodes=None):
+        """
+        An empty world. Unless `max_nodes` is given, the node cache may use
+        half of the heap that is free now.
+        """
+        if max_nodes is None:
+            gc.collect()
+            try:
+                max_nodes = gc.mem_free() // 2 // NODE_BYTES
+            except AttributeError:  # CPython
+                max_nodes = 1 << 20
+        self.max_nodes = max_nodes
+        self._table = {}  # Children ids -> node
+        self._memo = {}  # id << 6 | j -> node advanced 2 ** j generations
+        self._empties = [OFF]
+        self._next_id = 2
+        self.clear()
+
+    def clear(self):
+        self.root = self._empty(3)
+        self.generation = 0
+
+    def population(self):
+        return self.root[POP]
+
+    def _join(self, nw, ne, sw, se):
+        # The canonical node of four children
+        key = (nw[ID], ne[ID], sw[ID], se[ID])
+        n = self._table.get(key)
+        if n is None:
+            n = (nw, ne, sw, se, nw[LEVEL] + 1,
+                 nw[POP] + ne[POP] + sw[POP] + se[POP], self._next_id)
+            self._next_id += 1
+            self._table[key] = n
+        return n
+
+    def _empty(self, level):
+        empties = self._empties
+        while len(empties) <= level:
+            e = empties[-1]
+            empties.append(self._join(e, e, e, e))
+        return empties[level]
+
+    def _expand(self, node):
+        # The node surrounded by an empty border, one level up
+        e = self._empty(node[LEVEL] - 1)
+        join = self._join
+        return join(join(e, e, e, node[NW]), join(e, e, node[NE], e),
+                    join(e, node[SW], e, e), join(node[SE], e, e, e))
+
+    def get(self, x, y):
+        node = self.root
+        half = 1 << (node[LEVEL] - 1)
+        if not (-half <= x < half and -half <= y < half):
+            return 0
+        x += half
+        y += half
+        while node[LEVEL]:
+            half = 1 << (node[LEVEL] - 1)
+            q = (2 if y >= half else 0) + (1 if x >= half else 0)
+            node = node[q]
+            x &= half - 1
+            y &= half - 1
+        return node[POP]
+
+    def set(self, x, y, alive=True):
+        half = 1 << (self.root[LEVEL] - 1)
+        while not (-half <= x < half and -half <= y < half):
+            self.root = self._expand(self.root)
+            half <<= 1
+        self.root = self._set(self.root, x + half, y + half, alive)
+
+    def _set(self, node, x, y, alive):
+        level = node[LEVEL]
+        if level == 0:
+            return ON if alive else OFF
+        half = 1 << (level - 1)
+        q = [node[NW], node[NE], node[SW], node[SE]]
+        i = (2 if y >= half else 0) + (1 if x >= half else 0)
+        q[i] = self._set(q[i], x & (half - 1), y & (half - 1), alive)
+        return self._join(q[0], q[1], q[2], q[3])
+
+    def load(self, cells):
+        # Replace the world with the live cells of `cells`, (x, y) pairs
+        self.clear()
+        cells = list(cells)
+        if not cells:
+            return
+        extent = max(max(abs(x), abs(y)) for x, y in cells)
+        level = 3
+        while (1 << (level - 1)) <= extent:
+            level += 1
+        half = 1 << (level - 1)
+        self.root = self._build([(x + half, y + half) for x, y in cells], level)
+
+    def _build(self, cells, level):
+        # The node of `cells`, given in its own coordinates
+        if not cells:
+            return self._empty(level)
+        if level == 0:
+            return ON
+        half = 1 << (level - 1)
+        q = ([], [], [], [])
+        m = half - 1
+        for x, y in cells:
+            q[(2 if y >= half else 0) + (1 if x >= half else 0)].append((x & m, y & m))
+        return self._join(self._build(q[0], level - 1), self._build(q[1], level - 1),
+                          self._build(q[2], level - 1), self._build(q[3], level - 1))
+
+    def step(self, n=1):
+        """
+        Advance `n` generations, as jumps of the powers of two that add up
+        to n.
+        """
+        j = 0
+        while n:
+            if n & 1:
+                self._advance(j)
+            n >>= 1
+            j += 1
+
+    def _advance(self, j):
+        # Advance 2 ** j generations
+        root = self.root
+        # The pattern must stay in the central quarter, so that in 2 ** j
+        # generations it cannot grow past the central half the result covers
+        while (root[LEVEL] < j + 3 or root[NW][POP] != root[NW][SE][SE][POP]
+               or root[NE][POP] != root[NE][SW][SW][POP]
+               or root[SW][POP] != root[SW][NE][NE][POP]
+               or root[SE][POP] != root[SE][NW][NW][POP]):
+            root = self._expand(root)
+        self.root = root
+        if len(self._table) > self.max_nodes:
+            self.collect()
+        try:
+            self.root = self._successor(root, j)
+        except MemoryError:
+            # Start over with an empty cache, in two half jumps if needed
+            self.root = root
+            self.collect()
+            if j == 0:
+                raise
+            self._advance(j - 1)
+            self._advance(j - 1)
+            return
+        self.generation += 1 << j
+
+    def collect(self):
+        """
+        Drop the memoized results and every node the current world does not
+        use, to stay within max_nodes.
+        """
+        self._memo = {}
+        table = {}
+        stack = [self.root] + self._empties[1:]
+        while stack:
+            n = stack.pop()
+            if n[LEVEL] == 0:
+                continue
+            key = (n[NW][ID], n[NE][ID], n[SW][ID], n[SE][ID])
+            if key not in table:
+                table[key] = n
+                stack.append(n[NW])
+                stack.append(n[NE])
+                stack.append(n[SW])
+                stack.append(n[SE])
+        self._table = table
+        gc.collect()
+
+    def _successor(self, m, j):
+        # The central half of node m, 2 ** j generations later
+        # (j <= level - 2)
+        key = m[ID] << 6 | j
+        r = self._memo.get(key)
+        if r is not None:
+            return r
+        level = m[LEVEL]
+        if m[POP] == 0:
+            r = self._empty(level - 1)
+        elif level == 2:
+            r = self._life4(m)
+        else:
+            join = self._join
+            nw = m[NW]
+            ne = m[NE]
+            sw = m[SW]
+            se = m[SE]
+            # The nine overlapping quarter-size squares of m
+            c00 = nw
+            c01 = join(nw[NE], ne[NW], nw[SE], ne[SW])
+            c02 = ne
+            c10 = join(nw[SW], nw[SE], sw[NW], sw[NE])
+            c11 = join(nw[SE], ne[SW], sw[NE], se[NW])
+            c12 = join(ne[SW], ne[SE], se[NW], se[NE])
+            c20 = sw
+            c21 = join(sw[NE], se[NW], sw[SE], se[SW])
+            c22 = se
+            if j == level - 2:
+                # Full speed: half the time here, the other half below
+                s = self._successor
+                j -= 1
+                c00 = s(c00, j)
+                c01 = s(c01, j)
+                c02 = s(c02, j)
+                c10 = s(c10, j)
+                c11 = s(c11, j)
+                c12 = s(c12, j)
+                c20 = s(c20, j)
+                c21 = s(c21, j)
+                c22 = s(c22, j)
+            else:
+                c = self._center
+                c00 = c(c00)
+                c01 = c(c01)
+                c02 = c(c02)
+                c10 = c(c10)
+                c11 = c(c11)
+                c12 = c(c12)
+                c20 = c(c20)
+                c21 = c(c21)
+                c22 = c(c22)
+            s = self._successor
+            r = join(s(join(c00, c01, c10, c11), j), s(join(c01, c02, c11, c12), j),
+                     s(join(c10, c11, c20, c21), j), s(join(c11, c12, c21, c22), j))
+        self._memo[key] = r
+        return r
+
+    def _center(self, n):
+        return self._join(n[NW][SE], n[NE][SW], n[SW][NE], n[SE][NW])
+
+    def _life4(self, m):
+        # The central 2x2 of a 4x4 node one generation later, cell by cell
+        nw = m[NW]
+        ne = m[NE]
+        sw = m[SW]
+        se = m[SE]
+        g = (nw[NW][POP], nw[NE][POP], ne[NW][POP], ne[NE][POP],
+             nw[SW][POP], nw[SE][POP], ne[SW][POP], ne[SE][POP],
+             sw[NW][POP], sw[NE][POP], se[NW][POP], se[NE][POP],
+             sw[SW][POP], sw[SE][POP], se[SW][POP], se[SE][POP])
+        out = []
+        for i in (5, 6, 9, 10):
+            n = (g[i - 5] + g[i - 4] + g[i - 3] + g[i - 1] + g[i + 1]
+                 + g[i + 3] + g[i + 4] + g[i + 5])
+            out.append(ON if n == 3 or (n == 2 and g[i]) else OFF)
+        return self._join(out[0], out[1], out[2], out[3])
+
+
+def parse_rle(lines):
+    """
+    Return (width, height, cells) for a pattern in RLE format, cells being
+    the (x, y) of its live cells. Only the B3/S23 rule of Life is accepted.
+    """
+    width = height = 0
+    cells = []
+    x = y = 0
+    count = ''
+    for line in lines:
+        line = line.strip()
+        if not line or line[0] == '#':
+            continue
+        if line[0] == 'x' and not cells and x == y == 0:
+            for field in line.split(','):
+                k, _, v = field.partition('=')
+                k = k.strip()
+                v = v.strip()
+                if k == 'x':
+                    width = int(v)
+                elif k == 'y':
+                    height = int(v)
+                elif k == 'rule' and v.upper().replace('B', '').replace('S', '') not in ('3/23', '23/3'):
+                    raise ValueError('Only Life (B3/S23) patterns are supported, not %s.' % v)
+            continue
+        for ch in line:
+            if '0' <= ch <= '9':
+                count += ch
+                continue
+            n = int(count) if count else 1
+            count = ''
+            if ch == 'b' or ch == '.':
+                x += n
+            elif ch == '$':
+                y += n
+                x = 0
+            elif ch == '!':
+                return width, height, cells
+            elif ch.isalpha():
+                for i in range(n):
+                    cells.append((x + i, y))
+                x += n
+            else:
+                raise ValueError('Unexpected %s in RLE data.' % ch)
+    return width, height, cells
+
+
+def read_rle(path):
+    # parse_rle() of the file at `path`
+    with open(path) as f:
+        return parse_rle(f)
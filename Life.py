@@ -0,0 +1,169 @@
+# Life.py
+# Conway's Game of Life engine for the Raspberry Pi Pico Game Boy
+#
+# Each row of the board is one integer, bit x set for a live cell in column
+# x, so a generation works on whole rows at once: the eight neighbours of
+# every cell of a row are the row above, the row itself and the row below
+# shifted by one column each way, and bitwise adders sum them into a 4-bit
+# count per column. That is a few dozen integer operations per row instead
+# of eight bounds-checked lookups per cell. The next generation is written
+# to a second list of rows, so every cell sees the neighbours of the same
+# generation.
+#
+# changed[y] holds the cells of row y that the last step() (or set(),
+# load(), ...) changed: changed[y] & rows[y] were born, changed[y] &
+# ~rows[y] died. A renderer only has to paint those, and step() itself
+# only computes the rows next to a change; the others cannot change and
+# are copied, so a settled board costs next to nothing.
+
+import random
+
+
+class Life:
+    def __init__(self, width, height, wrap=False):
+        """
+        A `width` x `height` board of dead cells. With `wrap` the edges are
+        joined (a torus), else cells beyond the edges are always dead.
+        """
+        self.width = width
+        self.height = height
+        self.wrap = wrap
+        self.generation = 0
+        self.rows = [0] * height
+        self._next = [0] * height
+        self.changed = [0] * height
+        # Neighbour sums of every row, kept to not allocate them each step
+        self._sums = [[0] * height for _ in range(4)]
+        self._mask = (1 << width) - 1
+
+    def clear(self):
+        for y in range(self.height):
+            self.changed[y] |= self.rows[y]
+            self.rows[y] = 0
+        self.generation = 0
+
+    def load(self, rows):
+        # Replace the board with a list of row integers
+        for y in range(self.height):
+            self.changed[y] |= self.rows[y] ^ rows[y]
+            self.rows[y] = rows[y]
+
+    def get(self, x, y):
+        return self.rows[y] >> x & 1
+
+    def set(self, x, y, alive=True):
+        bit = 1 << x
+        if alive:
+            self.rows[y] |= bit
+        else:
+            self.rows[y] &= ~bit
+        self.changed[y] |= bit
+
+    def randomize(self, percent):
+        # Bring to life `percent` % of the board's area at random places
+        # (some land on the same cell)
+        w = self.width
+        h = self.height
+        for _ in range(percent * w * h // 100):
+            y = random.randint(0, h - 1)
+            bit = 1 << random.randint(0, w - 1)
+            self.changed[y] |= bit & ~self.rows[y]
+            self.rows[y] |= bit
+
+    def population(self):
+        n = 0
+        for r in self.rows:
+            while r:
+                r &= r - 1
+                n += 1
+        return n
+
+    def step(self):
+        """
+        Advance one generation; changed then holds what it changed. Returns
+        the number of rows that were computed, the others were stable.
+        """
+        rows = self.rows
+        new = self._next
+        changed = self.changed
+        h = self.height
+        w = self.width
+        mask = self._mask
+        wrap = self.wrap
+        # Per row, the number of live cells among each cell and its left and
+        # right neighbours (bits s0, s1), and among the two neighbours only
+        # (bits m0, m1); they only change with the row
+        s0, s1, m0, m1 = self._sums
+        for y in range(h):
+            if not changed[y]:
+                continue
+            x = rows[y]
+            if wrap:
+                left = ((x << 1) | (x >> (w - 1))) & mask
+                right = (x >> 1) | ((x & 1) << (w - 1))
+            else:
+                left = (x << 1) & mask
+                right = x >> 1
+            t = left ^ right
+            m0[y] = t
+            m1[y] = left & right
+            s0[y] = t ^ x
+            s1[y] = (left & right) | (x & t)
+        active = 0
+        first = changed[0]
+        above = changed[h - 1] if wrap else 0
+        here = first
+        for y in range(h):
+            if y < h - 1:
+                below = changed[y + 1]
+            else:
+                below = first if wrap else 0
+            if not (above | here | below):
+                # Nothing changed around this row: neither does the row
+                new[y] = rows[y]
+                changed[y] = 0
+                above = here
+                here = below
+                continue
+            above = here
+            here = below
+            active += 1
+            if y > 0:
+                a0 = s0[y - 1]
+                a1 = s1[y - 1]
+            elif wrap:
+                a0 = s0[h - 1]
+                a1 = s1[h - 1]
+            else:
+                a0 = a1 = 0
+            if y < h - 1:
+                b0 = s0[y + 1]
+                b1 = s1[y + 1]
+            elif wrap:
+                b0 = s0[0]
+                b1 = s1[0]
+            else:
+                b0 = b1 = 0
+            # Above + below: 0..6 in (c0, c1, c2)
+            c0 = a0 ^ b0
+            k = a0 & b0
+            c1 = a1 ^ b1 ^ k
+            c2 = (a1 & b1) | (k & (a1 ^ b1))
+            # + left and right neighbours: 0..8 in (d0, d1, d2, d3)
+            n0 = m0[y]
+            n1 = m1[y]
+            d0 = c0 ^ n0
+            k = c0 & n0
+            d1 = c1 ^ n1 ^ k
+            k = (c1 & n1) | (k & (c1 ^ n1))
+            d2 = c2 ^ k
+            d3 = c2 & k
+            # A cell lives with 3 neighbours, or with 2 if it was alive
+            x = rows[y]
+            n = d1 & ~(d2 | d3) & (d0 | x)
+            new[y] = n
+            changed[y] = n ^ x
+        self._next = rows
+        self.rows = new
+        self.generation += 1
+        return active
@@ -0,0 +1,165 @@
+# LifeExplorer.py
+# Game of Life explorer: an unbounded Hashlife world seen through a
+# viewport that pans and zooms
+#
+# Controls:
+#   up/down/left/right   pan
+#   A                    zoom in
+#   B                    zoom out
+#   B + up / B + down    jump twice / half as many generations per step
+#   B + right            pause or run
+#   B + left             leave
+#
+# The node cache needs the heap the frame buffer takes, so the screen is
+# drawn in strips with render() while the explorer runs.
+
+from PicoGameBoy import PicoGameBoy
+from Hashlife import Hashlife, read_rle, parse_rle, NW, NE, SW, SE, LEVEL, POP
+import gc
+
+BLACK = PicoGameBoy.color(0,0,0)
+WHITE = PicoGameBoy.color(255,255,255)
+GREEN = PicoGameBoy.color(0,255,0)
+
+BACKGROUND_COLOR = BLACK
+CELL_COLOR = GREEN
+TEXT_COLOR = WHITE
+UPDATES_PER_SECOND = 10
+PAN_PIXELS = 32      # How far one step of the d-pad moves the view
+MIN_ZOOM = -12       # 4096 cells per pixel
+MAX_ZOOM = 3         # 8 pixels per cell
+MAX_SPEED = 1 << 30  # Generations per step
+
+# Acorn, a methuselah that settles after 5206 generations
+ACORN = ('x = 7, y = 3, rule = B3/S23', 'bo5b$3bo3b$2o2b3o!')
+
+
+def load_pattern(life, width, height, cells):
+    # Put the pattern in the world, centered on the origin
+    dx = width // 2
+    dy = height // 2
+    life.load((x - dx, y - dy) for x, y in cells)
+
+
+def draw_world(fb, life, cx, cy, zoom):
+    # The live cells around world cell (cx, cy), at the center of the
+    # screen: 2 ** zoom pixels per cell, or 2 ** -zoom cells per pixel
+    # Nodes outside the screen or the strip being drawn are skipped
+    # whole, and so are the insides of nodes smaller than a pixel
+    fb.fill(BACKGROUND_COLOR)
+    w2 = fb.width // 2
+    h2 = fb.height // 2
+    root = life.root
+    half = 1 << (root[LEVEL] - 1)
+    stack = [(root, -half, -half)]
+    while stack:
+        node, x, y = stack.pop()
+        if not node[POP]:
+            continue
+        level = node[LEVEL]
+        if zoom >= 0:
+            sx = ((x - cx) << zoom) + w2
+            sy = ((y - cy) << zoom) + h2
+        else:
+            sx = ((x - cx) >> -zoom) + w2
+            sy = ((y - cy) >> -zoom) + h2
+        size = 1 << (level + zoom) if level + zoom > 0 else 1
+        if not fb.visible(sy, size, sx, size) or sx >= fb.width or sx + size <= 0:
+            continue
+        if level == 0 or level + zoom <= 0:
+            fb.fill_rect(sx, sy, size, size, CELL_COLOR)
+            continue
+        h = 1 << (level - 1)
+        stack.append((node[NW], x, y))
+        stack.append((node[NE], x + h, y))
+        stack.append((node[SW], x, y + h))
+        stack.append((node[SE], x + h, y + h))
+
+
+def draw_status(fb, life, speed, zoom, running):
+    if not fb.visible(0, 10):
+        return
+    scale = '%d:1' % (1 << zoom) if zoom >= 0 else '1:%d' % (1 << -zoom)
+    s = 'gen %d pop %d +%d %s%s' % (life.generation, life.population(), speed, scale,
+                                    '' if running else ' paused')
+    fb.fill_rect(0, 0, 8 * len(s) + 4, 10, BACKGROUND_COLOR)
+    fb.text(s, 2, 1, TEXT_COLOR)
+
+
+def lifeexplorer_main(gameboy, path=None):
+
+    pgb = gameboy
+    pgb.reset_buffer()
+    life = Hashlife()
+    if path:
+        width, height, cells = read_rle(path)
+    else:
+        width, height, cells = parse_rle(ACORN)
+    load_pattern(life, width, height, cells)
+    del cells
+
+    cx = 0
+    cy = 0
+    zoom = 1
+    speed = 1
+    running = True
+    combo = False  # B was used with a direction and zooms out no more
+    redraw = True
+
+    def draw(fb):
+        draw_world(fb, life, cx, cy, zoom)
+        draw_status(fb, life, speed, zoom, running)
+
+    def render():
+        nonlocal redraw
+        if redraw:
+            pgb.render(draw)
+            redraw = False
+
+    def update():
+        nonlocal cx, cy, zoom, speed, running, combo, redraw
+        pgb.update_input()
+        if pgb.just_pressed(pgb.B):
+            combo = False
+        if pgb.pressed(pgb.B):
+            if pgb.just_pressed(pgb.LEFT):
+                return True
+            if pgb.just_pressed(pgb.UP) and speed < MAX_SPEED:
+                speed <<= 1
+            elif pgb.just_pressed(pgb.DOWN) and speed > 1:
+                speed >>= 1
+            elif pgb.just_pressed(pgb.RIGHT):
+                running = not running
+            if pgb.just_pressed(pgb.UP | pgb.DOWN | pgb.RIGHT):
+                combo = True
+                redraw = True
+        else:
+            if pgb.just_released(pgb.B) and not combo and zoom > MIN_ZOOM:
+                zoom -= 1
+                redraw = True
+            if pgb.just_pressed(pgb.A) and zoom < MAX_ZOOM:
+                zoom += 1
+                redraw = True
+            step = PAN_PIXELS >> zoom if zoom >= 0 else PAN_PIXELS << -zoom
+            if pgb.pressed(pgb.LEFT):
+                cx -= step
+            if pgb.pressed(pgb.RIGHT):
+                cx += step
+            if pgb.pressed(pgb.UP):
+                cy -= step
+            if pgb.pressed(pgb.DOWN):
+                cy += step
+            if pgb.pressed(pgb.LEFT | pgb.RIGHT | pgb.UP | pgb.DOWN):
+                redraw = True
+        if running:
+            life.step(speed)
+            redraw = True
+        return False
+
+    # speed generations per update, drawn when the view changed
+    pgb.run_loop(update, render, UPDATES_PER_SECOND, max_updates=1)
+
+    # Give the heap back to the frame buffer
+    life = None
+    gc.collect()
+    pgb.create_buffer()
@@ -0,0 +1,360 @@
+# Mixer.py
+# Background audio for the Raspberry Pi Pico Game Boy, mixed on core 1
+#
+# Channel 0 plays music streamed from an 8-bit mono WAV file, channels 1
+# and 2 play sound effects: square wave tones or short samples kept in
+# RAM. Core 0 and core 1 only share single-producer, single-consumer rings
+# (the music data and a command queue) whose positions each side writes
+# for one end only, so neither core ever waits on a lock.
+
+from machine import Timer
+from time import ticks_us, ticks_add, ticks_diff, sleep_us
+from array import array
+from WavPlayer import parse_wav
+from AssetPack import PCM8
+import micropython
+import _thread
+
+# Commands from core 0 to core 1: (command, channel, a, b, c)
+_STOP = 0
+_MUSIC = 1  # a: ring position where the new music starts, b: volume, c: switch
+_TONE = 2  # a: phase step, b: samples (-1 until stopped), c: volume
+_SAMPLE = 3  # a: sample id, b: volume
+_VOLUME = 4  # a: volume
+_FADE = 5  # a: target volume, b: change per block
+_QUIT = 6
+
+# What each channel is playing
+_OFF = 0
+_RING = 1
+_SQUARE = 2
+_PCM = 3
+
+
+class Mixer:
+    MUSIC = 0  # Channels
+    SFX1 = 1
+    SFX2 = 2
+    CHANNELS = 3
+    RING = 4096  # Bytes of streamed music, half a second at 8 kHz
+    BLOCK = 32  # Samples mixed at a time
+    QUEUE = 16  # Commands that can wait for core 1
+    PUMP_MS = 20  # Period of the music refills on core 0
+    TONE_LEVEL = 48  # Amplitude of square wave tones at full volume
+
+    def __init__(self, pwm, rate=8000):
+        self._pwm = pwm
+        self.rate = rate
+        self.running = False
+        # Music ring: core 0 writes pos[0], core 1 writes pos[1]
+        self._ring = bytearray(self.RING)
+        self._ring_pos = array('I', [0, 0])
+        # Music switches: core 0 counts them in [0], core 1 in [1] once it
+        # reads from where the new music starts; core 0 writes nothing to
+        # the ring in between, so only it ever moves the write position
+        self._switch = array('I', [0, 0])
+        self._file = None
+        # Command queue: core 0 writes pos[0], core 1 writes pos[1]
+        self._queue = array('i', [0] * (5 * self.QUEUE))
+        self._queue_pos = array('I', [0, 0])
+        self._samples = []  # PCM data of the loaded sound effects
+        self._timer = None
+        self._pump_ref = self.pump
+        # Channel state, only touched by core 1
+        n = self.CHANNELS
+        self._kind = [_OFF] * n
+        self._vol = [256] * n
+        self._target = [256] * n
+        self._fade = [0] * n
+        self._phase = [0] * n
+        self._step = [0] * n
+        self._left = [0] * n
+        self._data = [None] * n
+        self._acc = array('i', [0] * self.BLOCK)
+
+    def start(self):
+        """
+        Start mixing on core 1. Returns False when core 1 is already
+        running something else, e.g. the Chimera frame pipeline.
+        """
+        if self.running:
+            return True
+        self._done = _thread.allocate_lock()
+        self._done.acquire()
+        self._queue_pos[0] = self._queue_pos[1] = 0
+        self._switch[1] = self._switch[0]  # Switches queued before are lost
+        self.running = True
+        try:
+            _thread.start_new_thread(self._run, ())
+        except OSError:
+            # core 1 is busy
+            self.running = False
+            self._done = None
+            return False
+        self._timer = Timer(period=self.PUMP_MS, mode=Timer.PERIODIC, callback=self._on_timer)
+        return True
+
+    def stop(self):
+        # Stop core 1 and close the music file
+        if not self.running:
+            return
+        self._timer.deinit()
+        self._timer = None
+        self._send(_QUIT, 0)
+        self._done.acquire()
+        self.running = False
+        self._close()
+        self._pwm.duty_u16(0)
+
+    # Core 0 side
+
+    def play_music(self, path, loop=False, volume=1):
+        """
+        Stream the 8-bit mono WAV file at `path` on the music channel,
+        from the start again at its end if `loop`.
+        """
+        self._close()
+        f = open(path, 'rb')
+        try:
+            rate, bits, channels, offset, size = parse_wav(f)
+            if bits != 8 or channels != 1 or rate != self.rate:
+                raise ValueError('Music must be 8-bit mono at %d Hz.' % self.rate)
+        except Exception:
+            f.close()
+            raise
+        switch = self._switch
+        switch[0] += 1
+        self._file = f
+        self._loop = loop
+        self._start = offset
+        self._size = size
+        self._left_bytes = size
+        self._send(_MUSIC, self.MUSIC, self._ring_pos[0], self._level(volume), switch[0])
+        self.pump()
+
+    def load(self, path, name=None):
+        # Read a short 8-bit mono WAV sound effect into RAM, or sound `name`
+        # of the AssetPack `path`; returns its id
+        if name is not None:
+            rate, _, fmt, _ = path.info(name)
+            if fmt != PCM8 or rate != self.rate:
+                raise ValueError('Sound effects must be 8-bit mono at %d Hz.' % self.rate)
+            self._samples.append(path.read(name))
+            return len(self._samples) - 1
+        with open(path, 'rb') as f:
+            rate, bits, channels, offset, size = parse_wav(f)
+            if bits != 8 or channels != 1 or rate != self.rate:
+                raise ValueError('Sound effects must be 8-bit mono at %d Hz.' % self.rate)
+            data = bytearray(size)
+            f.readinto(data)
+        self._samples.append(data)
+        return len(self._samples) - 1
+
+    def play(self, channel, sample, volume=1):
+        # Play sound effect `sample` (an id from load()) on `channel`
+        self._send(_SAMPLE, channel, sample, self._level(volume))
+
+    def tone(self, channel, freq, ms=0, volume=1):
+        # Square wave of `freq` Hz on `channel` for `ms`, or until stopped
+        if freq <= 0:
+            self._send(_STOP, channel)
+            return
+        samples = ms * self.rate // 1000 if ms > 0 else -1
+        self._send(_TONE, channel, freq * 65536 // self.rate, samples, self._level(volume))
+
+    def volume(self, channel, volume):
+        self._send(_VOLUME, channel, self._level(volume))
+
+    def fade(self, channel, volume, ms):
+        # Move the volume of `channel` to `volume` over `ms` milliseconds
+        blocks = max(ms * self.rate // (1000 * self.BLOCK), 1)
+        self._send(_FADE, channel, self._level(volume), max(256 // blocks, 1))
+
+    def music_playing(self):
+        # True until core 1 has played the music to its end: the file is
+        # still open, the new music has not started yet, or the ring still
+        # holds data for the music channel
+        if self._file is not None or self._switch[0] != self._switch[1]:
+            return True
+        return self._kind[self.MUSIC] == _RING and self._ring_pos[0] != self._ring_pos[1]
+
+    def stop_channel(self, channel):
+        if channel == self.MUSIC:
+            self._close()
+        self._send(_STOP, channel)
+
+    def pump(self, _=None):
+        # Top up the music ring from the file; runs from a core 0 timer
+        f = self._file
+        if f is None or self._switch[0] != self._switch[1]:
+            return  # Core 1 has not skipped to the new music yet
+        ring = self._ring
+        pos = self._ring_pos
+        size = len(ring)
+        w = pos[0]
+        free = (pos[1] - w - 1) % size
+        while free:
+            if self._left_bytes == 0:
+                if not self._loop:
+                    self._close()
+                    break
+                f.seek(self._start)
+                self._left_bytes = self._size
+            n = min(free, size - w, self._left_bytes)
+            n = f.readinto(memoryview(ring)[w:w + n])
+            if not n:
+                self._close()  # Truncated file
+                break
+            self._left_bytes -= n
+            free -= n
+            w = (w + n) % size
+            pos[0] = w
+
+    def _on_timer(self, _):
+        micropython.schedule(self._pump_ref, None)
+
+    def _close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _level(self, volume):
+        return min(max(int(volume * 256), 0), 256)
+
+    def _send(self, cmd, channel, a=0, b=0, c=0):
+        q = self._queue
+        pos = self._queue_pos
+        w = pos[0]
+        nxt = (w + 1) % self.QUEUE
+        while nxt == pos[1]:
+            sleep_us(100)  # Full: core 1 empties it every block
+        k = 5 * w
+        q[k] = cmd
+        q[k + 1] = channel
+        q[k + 2] = a
+        q[k + 3] = b
+        q[k + 4] = c
+        pos[0] = nxt
+
+    # Core 1 side
+
+    def _run(self):
+        period = 1000000 // self.rate
+        out = bytearray(self.BLOCK)
+        pwm = self._pwm
+        t = ticks_us()
+        while self._command():
+            self._mix(out)
+            for v in out:
+                d = ticks_diff(t, ticks_us())
+                if d > 0:
+                    sleep_us(d)
+                pwm.duty_u16(v << 8)
+                t = ticks_add(t, period)
+        self._done.release()
+
+    def _command(self):
+        # Apply the queued commands; False once asked to quit
+        pos = self._queue_pos
+        q = self._queue
+        r = pos[1]
+        while r != pos[0]:
+            k = 5 * r
+            r = (r + 1) % self.QUEUE
+            if not self._apply(q[k], q[k + 1], q[k + 2], q[k + 3], q[k + 4]):
+                pos[1] = r
+                return False
+            pos[1] = r
+        return True
+
+    def _apply(self, cmd, c, a, b, d):
+        if cmd == _QUIT:
+            return False
+        if cmd == _STOP:
+            self._kind[c] = _OFF
+        elif cmd == _MUSIC:
+            # Core 0 stopped writing at a, so this only skips forward over
+            # what is left of the previous music
+            self._ring_pos[1] = a
+            self._switch[1] = d
+            self._kind[c] = _RING
+            self._vol[c] = self._target[c] = b
+        elif cmd == _TONE:
+            self._kind[c] = _SQUARE
+            self._step[c] = a
+            self._left[c] = b
+            self._vol[c] = self._target[c] = d
+        elif cmd == _SAMPLE:
+            self._kind[c] = _PCM
+            self._data[c] = self._samples[a]
+            self._left[c] = 0
+            self._vol[c] = self._target[c] = b
+        elif cmd == _VOLUME:
+            self._vol[c] = self._target[c] = a
+        elif cmd == _FADE:
+            self._target[c] = a
+            self._fade[c] = b
+        return True
+
+    @micropython.native
+    def _mix(self, out):
+        # Mix one block of every channel into `out` as unsigned 8-bit PCM
+        acc = self._acc
+        n = len(out)
+        for i in range(n):
+            acc[i] = 0
+        for c in range(self.CHANNELS):
+            kind = self._kind[c]
+            if kind == _OFF:
+                continue
+            v = self._vol[c]
+            if v != self._target[c]:
+                # Fades move once per block
+                if v < self._target[c]:
+                    v = min(v + self._fade[c], self._target[c])
+                else:
+                    v = max(v - self._fade[c], self._target[c])
+                self._vol[c] = v
+            if kind == _RING:
+                ring = self._ring
+                pos = self._ring_pos
+                size = len(ring)
+                r = pos[1]
+                w = pos[0]
+                for i in range(n):
+                    if r == w:
+                        break  # Underrun: the rest of the block is silent
+                    acc[i] += (ring[r] - 128) * v >> 8
+                    r += 1
+                    if r == size:
+                        r = 0
+                pos[1] = r
+            elif kind == _SQUARE:
+                ph = self._phase[c]
+                step = self._step[c]
+                left = self._left[c]
+                amp = self.TONE_LEVEL * v >> 8
+                for i in range(n):
+                    if left == 0:
+                        self._kind[c] = _OFF
+                        break
+                    acc[i] += amp if ph & 0x8000 else -amp
+                    ph = (ph + step) & 0xFFFF
+                    if left > 0:
+                        left -= 1
+                self._phase[c] = ph
+                self._left[c] = left
+            else:
+                data = self._data[c]
+                p = self._left[c]
+                end = len(data)
+                for i in range(n):
+                    if p == end:
+                        self._kind[c] = _OFF
+                        break
+                    acc[i] += (data[p] - 128) * v >> 8
+                    p += 1
+                self._left[c] = p
+        for i in range(n):
+            s = acc[i] + 128
+            out[i] = 0 if s < 0 else 255 if s > 255 else s
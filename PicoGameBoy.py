@@ -1,11 +1,47 @@
-from machine import Pin, PWM, SPI, reset, soft_reset
-from framebuf import FrameBuffer, RGB565
+from machine import Pin, PWM, SPI, mem32, reset, soft_reset
+from framebuf import FrameBuffer, RGB565, GS8, GS4_HMSB
 from Chimera import Chimera
-from time import sleep, sleep_us
-import struct
+from WavPlayer import WavPlayer
+from Mixer import Mixer
+from time import sleep, sleep_us, ticks_ms, ticks_us, ticks_add, ticks_diff
+from array import array
+
+# One registered sprite: its FrameBuffer, the position and size of the
+# area that sprite() blits (the opaque part of a sprite with a key color),
+# its full size, blit key and palette (None for RGB565 sprites), registry
+# name and the number of add_sprite() calls that still hold it
+class _Sprite:
+    __slots__ = ('fb', 'x', 'y', 'w', 'h', 'width', 'height', 'key', 'pal',
+                 'name', 'refs')
+
+    def __init__(self, fb, w, h, pal, name):
+        self.fb = fb
+        self.x = 0
+        self.y = 0
+        self.w = self.width = w
+        self.h = self.height = h
+        self.key = -1
+        self.pal = pal
+        self.name = name
+        self.refs = 1
 
 class PicoGameBoy(Chimera):
-    def __init__(self, rotation=90):
+    # Button bits of the input masks: bit n is GPIO n
+    UP = 1 << 2
+    DOWN = 1 << 3
+    LEFT = 1 << 4
+    RIGHT = 1 << 5
+    B = 1 << 7
+    OFF = 1 << 8
+    A = 1 << 9
+    ANY = UP | DOWN | LEFT | RIGHT | A | B  # The buttons any_button() looks at
+    BUTTONS = ANY | OFF
+    GPIO_IN = 0xd0000004  # SIO register with the input level of every GPIO
+    DEBOUNCE_MS = 20  # A button ignores changes this long after it changed
+    PRESS = 1  # Edges of input events
+    RELEASE = 0
+
+    def __init__(self, rotation=90, framebuffer=True, bpp=16):
         self.__up = Pin(2, Pin.IN, Pin.PULL_UP)
         self.__down = Pin(3, Pin.IN, Pin.PULL_UP)
         self.__left = Pin(4, Pin.IN, Pin.PULL_UP)
@@ -16,15 +52,24 @@ class PicoGameBoy(Chimera):
         self.__buzzer = PWM(Pin(13))
         self.__speaker = PWM(Pin(26))
         
-        super().__init__(cs=17, dc=15, rst=14, sck=18, mosi=19, rotation=rotation)
+        super().__init__(cs=17, dc=15, rst=14, sck=18, mosi=19, rotation=rotation,
+                         framebuffer=framebuffer, bpp=bpp)
+
+        self.__sprites = []  # _Sprite records indexed by handle, None when free
+        self.__free = []  # Handles of the free slots, reused first
+        self.__names = {}  # Sprite name -> handle
 
-        self.__fb = []  # Array of FrameBuffer objects for sprites
-        self.__w = []
-        self.__h = []
+        self.__state = 0  # Debounced button mask of the last update_input()
+        self.__prev = 0  # ... and of the update before it
+        start = ticks_add(ticks_ms(), -self.DEBOUNCE_MS)
+        self.__since = [start] * 10  # ticks_ms() of the last change of each GPIO
+        self.__events = None  # Input event ring buffer, see start_events()
 
-        self.SAMPLE_RATE = 44100
+        self.SAMPLE_RATE = 44100  # PWM carrier frequency of the speaker
         self.VOLUME = 1
         self.__speaker.freq(self.SAMPLE_RATE)
+        self.__player = None  # WavPlayer, created by the first play_sound()
+        self.mixer = None  # Mixer on core 1 while start_audio() is in effect
 
     # center_text(s,color) displays a text in the middle of
     # the screen with the specified color
@@ -41,56 +86,315 @@ class PicoGameBoy(Chimera):
         self.text(s, x, y, color)
 
     # add_sprite(buffer,w,h) creates a new sprite from framebuffer
-    # with a width of w and a height of h
-    # The first sprite is #0 and can be displayed by sprite(0,x,y)
-    def add_sprite(self, buffer, w, h):
-        fb = FrameBuffer(buffer, w, h, RGB565)
-        self.__fb.append(fb)
-        self.__w.append(w)
-        self.__h.append(h)
-    
-    # remove an especific array
-    def remove_sprite(self, index):
-        if 0 <= index < len (self.__fb):
-            del self.__fb[index]
-            del self.__w[index]
-            del self.__h[index]
+    # with a width of w and a height of h and returns its handle
+    # The handle stays valid until the sprite is removed and is
+    # displayed by sprite(handle,x,y)
+    # Palettized sprites pass fmt=GS8 or GS4_HMSB and palette, a list of
+    # the RGB565 colors of their indices
+    # Pixels of color key (a palette index for palettized sprites) are
+    # transparent
+    # A sprite added with a name that is already registered is not
+    # created again: the existing handle is returned and must be
+    # released by one more remove_sprite()
+    def add_sprite(self, buffer, w, h, fmt=RGB565, palette=None, name=None, key=-1):
+        if name is not None and name in self.__names:
+            handle = self.__names[name]
+            self.__sprites[handle].refs += 1
+            return handle
+        if fmt == RGB565 and self.bpp != 16:
+            raise RuntimeError('RGB565 sprites need a 16 bpp screen.')
+        if fmt != RGB565 and palette is None and self.bpp == 16:
+            raise RuntimeError('Palettized sprites need a palette on a 16 bpp screen.')
+        record = _Sprite(FrameBuffer(buffer, w, h, fmt), w, h, self.__palette(palette), name)
+        if key != -1:
+            self.__trim(record, buffer, fmt, key)
+        return self.__register(record)
+
+    # __trim(s,buffer,fmt,key) scans sprite s once for pixels of color key
+    # and narrows it to the bounding box of the other pixels, so sprite()
+    # blits and damages only that area; the key is dropped if no pixel
+    # inside the box is transparent, which keeps the plain blit for
+    # sprites that are only transparent around their edges
+    def __trim(self, s, buffer, fmt, key):
+        fb = s.fb
+        w = s.width
+        x0 = w
+        y0 = s.height
+        x1 = y1 = 0
+        for y in range(s.height):
+            x = 0
+            while x < w and fb.pixel(x, y) == key:
+                x += 1
+            if x == w:
+                continue
+            end = w
+            while fb.pixel(end - 1, y) == key:
+                end -= 1
+            x0 = min(x0, x)
+            x1 = max(x1, end)
+            y0 = min(y0, y)
+            y1 = y + 1
+        if y1 == 0:
+            # Nothing opaque: blit one transparent pixel
+            s.w = s.h = 1
+            s.key = key if s.pal is None else s.pal.pixel(key, 0)
+            return
+        holes = False
+        for y in range(y0, y1):
+            for x in range(x0, x1):
+                if fb.pixel(x, y) == key:
+                    holes = True
+                    break
+            if holes:
+                break
+        offset = y0 * w + x0
+        if fmt == GS4_HMSB and offset & 1:
+            # Two pixels per byte: start the box on a byte boundary
+            if x0 > 0:
+                x0 -= 1
+            else:
+                y0 -= 1
+            offset = y0 * w + x0
+            holes = True
+        if fmt == RGB565:
+            offset *= 2
+        elif fmt == GS4_HMSB:
+            offset //= 2
+        s.fb = FrameBuffer(memoryview(buffer)[offset:], x1 - x0, y1 - y0, fmt, w)
+        s.x = x0
+        s.y = y0
+        s.w = x1 - x0
+        s.h = y1 - y0
+        if holes:
+            # blit() compares the key with the color after the palette
+            # lookup, so palettized sprites use the color of their index
+            s.key = key if s.pal is None else s.pal.pixel(key, 0)
+
+    # __register(record) stores a sprite in a free slot and returns its handle
+    def __register(self, record):
+        if self.__free:
+            handle = self.__free.pop()
+            self.__sprites[handle] = record
+        else:
+            handle = len(self.__sprites)
+            self.__sprites.append(record)
+        if record.name is not None:
+            self.__names[record.name] = handle
+        return handle
+
+    # load_sprite(pack,name) adds sprite name of an AssetPack and returns
+    # its handle; the pixels are read into buffer if one is given, else
+    # into a new bytearray
+    # The transparent key stored in the pack is used unless key is given
+    # A sprite that is already loaded is only referenced once more and
+    # nothing is read from the pack
+    def load_sprite(self, pack, name, buffer=None, key=None):
+        handle = self.__names.get(name)
+        if handle is not None:
+            self.__sprites[handle].refs += 1
+            return handle
+        w, h, fmt, _ = pack.info(name)
+        if key is None:
+            key = pack.key(name)
+        return self.add_sprite(pack.read(name, buffer), w, h, fmt, pack.palette(name), name, key)
+
+    # sprite_handle(name) returns the handle of a named sprite, or None
+    def sprite_handle(self, name):
+        return self.__names.get(name)
+
+    # __palette(colors) builds the FrameBuffer that blit() uses to map
+    # sprite indices to screen colors (screen palette indices if the
+    # screen itself is palettized)
+    def __palette(self, colors):
+        if colors is None:
+            return None
+        n = len(colors)
+        if self.bpp == 16:
+            pal = FrameBuffer(bytearray(2 * n), n, 1, RGB565)
+            for i in range(n):
+                pal.pixel(i, 0, colors[i])
         else:
-            print ("invalid index")
+            pal = FrameBuffer(bytearray(n), n, 1, GS8)
+            for i in range(n):
+                pal.pixel(i, 0, self.palette_index(colors[i]))
+        return pal
+    
+    # remove_sprite(handle) releases a sprite; its slot is freed for
+    # a later add_sprite() once every holder has released it
+    # The handles of the other sprites do not change
+    # Raises IndexError for a handle that holds no sprite
+    def remove_sprite(self, handle):
+        if not (0 <= handle < len(self.__sprites) and self.__sprites[handle] is not None):
+            raise IndexError('No sprite with handle %d.' % handle)
+        record = self.__sprites[handle]
+        record.refs -= 1
+        if record.refs == 0:
+            self.__sprites[handle] = None
+            self.__free.append(handle)
+            if record.name is not None:
+                del self.__names[record.name]
 
-    # clear the entire sprite array
+    # clear the entire sprite array: every handle is released whatever
+    # its reference count, and the handles are given out from 0 again
     def clear_ghost_array(self):
-        length = len(self.__fb)
-        for i in range(length):
-            self.remove_sprite(0)
+        self.__sprites = []
+        self.__free = []
+        self.__names = {}
             
     # add_rect_sprite(color,w,h) creates a new rectangular sprite
-    # with the specified color, width and height
+    # with the specified color, width and height and returns its handle
     def add_rect_sprite(self, color, w, h):
-        buffer = bytearray(w * h * 2)  # 2 bytes per pixel
-        # fill the buffer with the specified color
-        lsb = (color & 0b0000000011111111)
-        msb = (color & 0b1111111100000000) >> 8
-        for i in range(0, w * h * 2, 2):
-            buffer[i] = lsb
-            buffer[i + 1] = msb
-        fb = FrameBuffer(buffer, w, h, RGB565)
-        self.__fb.append(fb)
-        self.__w.append(w)
-        self.__h.append(h)
-
-    # sprite(n,x,y) displays the nth sprite at coordinates (x,y)
+        if self.bpp == 16:
+            fb = FrameBuffer(bytearray(w * h * 2), w, h, RGB565)  # 2 bytes per pixel
+        else:
+            fb = FrameBuffer(bytearray(w * h), w, h, GS8)
+            color = self.palette_index(color)
+        fb.fill(color)
+        return self.__register(_Sprite(fb, w, h, None, None))
+
+    # sprite(n,x,y) displays the sprite with handle n at coordinates (x,y)
     # the sprite must be created first by method add_sprite
     def sprite(self, n, x, y):
-        self.blit(self.__fb[n], x, y)
+        s = self.__sprites[n]
+        self.blit(s.fb, x + s.x, y + s.y, s.key, s.pal, s.w, s.h)
 
-    # sprite_width(n) returns the width of the nth sprite in pixels
+    # sprite_width(n) returns the width of sprite n in pixels
     def sprite_width(self, n):
-        return self.__w[n]
+        return self.__sprites[n].width
 
-    # sprite_height(n) returns the height of the nth sprite in pixels
+    # sprite_height(n) returns the height of sprite n in pixels
     def sprite_height(self, n):
-        return self.__h[n]
+        return self.__sprites[n].height
+
+    # update_input() reads every button at once and returns the mask of
+    # the buttons held down; call it once per frame, then test bits with
+    # pressed(), just_pressed() and just_released()
+    # A button that changed less than DEBOUNCE_MS ago keeps its state, so
+    # contact bounce does not produce extra presses and nothing sleeps
+    def update_input(self):
+        raw = ~mem32[self.GPIO_IN] & self.BUTTONS  # Buttons pull their pin low
+        state = self.__state
+        self.__prev = state
+        changed = raw ^ state
+        if changed:
+            now = ticks_ms()
+            since = self.__since
+            for n in range(2, 10):
+                if changed >> n & 1 and ticks_diff(now, since[n]) >= self.DEBOUNCE_MS:
+                    state ^= 1 << n
+                    since[n] = now
+            self.__state = state
+        return state
+
+    # pressed(mask) returns the buttons of mask held down at the last
+    # update_input()
+    def pressed(self, mask=ANY):
+        return self.__state & mask
+
+    # just_pressed(mask) returns the buttons of mask that went down at
+    # the last update_input()
+    def just_pressed(self, mask=ANY):
+        return self.__state & ~self.__prev & mask
+
+    # just_released(mask) returns the buttons of mask that went up at
+    # the last update_input()
+    def just_released(self, mask=ANY):
+        return self.__prev & ~self.__state & mask
+
+    # start_events(size) records every button edge from pin interrupts
+    # in a preallocated ring of size events, read back with events()
+    # Taps shorter than a frame are then kept however long the frame
+    # takes
+    def start_events(self, size=32):
+        self.stop_events()
+        # Times, codes (GPIO | 0x80 when pressed), and positions: next
+        # write, next read, events dropped because the ring was full
+        self.__events = (array('I', [0] * size), bytearray(size), array('I', [0, 0, 0]))
+        self.__ev_state = ~mem32[self.GPIO_IN] & self.BUTTONS
+        start = ticks_add(ticks_us(), -self.DEBOUNCE_MS * 1000)
+        self.__ev_last = array('I', [start] * 10)  # ticks_us() of the last event of each GPIO
+        self.__ev_seen = array('I', [start] * 10)  # ... and of its last edge, kept or not
+        for n, pin in self.__button_pins():
+            pin.irq(self.__edge_handler(n), Pin.IRQ_FALLING | Pin.IRQ_RISING, hard=True)
+
+    # stop_events() turns the pin interrupts off and drops the queue
+    def stop_events(self):
+        if self.__events is None:
+            return
+        for n, pin in self.__button_pins():
+            pin.irq(None)
+        self.__events = None
+
+    def __button_pins(self):
+        return ((2, self.__up), (3, self.__down), (4, self.__left), (5, self.__right),
+                (7, self.__button_B), (8, self.__button_off), (9, self.__button_A))
+
+    # __edge_handler(n) makes the interrupt handler of GPIO n; it runs as
+    # a hard interrupt, so it only stores numbers in the preallocated ring
+    def __edge_handler(self, n):
+        times, codes, pos = self.__events
+        size = len(codes)
+
+        def handler(pin):
+            i = pos[0]
+            j = i + 1 if i + 1 < size else 0
+            if j == pos[1]:
+                pos[2] += 1
+                return
+            times[i] = ticks_us()
+            codes[i] = n if pin.value() else n | 0x80
+            pos[0] = j
+        return handler
+
+    # events() drains the queue and returns a list of (button, edge, t):
+    # button is a bit such as PicoGameBoy.A, edge PRESS or RELEASE and t
+    # the ticks_us() of the interrupt, for latency measurements
+    # Edges that do not change a button's state or that come less than
+    # DEBOUNCE_MS after its last event are contact bounce and are dropped;
+    # a button whose pin then stays DEBOUNCE_MS at another level than its
+    # state (the last edge was dropped, or the queue was full) gets the
+    # missing event, timed at its last edge
+    def events(self):
+        out = []
+        if self.__events is None:
+            return out
+        times, codes, pos = self.__events
+        size = len(codes)
+        state = self.__ev_state
+        last = self.__ev_last
+        seen = self.__ev_seen
+        window = self.DEBOUNCE_MS * 1000
+        while pos[1] != pos[0]:
+            i = pos[1]
+            code = codes[i]
+            t = times[i]
+            pos[1] = i + 1 if i + 1 < size else 0
+            n = code & 0x7F
+            bit = 1 << n
+            seen[n] = t
+            if ((code & 0x80) == 0) == ((state & bit) == 0):
+                continue
+            if ticks_diff(t, last[n]) < window:
+                continue
+            last[n] = t
+            state ^= bit
+            out.append((bit, self.PRESS if code & 0x80 else self.RELEASE, t))
+        changed = (~mem32[self.GPIO_IN] & self.BUTTONS) ^ state
+        if changed:
+            now = ticks_us()
+            for n in range(2, 10):
+                bit = 1 << n
+                if changed & bit and ticks_diff(now, seen[n]) >= window:
+                    t = seen[n]
+                    last[n] = t
+                    state ^= bit
+                    out.append((bit, self.PRESS if state & bit else self.RELEASE, t))
+        self.__ev_state = state
+        return out
+
+    # dropped_events() returns how many edges did not fit in the queue
+    def dropped_events(self):
+        return 0 if self.__events is None else self.__events[2][2]
 
     # button_up() returns True when the player presses the up button
     def button_up(self):
@@ -123,25 +427,16 @@ class PicoGameBoy(Chimera):
 
     # any_button() returns True if any button is pressed
     def any_button(self):
-        button_pressed = False
-        if self.button_up():
-            button_pressed = True
-        if self.button_down():
-            button_pressed = True
-        if self.button_left():
-            button_pressed = True
-        if self.button_right():
-            button_pressed = True
-        if self.button_A():
-            button_pressed = True
-        if self.button_B():
-            button_pressed = True
-        return button_pressed
+        return (~mem32[self.GPIO_IN] & self.ANY) != 0
 
     # sound(freq) makes a sound at the selected frequency in Hz
     # call sound(0) to stop playing the sound
+    # With the mixer running the sound is a tone on its first sound
+    # effect channel, over the music, and duty_u16 is not used
     def sound(self, freq, duty_u16=5000):
-        if freq > 0:
+        if self.mixer is not None:
+            self.mixer.tone(Mixer.SFX1, freq)
+        elif freq > 0:
             self.__speaker.freq(freq)
             self.__speaker.duty_u16(duty_u16)
         else:
@@ -151,19 +446,103 @@ class PicoGameBoy(Chimera):
     def enter_low_power(self):
         reset()
 
-    def play_sound(self, audio, readbytes=1, sleep = True):
+    # play_sound(audio,loop) starts playing the WAV file audio on the
+    # speaker at its own sample rate and returns at once; a timer
+    # interrupt outputs the samples, so the game keeps running
+    # The volume is VOLUME (0 to 1) when the sound starts, or
+    # sound_volume(v) while it plays
+    # With the mixer running the file plays on its music channel
+    def play_sound(self, audio, loop=False):
+        if self.mixer is not None:
+            self.mixer.play_music(audio, loop, self.VOLUME)
+            return
+        if self.__player is None:
+            self.__player = WavPlayer(self.__speaker)
+        self.__player.volume(self.VOLUME)
+        self.__player.play(audio, loop)
+
+    # stop_sound() stops the WAV file started by play_sound()
+    def stop_sound(self):
+        if self.mixer is not None:
+            self.mixer.stop_channel(Mixer.MUSIC)
+        if self.__player is not None:
+            self.__player.stop()
+
+    # sound_playing() returns True while a WAV file is playing
+    def sound_playing(self):
+        if self.mixer is not None:
+            return self.mixer.music_playing()
+        return self.__player is not None and self.__player.playing()
+
+    # sound_volume(v) changes the volume (0 to 1) of the playing WAV file
+    def sound_volume(self, v):
+        self.VOLUME = v
+        if self.mixer is not None:
+            self.mixer.volume(Mixer.MUSIC, v)
+        if self.__player is not None:
+            self.__player.volume(v)
+
+    # start_audio() mixes all sound on core 1 from now on: music from
+    # play_sound() and, layered over it, sound() tones and the sound
+    # effects of mixer.load() and mixer.play()
+    # Returns False if core 1 is busy, e.g. with start_pipeline()
+    def start_audio(self, rate=8000):
+        if self.mixer is not None:
+            return True
+        self.stop_sound()
+        self.__speaker.freq(self.SAMPLE_RATE)
+        mixer = Mixer(self.__speaker, rate)
+        if not mixer.start():
+            return False
+        self.mixer = mixer
+        return True
+
+    # stop_audio() stops the mixer and frees core 1
+    def stop_audio(self):
+        if self.mixer is not None:
+            self.mixer.stop()
+            self.mixer = None
+
+    # run_loop(update,render,ups,fps) runs a game at a fixed rate: update()
+    # advances the game by one step of 1/ups seconds and render() draws it
+    # update() is called ups times per second of real time whatever the
+    # frame takes, several times in a row after a slow frame but at most
+    # max_updates times, so a game that cannot keep up slows down instead
+    # of falling further behind
+    # render() only runs after updates, and at most fps times per second
+    # (0: after every batch of updates); the time left until the next
+    # update or frame is slept
+    # The loop ends when update() returns True
+    def run_loop(self, update, render, ups=30, fps=0, max_updates=5):
+        step = 1000000 // ups
+        frame = 1000000 // fps if fps else 0
+        next_update = next_frame = ticks_us()
+        changed = False
         while True:
-            with open(audio, 'rb') as f:
-                f.read(44)  # Skip the 44-byte WAV header
-                while True:
-                    byte = f.read(readbytes)  # Read one byte at a time
-                    if not byte:
-                        break
-                    sample = struct.unpack('<B', byte)[0]  # Convert byte to int
-                    sample = int(sample * self.VOLUME)
-                    self.__speaker.duty_u16(sample * 256)  # Convert 8-bit sample to 16-bit PWM duty
-                    if sleep:
-                        sleep_us(int(1e6 / self.SAMPLE_RATE))
+            now = ticks_us()
+            n = 0
+            while ticks_diff(now, next_update) >= 0:
+                if n == max_updates:
+                    next_update = ticks_add(now, step)  # give up on the missed steps
+                    break
+                if update():
+                    return
+                next_update = ticks_add(next_update, step)
+                n += 1
+                changed = True
+            if changed and (not frame or ticks_diff(now, next_frame) >= 0):
+                render()
+                changed = False
+                if frame:
+                    next_frame = ticks_add(next_frame, frame)
+                    if ticks_diff(now, next_frame) >= 0:
+                        next_frame = ticks_add(now, frame)
+            now = ticks_us()
+            wait = ticks_diff(next_update, now)
+            if changed:
+                wait = min(wait, ticks_diff(next_frame, now))
+            if wait > 0:
+                sleep_us(wait)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,220 @@
+# Profiler.py
+# Per-frame timing for the Raspberry Pi Pico Game Boy
+#
+# attach() wraps the drawing and flush methods of a Chimera or PicoGameBoy
+# instance with ticks_us timers and counts the bytes written to its SPI
+# bus; begin() and end() time sections of the game itself. frame() closes
+# a frame and keeps the time of every section over the last `window`
+# frames, reported with min/avg/max/p95 as serial lines (print_report()
+# or every `serial` frames) or drawn over the game by overlay().
+#
+#   prof = Profiler(serial=60)
+#   prof.attach(pgb)
+#   while True:
+#       prof.begin('logic')
+#       ...
+#       prof.end('logic')
+#       pgb.show()
+#       prof.frame()
+#
+# Times are inclusive: a section that calls another wrapped method (show()
+# flushing, sprite() blitting, the draw callbacks of render()) counts that
+# time too. A disabled profiler does not wrap anything, and begin(), end()
+# and frame() return after testing one attribute, so the calls can stay in
+# the game.
+
+from time import ticks_us, ticks_diff
+from array import array
+
+# Methods attach() wraps when the object has them
+METHODS = ('fill', 'fill_rect', 'rect', 'line', 'text', 'blit', 'show',
+           'swap', 'render', 'refresh', 'scroll_by')
+
+
+class _CountingSPI:
+    # Stands in for the SPI bus of the display and counts written bytes
+    def __init__(self, spi, counter):
+        self.spi = spi
+        self.counter = counter
+
+    def write(self, buf):
+        self.counter[0] += len(buf)
+        self.spi.write(buf)
+
+    def __getattr__(self, name):
+        return getattr(self.spi, name)
+
+
+class Profiler:
+    FRAME = 'frame'  # Sections every report has
+    SPI = 'spi'
+
+    def __init__(self, window=32, serial=0, enabled=True):
+        self.window = window
+        self.serial = serial  # Print a report every `serial` frames, 0: never
+        self.enabled = enabled
+        self._names = []
+        self._index = {}
+        self._acc = array('I')  # Time of each section in the current frame
+        self._start = array('I')  # ticks_us of the open begin() of each section
+        self._hist = []  # Ring of the last `window` frames of each section
+        self._frames = 0
+        self._last = None
+        self._spi = array('I', [0])
+        self._target = None
+        self._wrapped = []
+        self._section(self.FRAME)
+        self._section(self.SPI)
+
+    def enable(self, on=True):
+        # Turn the profiler on or off; off also unwraps the attached object
+        if on == self.enabled:
+            return
+        target = self._target
+        if not on:
+            self.detach()
+        self.enabled = on
+        if target is not None:
+            self.attach(target)  # Only remembered while disabled
+        self._last = None
+
+    def attach(self, fb, methods=METHODS):
+        """
+        Time the `methods` of `fb` that exist and count the bytes it writes
+        to its SPI bus. Does nothing while the profiler is disabled.
+        """
+        self._target = fb
+        if not self.enabled:
+            return
+        self._wrapped = []
+        for name in methods:
+            fn = getattr(fb, name, None)
+            if fn is not None:
+                setattr(fb, name, self._wrap(self._section(name), fn))
+                self._wrapped.append(name)
+        if not isinstance(fb.spi, _CountingSPI):
+            fb.spi = _CountingSPI(fb.spi, self._spi)
+
+    def detach(self):
+        # Give the attached object its own methods and SPI bus back
+        fb = self._target
+        if fb is None or not self.enabled:
+            self._target = None
+            return
+        for name in self._wrapped:
+            delattr(fb, name)
+        self._wrapped = []
+        if isinstance(fb.spi, _CountingSPI):
+            fb.spi = fb.spi.spi
+        self._target = None
+
+    def begin(self, name):
+        if not self.enabled:
+            return
+        i = self._index.get(name)
+        if i is None:
+            i = self._section(name)
+        self._start[i] = ticks_us()
+
+    def end(self, name):
+        if not self.enabled:
+            return
+        i = self._index[name]
+        self._acc[i] += ticks_diff(ticks_us(), self._start[i])
+
+    def frame(self):
+        """
+        Close the current frame: record the time since the previous
+        frame() and what every section and the SPI bus took in between.
+        """
+        if not self.enabled:
+            return
+        now = ticks_us()
+        acc = self._acc
+        if self._last is not None:
+            acc[0] = ticks_diff(now, self._last)
+            acc[1] = self._spi[0]
+            k = self._frames % self.window
+            for i in range(len(acc)):
+                self._hist[i][k] = acc[i]
+            self._frames += 1
+            if self.serial and self._frames % self.serial == 0:
+                self.print_report()
+        for i in range(len(acc)):
+            acc[i] = 0
+        self._spi[0] = 0
+        self._last = ticks_us()  # The report is not part of the next frame
+
+    def reset(self):
+        # Forget the recorded frames
+        self._frames = 0
+        self._last = None
+
+    def stats(self, name):
+        # (min, avg, max, p95) of section `name` over the recorded frames,
+        # in microseconds (bytes for 'spi'); None before the first frame
+        n = min(self._frames, self.window)
+        if n == 0:
+            return None
+        values = sorted(self._hist[self._index[name]][:n])
+        return values[0], sum(values) // n, values[-1], values[(n * 95 - 1) // 100]
+
+    def fps(self):
+        s = self.stats(self.FRAME)
+        return 1000000 / s[1] if s and s[1] else 0
+
+    def report(self):
+        # Lines of text: frame rate and SPI bytes per frame, then one line
+        # per section with min, avg, max and p95 in microseconds
+        spi = self.stats(self.SPI)
+        if spi is None:
+            return ['no frames']
+        lines = ['fps %.1f  spi %d B/frame' % (self.fps(), spi[1])]
+        for name in self._names:
+            if name == self.SPI:
+                continue
+            s = self.stats(name)
+            if s[2] or name == self.FRAME:
+                lines.append('%-9s%6d%6d%6d%6d' % ((name[:9],) + s))
+        return lines
+
+    def print_report(self):
+        print('%-9s%6s%6s%6s%6s us' % ('', 'min', 'avg', 'max', 'p95'))
+        for line in self.report():
+            print(line)
+
+    def overlay(self, fb, x=0, y=0, fg=0xFFFF, bg=0):
+        """
+        Draw report() on `fb` at (x, y), 8 pixels per line over a `bg`
+        box. The drawing is not counted in the frame.
+        """
+        acc = self._acc
+        saved = array('I', acc)
+        lines = self.report()
+        fb.fill_rect(x, y, 8 * max(len(s) for s in lines), 8 * len(lines), bg)
+        for s in lines:
+            fb.text(s, x, y, fg)
+            y += 8
+        for i in range(len(saved)):
+            acc[i] = saved[i]
+
+    def _section(self, name):
+        i = self._index.get(name)
+        if i is None:
+            i = len(self._names)
+            self._names.append(name)
+            self._index[name] = i
+            self._acc.append(0)
+            self._start.append(0)
+            self._hist.append(array('I', [0] * self.window))
+        return i
+
+    def _wrap(self, i, fn):
+        acc = self._acc
+
+        def timed(*args, **kw):
+            t = ticks_us()
+            r = fn(*args, **kw)
+            acc[i] += ticks_diff(ticks_us(), t)
+            return r
+        return timed
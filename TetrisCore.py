@@ -0,0 +1,386 @@
+# TetrisCore.py
+# The rules of Tetris without a screen, sound or buttons
+#
+# TetrisCore holds the field, the falling tetromino and the next one, and
+# applies movement, rotation, gravity, locking, line clears, score and
+# level. It only changes in step(), from the buttons held and the
+# milliseconds since the previous step, and draws its tetrominos from its
+# own seeded generator, so a game replays identically from its seed and
+# inputs. tetris.py draws it and plays its sounds on the Pico; on a host
+# it runs on its own, driven by TetrisBot or random buttons:
+#
+#   python3 TetrisCore.py [--games 1000] [--seed 1] [--random]
+#
+# plays games, checks the field after every step and reports lines,
+# scores and games per second.
+
+GRID_ROWS = 20
+GRID_COLS = 10
+FULL_ROW = (1 << GRID_COLS) - 1  # Bits of a complete line
+
+# shape of the 7 tetrominos
+# [0][1]
+# [2][3]
+# [4][5]
+# [6][7]
+# e.g. [3,4,5,7] is:
+#    [ ]
+# [ ][ ]
+#    [ ]
+tetrominos = [[1,3,5,7],
+              [2,4,5,7],
+              [3,5,4,6],
+              [3,5,4,7],
+              [2,3,5,7],
+              [3,5,7,6],
+              [2,3,4,5]]
+
+DELAY_MS = 500  # Time between two falls at level 0
+DELAY_STEP_MS = 40  # ... that much shorter at every level
+MIN_DELAY_MS = 100
+LINES_PER_LEVEL = 10
+LINE_SCORE = 40
+
+
+class Field:
+    # The blocks already in the grid: one bit mask per row, bit j set when
+    # column j holds a block, and the type of each block for its color
+    # (0 in the empty cells, so two rows compare equal as bytes)
+    def __init__(self):
+        self.rows = [0] * GRID_ROWS
+        self.colors = [bytearray(GRID_COLS) for _ in range(GRID_ROWS)]
+
+    def set(self, j, i, n):
+        # put a block of type n at the ith row and jth column
+        self.rows[i] |= 1 << j
+        self.colors[i][j] = n
+
+    def collision(self, x, y):
+        # True if a tetromino with blocks at columns x and rows y would
+        # leave the grid or overlap a block
+        rows = self.rows
+        for i in range(4):
+            j = x[i]
+            k = y[i]
+            if j < 0 or j >= GRID_COLS or k >= GRID_ROWS:
+                return True
+            if k >= 0 and rows[k] >> j & 1:
+                return True
+        return False
+
+    def lock(self, x, y, n):
+        # store a tetromino of type n and return the rows it completed,
+        # from top to bottom; only its own rows can have become full
+        full = []
+        for i in range(4):
+            if y[i] >= 0:
+                self.set(x[i], y[i], n)
+        for i in range(4):
+            if y[i] >= 0 and self.rows[y[i]] == FULL_ROW and y[i] not in full:
+                full.append(y[i])
+        full.sort()
+        return full
+
+    def remove_lines(self, full):
+        # take out the complete rows (top to bottom) and move the rows
+        # above them down
+        for i in full:
+            self.rows.pop(i)
+            self.rows.insert(0, 0)
+            colors = self.colors.pop(i)
+            for j in range(GRID_COLS):
+                colors[j] = 0
+            self.colors.insert(0, colors)
+
+
+class TetrisCore:
+    # Buttons of step()
+    LEFT = 1
+    RIGHT = 2
+    ROTATE = 4  # Rotates once per step it is given in
+    DOWN = 8  # Falls at every step
+
+    def __init__(self, seed=1):
+        self.field = Field()
+        self.lines = 0
+        self.level = 0
+        self.score = 0
+        self.pieces = 0  # Tetrominos locked so far
+        self.game_over = False
+        # What the last step() did, for sounds and animations
+        self.fell = False  # The tetromino moved down (or landed)
+        self.rotated = False  # ... and had rotated since it last fell
+        self.cleared = []  # Rows completed by the tetromino that landed
+        self.x = [0, 0, 0, 0]  # Columns and rows of the falling tetromino
+        self.y = [0, 0, 0, 0]
+        self._prev_x = [0, 0, 0, 0]
+        self._prev_y = [0, 0, 0, 0]
+        self._timer = 0  # ms since the last fall
+        self._rand = seed & 0x7FFFFFFF
+        self.n = self._random_piece()
+        self.next_n = self._random_piece()
+        self._spawn()
+
+    def _random_piece(self):
+        # Linear congruential generator, the same on every port
+        self._rand = (self._rand * 1103515245 + 12345) & 0x7FFFFFFF
+        return (self._rand >> 16) % 7
+
+    def _spawn(self):
+        shape = tetrominos[self.n]
+        for i in range(4):
+            self.x[i] = shape[i] % 2 + GRID_COLS // 2
+            self.y[i] = shape[i] // 2
+
+    def delay(self):
+        # ms between two falls at the current level
+        d = DELAY_MS - DELAY_STEP_MS * self.level
+        return d if d > MIN_DELAY_MS else MIN_DELAY_MS
+
+    def step(self, buttons, elapsed_ms):
+        """
+        Advance the game by `elapsed_ms` with `buttons` (LEFT, RIGHT,
+        ROTATE, DOWN) held: move sideways, rotate, then fall if the delay
+        has passed. Does nothing once the game is over.
+        """
+        if self.fell:
+            self.rotated = False
+        self.fell = False
+        self.cleared = []
+        if self.game_over:
+            return
+        x = self.x
+        y = self.y
+        px = self._prev_x
+        py = self._prev_y
+        collision = self.field.collision
+
+        # save current position to restore it
+        # in case the requested move generates a collision
+        dx = -1 if buttons & self.LEFT else 1 if buttons & self.RIGHT else 0
+        if dx:
+            for i in range(4):
+                px[i] = x[i]
+                x[i] += dx
+            if collision(x, y):
+                for i in range(4):
+                    x[i] = px[i]
+
+        # rotate around the second block
+        if buttons & self.ROTATE:
+            x0 = x[1]
+            y0 = y[1]
+            for i in range(4):
+                px[i] = x[i]
+                py[i] = y[i]
+                x_ = y[i] - y0
+                y_ = x[i] - x0
+                x[i] = x0 - x_
+                y[i] = y0 + y_
+            if collision(x, y):
+                for i in range(4):
+                    x[i] = px[i]
+                    y[i] = py[i]
+            else:
+                self.rotated = True
+
+        # move down
+        self._timer += elapsed_ms
+        if self._timer <= (0 if buttons & self.DOWN else self.delay()):
+            return
+        self._timer = 0
+        self.fell = True
+        for i in range(4):
+            px[i] = x[i]
+            py[i] = y[i]
+            y[i] += 1
+        if not collision(x, y):
+            return
+
+        # landed: a tetromino stuck at the top of the grid ends the game
+        for i in range(4):
+            if py[i] <= 1:
+                self.game_over = True
+        field = self.field
+        self.cleared = field.lock(px, py, self.n)
+        self.pieces += 1
+        if self.cleared:
+            field.remove_lines(self.cleared)
+            self.lines += len(self.cleared)
+            self.score += LINE_SCORE * len(self.cleared)
+            self.level = self.lines // LINES_PER_LEVEL
+        self.n = self.next_n
+        self.next_n = self._random_piece()
+        self._spawn()
+        # no room for the new one ends it too
+        if self.field.collision(self.x, self.y):
+            self.game_over = True
+
+
+def _heights_holes(rows):
+    # (sum of the column heights, holes below them, bumpiness)
+    heights = [0] * GRID_COLS
+    covered = 0
+    holes = 0
+    for i in range(GRID_ROWS):
+        row = rows[i]
+        new = row & ~covered
+        if new:
+            for j in range(GRID_COLS):
+                if new >> j & 1:
+                    heights[j] = GRID_ROWS - i
+            covered |= row
+        gaps = covered & ~row
+        while gaps:
+            gaps &= gaps - 1
+            holes += 1
+    bumps = 0
+    for j in range(GRID_COLS - 1):
+        d = heights[j] - heights[j + 1]
+        bumps += d if d > 0 else -d
+    return sum(heights), holes, bumps
+
+
+class TetrisBot:
+    # Greedy player: when a tetromino appears, tries every rotation and
+    # column, rates the field each drop would leave and steers the
+    # tetromino there, then drops it
+    HEIGHT = -0.51
+    LINES = 0.76
+    HOLES = -0.36
+    BUMPS = -0.18
+
+    def __init__(self, core):
+        self.core = core
+        self._planned = -1  # core.pieces when the current plan was made
+        self._rotations = 0
+        self._column = 0  # Target leftmost column
+
+    def buttons(self):
+        # Buttons for the next step of the core
+        core = self.core
+        if core.pieces != self._planned:
+            self._plan()
+            self._planned = core.pieces
+        if self._rotations:
+            self._rotations -= 1
+            return TetrisCore.ROTATE
+        left = min(core.x)
+        if left > self._column:
+            return TetrisCore.LEFT
+        if left < self._column:
+            return TetrisCore.RIGHT
+        return TetrisCore.DOWN
+
+    def _plan(self):
+        core = self.core
+        collision = core.field.collision
+        x = core.x[:]
+        y = core.y[:]
+        best = None
+        for r in range(4):
+            if r:
+                # the rotation of TetrisCore.step()
+                x0 = x[1]
+                y0 = y[1]
+                x, y = ([x0 - (y[i] - y0) for i in range(4)],
+                        [y0 + (x[i] - x0) for i in range(4)])
+                if collision(x, y):
+                    break
+            for dx in (-1, 1):
+                k = 0 if dx > 0 else -1
+                while True:
+                    if dx < 0 or k:
+                        xs = [c + k for c in x]
+                        if collision(xs, y):
+                            break
+                    else:
+                        xs = x
+                    value = self._rate(xs, y)
+                    if best is None or value > best:
+                        best = value
+                        self._rotations = r
+                        self._column = min(xs)
+                    k += dx
+
+    def _rate(self, x, y):
+        # Value of the field after dropping the tetromino at (x, y)
+        collision = self.core.field.collision
+        y = y[:]
+        while True:
+            for i in range(4):
+                y[i] += 1
+            if collision(x, y):
+                break
+        rows = self.core.field.rows[:]
+        for i in range(4):
+            if y[i] > 0:
+                rows[y[i] - 1] |= 1 << x[i]
+        full = 0
+        i = GRID_ROWS - 1
+        while i >= 0:
+            if rows[i] == FULL_ROW:
+                rows.pop(i)
+                rows.insert(0, 0)
+                full += 1
+            else:
+                i -= 1
+        height, holes, bumps = _heights_holes(rows)
+        return (self.HEIGHT * height + self.LINES * full + self.HOLES * holes
+                + self.BUMPS * bumps)
+
+
+def check(core):
+    # Raise AssertionError if the game is in an impossible state
+    rows = core.field.rows
+    for i in range(GRID_ROWS):
+        assert 0 <= rows[i] <= FULL_ROW, 'row %d out of the grid' % i
+        assert rows[i] != FULL_ROW, 'row %d full after a step' % i
+    if not core.game_over:
+        for i in range(4):
+            assert 0 <= core.x[i] < GRID_COLS and core.y[i] < GRID_ROWS, 'tetromino out of the grid'
+            assert core.y[i] < 0 or not rows[core.y[i]] >> core.x[i] & 1, 'tetromino over a block'
+    assert core.score == LINE_SCORE * core.lines
+
+
+def play(seed=1, bot=True, max_pieces=1000, step_ms=50):
+    """
+    Play one game from `seed` with TetrisBot, or random buttons, checking
+    the game after every step. Returns the TetrisCore at the end.
+    """
+    core = TetrisCore(seed)
+    player = TetrisBot(core) if bot else None
+    rand = seed
+    while not core.game_over and core.pieces < max_pieces:
+        if player:
+            buttons = player.buttons()
+        else:
+            rand = (rand * 1103515245 + 12345) & 0x7FFFFFFF
+            buttons = rand >> 16 & 15
+        core.step(buttons, step_ms)
+        check(core)
+    return core
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+    ap = argparse.ArgumentParser(description='Headless Tetris games')
+    ap.add_argument('--games', type=int, default=100)
+    ap.add_argument('--seed', type=int, default=1, help='seed of the first game')
+    ap.add_argument('--random', action='store_true', help='random buttons instead of the bot')
+    ap.add_argument('--max-pieces', type=int, default=1000)
+    args = ap.parse_args()
+    t = time.perf_counter()
+    total_lines = total_pieces = 0
+    best = None
+    for g in range(args.games):
+        core = play(args.seed + g, not args.random, args.max_pieces)
+        total_lines += core.lines
+        total_pieces += core.pieces
+        if best is None or core.score > best[1]:
+            best = (args.seed + g, core.score)
+    t = time.perf_counter() - t
+    print('%d games, %d pieces, %d lines (%.1f per game), best score %d (seed %d)'
+          % (args.games, total_pieces, total_lines, total_lines / args.games, best[1], best[0]))
+    print('%.1f games/s, %.0f pieces/s' % (args.games / t, total_pieces / t))
@@ -0,0 +1,154 @@
+# WavPlayer.py
+# Streams PCM WAV files to a PWM pin for the Raspberry Pi Pico Game Boy
+#
+# A hardware timer outputs one sample per tick from one of two
+# preallocated blocks while micropython.schedule() refills the other one
+# from the file with readinto(), so the playback rate does not depend on
+# how busy the game loop is.
+
+from machine import Timer
+import micropython
+import struct
+
+
+def parse_wav(f):
+    """
+    Read the RIFF header of the open WAV file `f` and return (rate, bits,
+    channels, data offset, data size). Chunks other than 'fmt ' and 'data'
+    are skipped, so the data does not have to start at byte 44.
+    """
+    riff, _, wave = struct.unpack('<4sI4s', f.read(12))
+    if riff != b'RIFF' or wave != b'WAVE':
+        raise ValueError('Not a WAV file.')
+    fmt = None
+    offset = 12
+    while True:
+        head = f.read(8)
+        if len(head) < 8:
+            raise ValueError('WAV file without data chunk.')
+        chunk, size = struct.unpack('<4sI', head)
+        offset += 8
+        if chunk == b'fmt ':
+            tag, channels, rate, _, _, bits = struct.unpack('<HHIIHH', f.read(16))
+            if tag != 1 or bits not in (8, 16):
+                raise ValueError('Only 8 and 16 bit PCM WAV files are supported.')
+            fmt = (rate, bits, channels)
+            f.seek(offset + size + (size & 1))
+        elif chunk == b'data':
+            if fmt is None:
+                raise ValueError('WAV data chunk before fmt chunk.')
+            return fmt + (offset, size)
+        else:
+            f.seek(offset + size + (size & 1))
+        offset += size + (size & 1)
+
+
+class WavPlayer:
+    BLOCK = 1024  # Bytes per buffer; 128 ms of 8 kHz 8-bit mono audio
+
+    def __init__(self, pwm, block=BLOCK):
+        self._pwm = pwm
+        self._bufs = (bytearray(block), bytearray(block))
+        self._lens = [0, 0]  # Valid bytes in each buffer, 0 while empty
+        self._cur = 0  # Buffer the timer is playing
+        self._pos = 0
+        self._timer = None
+        self._file = None
+        self._loop = False
+        self._vol = 256  # Volume as a multiplier of 8-bit samples, 256 is full
+        # Bound methods allocate, so the interrupt handlers get them ready made
+        self._tick_ref = self._tick
+        self._fill_ref = self._fill
+
+    def play(self, path, loop=False):
+        """
+        Start playing the WAV file at `path` in the background; `loop`
+        restarts it at the end of its data until stop().
+        """
+        self.stop()
+        f = open(path, 'rb')
+        try:
+            rate, bits, channels, offset, size = parse_wav(f)
+        except Exception:
+            f.close()
+            raise
+        self._file = f
+        self._loop = loop
+        self._start = offset
+        self._size = size
+        self._left = size  # Bytes of the data chunk not read yet
+        # One sample frame is `step` bytes; its first channel's most
+        # significant byte is at `hi`, signed when 16 bits
+        self._step = channels * bits // 8
+        self._hi = bits // 8 - 1
+        self._flip = 0x80 if bits == 16 else 0
+        self._lens[0] = self._lens[1] = 0
+        self._cur = 0
+        self._pos = 0
+        self._fill(0)
+        self._fill(1)
+        self._timer = Timer(freq=rate, mode=Timer.PERIODIC, callback=self._tick_ref)
+
+    def stop(self):
+        if self._timer is not None:
+            self._timer.deinit()
+            self._timer = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._pwm.duty_u16(0)
+
+    def playing(self):
+        return self._timer is not None
+
+    def volume(self, v):
+        # v from 0 to 1; takes effect from the next sample
+        self._vol = min(max(int(v * 256), 0), 256)
+
+    def _fill(self, _):
+        # Refill every empty buffer from the file (scheduled, not in the ISR)
+        f = self._file
+        if f is None:
+            return
+        for k in (0, 1):
+            if self._lens[k]:
+                continue
+            buf = self._bufs[k]
+            n = len(buf) - len(buf) % self._step
+            if n > self._left:
+                n = self._left
+            if n == 0 and self._loop:
+                f.seek(self._start)
+                self._left = self._size
+                n = min(len(buf) - len(buf) % self._step, self._left)
+            if n == 0:
+                continue
+            n = f.readinto(memoryview(buf)[:n])
+            self._left -= n
+            self._lens[k] = n
+        if self._left == 0 and not self._loop:
+            # All the data is in the buffers: the file is done with
+            f.close()
+            self._file = None
+
+    def _tick(self, _):
+        # Timer interrupt: output one sample, move to the other buffer at
+        # the end of this one and ask for a refill
+        cur = self._cur
+        n = self._lens[cur]
+        if n == 0:
+            if self._left == 0 and not self._loop and self._lens[cur ^ 1] == 0:
+                # End of the file, already closed by _fill()
+                self._timer.deinit()
+                self._timer = None
+                self._pwm.duty_u16(0)
+            return  # Underrun: hold the last sample until the refill lands
+        pos = self._pos
+        self._pwm.duty_u16((self._bufs[cur][pos + self._hi] ^ self._flip) * self._vol)
+        pos += self._step
+        if pos >= n:
+            self._lens[cur] = 0
+            self._cur = cur ^ 1
+            pos = 0
+            micropython.schedule(self._fill_ref, None)
+        self._pos = pos
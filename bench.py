@@ -0,0 +1,327 @@
+# bench.py
+# Benchmarks of the rendering and simulation hot paths
+#
+# On the Pico:   import bench; bench.main()  # or bench.main('bench.json')
+# On a host:     python3 bench.py [-o bench.json] [--compare base.json]
+#                                  [--threshold 0.1] [NAME ...]
+#
+# Every benchmark repeats one operation for at least TARGET_MS, keeps the
+# fastest of REPEATS such runs against interrupts and other noise, and reports
+# microseconds per operation, operations per second, bytes per second and
+# bytes allocated per operation. Bytes are the pixels written by the
+# drawing primitives, or what goes over SPI to the display for show() and
+# the game frames. The results are printed and written as JSON, and
+# compare() (or --compare) shows how they moved against an older file.
+#
+# On the host the host/ stand-ins replace the device modules, times are
+# CPython wall clock and allocations are the tracemalloc peak of one
+# operation, so only compare host results with host results.
+
+import sys
+
+HOST = sys.implementation.name != 'micropython'
+if HOST:
+    import host
+    host.install()
+
+import gc
+import json
+import random
+from framebuf import FrameBuffer, RGB565
+from Chimera import Chimera
+from PicoGameBoy import PicoGameBoy
+import GameOfLife
+import tetris
+import TetrisCore
+import FlapBird
+
+if HOST:
+    import tracemalloc
+    from time import perf_counter_ns
+
+    def _us():
+        return perf_counter_ns() // 1000
+
+    def _since(t):
+        return _us() - t
+else:
+    from time import ticks_us, ticks_diff
+
+    _us = ticks_us
+
+    def _since(t):
+        return ticks_diff(ticks_us(), t)
+
+TARGET_MS = 300  # Minimum run time of each benchmark
+REPEATS = 3  # Timed runs of each benchmark, the fastest one counts
+ALLOC_RUNS = 4  # Operations run with the GC off to count allocations
+THRESHOLD = 0.10  # compare() flags changes larger than this
+
+
+class _SPICount:
+    # Counts the bytes an operation sends to the display
+    def __init__(self, spi):
+        self.spi = spi
+        self.n = 0
+
+    def write(self, buf):
+        self.n += len(buf)
+        self.spi.write(buf)
+
+
+def benchmarks(pgb):
+    """
+    Yield (name, operation, pixel bytes) for every benchmark. Setup runs
+    between the yields, outside the timing; operations that talk to the
+    display have their SPI bytes measured instead.
+    """
+    c = Chimera.color(200, 100, 50)
+    yield 'color', lambda: Chimera.color(12, 34, 56), 0
+    yield 'fill', lambda: pgb.fill(c), pgb.width * pgb.height * 2
+    for s in (8, 32, 128):
+        yield 'fill_rect_%d' % s, lambda s=s: pgb.fill_rect(10, 10, s, s, c), s * s * 2
+    for s in (16, 32, 64):
+        fb = FrameBuffer(bytearray(s * s * 2), s, s, RGB565)
+        fb.fill(c)
+        yield 'blit_%d' % s, lambda fb=fb, s=s: pgb.blit(fb, 20, 20, -1, None, s, s), s * s * 2
+    # A sprite with a transparent half
+    fb.fill_rect(0, 0, 32, 64, 0)
+    yield 'blit_64_key', lambda: pgb.blit(fb, 20, 20, 0, None, 64, 64), 64 * 64
+    del fb
+
+    yield 'show', lambda: pgb.show(full=True), 0
+
+    def rect_sprite():
+        pgb.remove_sprite(pgb.add_rect_sprite(c, 12, 12))
+    yield 'add_rect_sprite', rect_sprite, 0
+
+    random.seed(1)
+    board = GameOfLife.new_board(pgb.width, pgb.height)
+    start = board.rows[:]
+
+    def life():
+        # Always from the same board, or the population dies out; every
+        # row counts as changed
+        board.load(start)
+        GameOfLife.next_generation(pgb, board)
+    yield 'life_generation', life, 0
+    board.load(start)
+    yield 'life_draw', lambda: GameOfLife.draw_board(pgb, board), 0
+
+    # A settled board: what is left are oscillators and the odd glider
+    for _ in range(300):
+        board.step()
+    GameOfLife.draw_board(pgb, board)
+    pgb.show()
+
+    def life_frame():
+        board.step()
+        GameOfLife.draw_changes(pgb, board)
+    yield 'life_frame', life_frame, 0
+    del board, start
+
+    sprites = tetris.load_sprites(pgb)
+    field = tetris.Field()
+    for i in range(tetris.GRID_ROWS // 2, tetris.GRID_ROWS):
+        for j in range(tetris.GRID_COLS):
+            if random.randint(0, 3):
+                field.set(j, i, random.randint(0, 6))
+
+    yield 'tetris_static', lambda: tetris.draw_background(pgb, sprites), 0
+
+    piece = ([4, 5, 5, 5], [15, 15, 16, 17])  # Columns and rows of an L
+    shown = tetris.shown_field()
+    tetris.draw_field(pgb, field, shown)
+    pgb.show()
+    falling = ([4, 5, 5, 5], [0, 0, 1, 2])
+
+    def tetris_frame():
+        # A frame where the scores changed and the tetromino fell a row,
+        # sent to the display; the background stays
+        tetris.draw_hud(pgb, 12, 1, 480)
+        y = falling[1]
+        for i in range(4):
+            y[i] = (y[i] + 1) % 8
+        tetris.draw_field(pgb, field, shown, falling[0], y, 2)
+        pgb.show()
+    yield 'tetris_frame', tetris_frame, 0
+    yield 'tetris_collision', lambda: field.collision(piece[0], piece[1]), 0
+
+    game = [None, None]  # TetrisCore, TetrisBot
+
+    def tetris_step():
+        # A step of the rules with the bot at the buttons, a new game
+        # when the last one ended
+        if game[0] is None or game[0].game_over:
+            game[0] = TetrisCore.TetrisCore(1)
+            game[1] = TetrisCore.TetrisBot(game[0])
+        game[0].step(game[1].buttons(), 50)
+    yield 'tetris_step', tetris_step, 0
+    for handle in sprites:
+        pgb.remove_sprite(handle)
+
+    sprites = FlapBird.load_sprites(pgb)
+    world = [320, 20, 500, 40, 0]  # x_p1, y_p1, x_p2, y_p2, x_f
+
+    def draw(fb):
+        FlapBird.draw_world(fb, sprites, world[0], world[1], world[2], world[3],
+                            world[4], 0, 50, 100)
+
+    def flap_frame():
+        # What FlapBird sends each step: the band the pipes scroll in and
+        # the bird
+        for k in (0, 2):
+            world[k] -= 3
+            if world[k] < -82:
+                world[k] = 320
+        world[4] = (world[4] - 3) % -98
+        pgb.scroll_by(3, draw)
+        pgb.refresh(47, 98, 37, 28, draw)
+    pgb.scroll_area()
+    pgb.refresh(0, 0, pgb.width, pgb.height, draw)
+    yield 'flapbird_frame', flap_frame, 0
+    pgb.scroll_reset()
+    bird, pipe, floor = sprites
+    for handle in bird + [pipe, floor]:
+        pgb.remove_sprite(handle)
+
+
+def _allocated(op):
+    # Bytes allocated by one operation
+    if HOST:
+        tracemalloc.start()
+        base = tracemalloc.get_traced_memory()[0]
+        op()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return peak - base
+    gc.collect()
+    gc.disable()
+    try:
+        before = gc.mem_alloc()
+        for _ in range(ALLOC_RUNS):
+            op()
+        return (gc.mem_alloc() - before) // ALLOC_RUNS
+    except MemoryError:
+        return -1
+    finally:
+        gc.enable()
+
+
+def run(pgb, op, nbytes=0, target_ms=TARGET_MS):
+    """
+    Time `op` and return (operations, microseconds, bytes per operation,
+    bytes allocated per operation).
+    """
+    spi = pgb.spi
+    pgb.spi = count = _SPICount(spi)
+    try:
+        op()  # Warm up and count the SPI bytes
+    finally:
+        pgb.spi = spi
+    if count.n:
+        nbytes = count.n
+    alloc = _allocated(op)
+    gc.collect()
+    n = 1
+    while True:
+        t = _us()
+        for _ in range(n):
+            op()
+        best = _since(t)
+        if best >= target_ms * 1000:
+            break
+        n *= 2
+    for _ in range(REPEATS - 1):
+        gc.collect()
+        t = _us()
+        for _ in range(n):
+            op()
+        best = min(best, _since(t))
+    return n, best, nbytes, alloc
+
+
+def main(out=None, names=None, compare_with=None, target_ms=TARGET_MS,
+         threshold=THRESHOLD):
+    """
+    Run the benchmarks (those in `names`, or all of them), print the
+    results and write them to the file `out` as JSON if one is given (on
+    the Pico that file goes to flash). Returns the results, or the
+    regressions against the file `compare_with` when one is given.
+    """
+    pgb = PicoGameBoy()
+    results = []
+    print('%-16s %8s %10s %10s %8s' % ('benchmark', 'us/op', 'ops/s', 'KB/s', 'alloc'))
+    for name, op, nbytes in benchmarks(pgb):
+        if names and name not in names:
+            continue
+        n, us, nbytes, alloc = run(pgb, op, nbytes, target_ms)
+        per_op = us / n
+        r = {
+            'name': name,
+            'iterations': n,
+            'us_per_op': per_op,
+            'ops_per_s': 1000000 * n / us,
+            'bytes_per_op': nbytes,
+            'bytes_per_s': 1000000 * n * nbytes / us,
+            'alloc_per_op': alloc,
+        }
+        results.append(r)
+        print('%-16s %8.1f %10.1f %10.1f %8d' % (name, per_op, r['ops_per_s'],
+                                                r['bytes_per_s'] / 1024, alloc))
+        gc.collect()
+    report = {
+        'platform': sys.platform,
+        'implementation': sys.implementation.name,
+        'host': HOST,
+        'results': results,
+    }
+    if out:
+        with open(out, 'w') as f:
+            json.dump(report, f)
+    if compare_with:
+        with open(compare_with) as f:
+            return compare(json.load(f), report, threshold)
+    return report
+
+
+def compare(old, new, threshold=THRESHOLD):
+    """
+    Print the change in time per operation of every benchmark between two
+    reports and return the names of those more than `threshold` slower.
+    """
+    before = {r['name']: r for r in old['results']}
+    slower = []
+    print('%-16s %10s %10s %8s' % ('benchmark', 'old us', 'new us', 'change'))
+    for r in new['results']:
+        o = before.get(r['name'])
+        if o is None:
+            print('%-16s %10s %10.1f' % (r['name'], '-', r['us_per_op']))
+            continue
+        change = r['us_per_op'] / o['us_per_op'] - 1 if o['us_per_op'] else 0
+        mark = ''
+        if change > threshold:
+            mark = ' slower'
+            slower.append(r['name'])
+        elif change < -threshold:
+            mark = ' faster'
+        print('%-16s %10.1f %10.1f %+7.0f%%%s' % (r['name'], o['us_per_op'],
+                                                 r['us_per_op'], 100 * change, mark))
+    return slower
+
+
+if __name__ == '__main__':
+    if HOST:
+        import argparse
+        ap = argparse.ArgumentParser(description='Pico Game Boy benchmarks')
+        ap.add_argument('names', nargs='*', help='benchmarks to run (default: all)')
+        ap.add_argument('-o', '--output', default='bench.json')
+        ap.add_argument('--compare', help='earlier results to compare with')
+        ap.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help='relative slowdown that counts as a regression')
+        ap.add_argument('--target-ms', type=int, default=TARGET_MS)
+        args = ap.parse_args()
+        result = main(args.output, args.names, args.compare, args.target_ms,
+                      args.threshold)
+        sys.exit(1 if args.compare and result else 0)
+    main()
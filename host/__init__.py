@@ -0,0 +1,135 @@
+"""
+Headless host backend for the Pico Game Boy.
+
+``install()`` registers CPython stand-ins for ``machine``, ``framebuf``,
+``micropython``, ``_thread`` and ``utime`` so the unmodified device modules can
+be imported and run on a Linux box. Time is virtual: sleeps and SPI traffic
+move the clock, so games run far faster than real time.
+
+The stdlib ``time`` and ``gc`` stay as they are. Only the device modules --
+the ``.py`` files at the top of the repository -- get ``utime`` when they
+import ``time``, and ``host.gc`` with MicroPython's ``mem_free()`` when they
+import ``gc``, through the builtins they run with (``device_builtins``). Host
+tools keep the real clock and the real ``gc``.
+
+    import host
+    host.install(seconds=10, script="500:A/100 3000:DOWN/100")
+    import main
+    main.main()
+"""
+import builtins
+import os
+import sys
+from importlib.machinery import PathFinder
+
+from .clock import clock, Timeout
+from .panel import panel
+from . import gc as _gc
+from .gc import HEAP_SIZE, set_mem_free  # noqa: F401
+
+# Button wiring used by PicoGameBoy.
+BUTTONS = {
+    "UP": 2,
+    "DOWN": 3,
+    "LEFT": 4,
+    "RIGHT": 5,
+    "B": 7,
+    "OFF": 8,
+    "A": 9,
+}
+
+# Directory of the device modules.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_installed = False
+
+
+def _device_import(name, globals=None, locals=None, fromlist=(), level=0):
+    if name == "time" and level == 0:
+        return sys.modules["utime"]
+    if name == "gc" and level == 0:
+        return _gc
+    return builtins.__import__(name, globals, locals, fromlist, level)
+
+
+# Builtins of the device modules: ``import time`` gives the virtual clock
+# and ``import gc`` the device heap.
+# Pass them as ``__builtins__`` to run a device script with runpy.
+device_builtins = dict(vars(builtins), __import__=_device_import)
+
+
+class _DeviceLoader:
+    # Runs a device module with device_builtins.
+    def __init__(self, loader):
+        self._loader = loader
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        module.__builtins__ = device_builtins
+        self._loader.exec_module(module)
+
+
+class _DeviceFinder:
+    # Finds the top-level modules in ROOT and gives them _DeviceLoader.
+    @staticmethod
+    def find_spec(name, path=None, target=None):
+        if path is not None:
+            return None
+        spec = PathFinder.find_spec(name, None, target)
+        if (spec is None or not spec.origin or not spec.origin.endswith(".py")
+                or os.path.dirname(os.path.abspath(spec.origin)) != ROOT):
+            return None
+        spec.loader = _DeviceLoader(spec.loader)
+        return spec
+
+
+def press(name, at_ms, duration_ms=None):
+    # Press button `name` at virtual time at_ms, releasing it after
+    # duration_ms if one is given.
+    from . import machine
+    pin = BUTTONS[name]
+    clock.at(int(at_ms * 1000), lambda c: machine.set_level(pin, 0))
+    if duration_ms is not None:
+        clock.at(int((at_ms + duration_ms) * 1000), lambda c: machine.set_level(pin, 1))
+
+
+def release(name, at_ms):
+    from . import machine
+    pin = BUTTONS[name]
+    clock.at(int(at_ms * 1000), lambda c: machine.set_level(pin, 1))
+
+
+def parse_script(script):
+    # "500:A/100 900:-UP 1200:DOWN" -> press A for 100 ms at 500 ms,
+    # release UP at 900 ms, press and hold DOWN from 1200 ms.
+    for item in script.split():
+        when, action = item.split(":")
+        when = float(when)
+        if action.startswith("-"):
+            release(action[1:].upper(), when)
+        elif "/" in action:
+            name, dur = action.split("/")
+            press(name.upper(), when, float(dur))
+        else:
+            press(action.upper(), when)
+
+
+def install(seconds=None, script=None):
+    global _installed
+    from . import utime, machine, framebuf, micropython, _thread
+    if not _installed:
+        sys.modules["machine"] = machine
+        sys.modules["framebuf"] = framebuf
+        sys.modules["micropython"] = micropython
+        sys.modules["utime"] = utime
+        sys.modules["_thread"] = _thread
+        sys.meta_path.insert(0, _DeviceFinder)
+        for pin in BUTTONS.values():
+            machine.set_level(pin, 1)
+        _installed = True
+    clock.limit_us = None if seconds is None else int(seconds * 1000000)
+    if script:
+        parse_script(script)
+    return clock
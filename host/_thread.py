@@ -0,0 +1,68 @@
+"""
+Host stand-in for MicroPython's ``_thread`` on the RP2040. The one extra
+thread is core 1: it runs on the virtual clock in step with core 0, and a
+second start_new_thread() while it runs fails as on the device.
+"""
+import threading
+
+from .clock import clock
+
+
+class LockType:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def acquire(self, waitflag=1, timeout=-1):
+        if self._lock.acquire(False):
+            return True
+        if not waitflag:
+            return False
+        # Let the other core run freely while this one waits
+        clock.block()
+        try:
+            self._lock.acquire()
+        finally:
+            clock.unblock()
+        return True
+
+    def release(self):
+        self._lock.release()
+
+    def locked(self):
+        return self._lock.locked()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *args):
+        self.release()
+
+
+def allocate_lock():
+    return LockType()
+
+
+def start_new_thread(function, args, kwargs=None):
+    if clock.core1 is not None:
+        raise OSError(16, "core1 in use")
+
+    def run():
+        try:
+            function(*args, **(kwargs or {}))
+        finally:
+            clock.core1_done()
+
+    thread = threading.Thread(target=run, daemon=True)
+    clock.start_core1(thread)
+    thread.start()
+    return thread.ident
+
+
+def get_ident():
+    return threading.get_ident()
+
+
+def exit():
+    raise SystemExit
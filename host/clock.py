@@ -0,0 +1,152 @@
+"""
+Virtual clock shared by the host stand-ins.
+
+Nothing on the host really sleeps: ``sleep`` and every SPI transfer move the
+clock forward instead, and anything waiting on the clock (scripted button
+edges, ``machine.Timer`` callbacks, scheduled functions) runs as time passes.
+
+A thread started with ``_thread`` is core 1. It has its own time, which the
+clock keeps within QUANTUM_US of core 0's unless one of the two is waiting
+on a ``_thread`` lock.
+"""
+import threading
+
+
+class Timeout(BaseException):
+    # Raised when the run reaches its time budget. Derives from BaseException
+    # so that game code catching Exception does not swallow it.
+    pass
+
+
+class Clock:
+    QUANTUM_US = 500
+
+    def __init__(self, limit_us=None):
+        self.now_us = 0  # Core 0 time
+        self.limit_us = limit_us
+        self._waiters = []  # [due_us, seq, callback]
+        self._scheduled = []
+        self._seq = 0
+        self._busy = False
+        self._cv = threading.Condition()
+        self.core1 = None  # threading.Thread playing core 1
+        self.core1_us = 0
+        self._blocked = set()  # Threads waiting on a _thread lock
+
+    def time_us(self):
+        # Current time of the calling core
+        if self.core1 is not None and threading.current_thread() is self.core1:
+            return self.core1_us
+        return self.now_us
+
+    # -- core 1 --------------------------------------------------------------
+
+    def start_core1(self, thread):
+        with self._cv:
+            self.core1 = thread
+            self.core1_us = self.now_us
+
+    def core1_done(self):
+        with self._cv:
+            self.core1 = None
+            self._cv.notify_all()
+
+    def _core1_running(self):
+        return self.core1 is not None and self.core1 not in self._blocked
+
+    def _core0_running(self):
+        main = threading.main_thread()
+        return main.is_alive() and main not in self._blocked
+
+    def block(self):
+        with self._cv:
+            self._blocked.add(threading.current_thread())
+            self._cv.notify_all()
+
+    def unblock(self):
+        me = threading.current_thread()
+        with self._cv:
+            self._blocked.discard(me)
+            if me is self.core1:
+                self.core1_us = max(self.core1_us, self.now_us)
+                return
+            behind = self.core1_us - self.now_us if self.core1 is not None else 0
+        if behind > 0:
+            # Core 0 waited for core 1: catch up with it
+            self.advance(behind)
+
+    def _advance_core1(self, us):
+        with self._cv:
+            self.core1_us += max(int(us), 0)
+            self._cv.notify_all()
+            while (self.core1_us > self.now_us + self.QUANTUM_US
+                   and self._core0_running()):
+                self._cv.wait(0.05)
+
+    def _sync(self, until):
+        # Move core 0 to `until`, no further ahead of core 1 than a quantum
+        with self._cv:
+            while True:
+                if not self._core1_running():
+                    self.now_us = max(self.now_us, until)
+                else:
+                    self.now_us = max(self.now_us,
+                                      min(until, self.core1_us + self.QUANTUM_US))
+                self._cv.notify_all()
+                if self.now_us >= until:
+                    return
+                self._cv.wait(0.05)
+
+    def at(self, due_us, callback):
+        # callback(clock) runs once the clock reaches due_us. It may call
+        # at() again to keep itself running.
+        self._seq += 1
+        self._waiters.append([due_us, self._seq, callback])
+        self._waiters.sort()
+
+    def cancel(self, callback):
+        self._waiters = [w for w in self._waiters if w[2] is not callback]
+
+    def schedule(self, fn, arg):
+        self._scheduled.append((fn, arg))
+        if not self._busy:
+            self._run_scheduled()
+
+    def _run_scheduled(self):
+        while self._scheduled:
+            fn, arg = self._scheduled.pop(0)
+            fn(arg)
+
+    def advance(self, us):
+        if self.core1 is not None and threading.current_thread() is self.core1:
+            self._advance_core1(us)
+            return
+        target = self.now_us + max(int(us), 0)
+        if (self.core1 is None and not self._busy and not self._scheduled
+                and (not self._waiters or self._waiters[0][0] > target)):
+            # Nothing to run on the way: the common case of busy loops
+            self.now_us = target
+            if self.limit_us is not None and target >= self.limit_us:
+                raise Timeout()
+            return
+        if self._busy:
+            # Called from inside a callback: just move time.
+            self.now_us = target
+            return
+        self._busy = True
+        try:
+            while self._waiters and self._waiters[0][0] <= target:
+                due, _, callback = self._waiters.pop(0)
+                self._sync(due)
+                callback(self)
+                self._run_scheduled()
+            self._sync(target)
+        finally:
+            self._busy = False
+        self._run_scheduled()
+        if (self.limit_us is not None and self.now_us >= self.limit_us
+                and threading.current_thread() is threading.main_thread()):
+            raise Timeout()
+
+
+clock = Clock()
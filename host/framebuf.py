@@ -0,0 +1,369 @@
+"""
+Host stand-in for the MicroPython ``framebuf`` module.
+
+Pixels live in the caller's buffer exactly as on the device, so code that
+sends ``self.buffer`` over SPI or reads it back byte by byte keeps working.
+NumPy does the bulk work; only ``line`` and ``text`` touch pixels one at a
+time.
+"""
+import numpy as np
+
+MONO_VLSB = 0
+RGB565 = 1
+GS4_HMSB = 2
+MONO_HLSB = 3
+MONO_HMSB = 4
+GS2_HMSB = 5
+GS8 = 6
+
+# 8x8 glyphs for 0x20-0x7F, column-major with bit 0 at the top (the same
+# layout as MicroPython's built-in font). Taken from the CP437 font shipped
+# with luma.core (MIT licence).
+_FONT = bytes((
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,  # ' '
+    0x00, 0x06, 0x5f, 0x5f, 0x06, 0x00, 0x00, 0x00,  # '!'
+    0x00, 0x07, 0x07, 0x00, 0x07, 0x07, 0x00, 0x00,  # '"'
+    0x14, 0x7f, 0x7f, 0x14, 0x7f, 0x7f, 0x14, 0x00,  # '#'
+    0x24, 0x2e, 0x6b, 0x6b, 0x3a, 0x12, 0x00, 0x00,  # '$'
+    0x46, 0x66, 0x30, 0x18, 0x0c, 0x66, 0x62, 0x00,  # '%'
+    0x30, 0x7a, 0x4f, 0x5d, 0x37, 0x7a, 0x48, 0x00,  # '&'
+    0x04, 0x07, 0x03, 0x00, 0x00, 0x00, 0x00, 0x00,  # "'"
+    0x00, 0x1c, 0x3e, 0x63, 0x41, 0x00, 0x00, 0x00,  # '('
+    0x00, 0x41, 0x63, 0x3e, 0x1c, 0x00, 0x00, 0x00,  # ')'
+    0x08, 0x2a, 0x3e, 0x1c, 0x1c, 0x3e, 0x2a, 0x08,  # '*'
+    0x08, 0x08, 0x3e, 0x3e, 0x08, 0x08, 0x00, 0x00,  # '+'
+    0x00, 0x80, 0xe0, 0x60, 0x00, 0x00, 0x00, 0x00,  # ','
+    0x08, 0x08, 0x08, 0x08, 0x08, 0x08, 0x00, 0x00,  # '-'
+    0x00, 0x00, 0x60, 0x60, 0x00, 0x00, 0x00, 0x00,  # '.'
+    0x60, 0x30, 0x18, 0x0c, 0x06, 0x03, 0x01, 0x00,  # '/'
+    0x3e, 0x7f, 0x71, 0x59, 0x4d, 0x7f, 0x3e, 0x00,  # '0'
+    0x40, 0x42, 0x7f, 0x7f, 0x40, 0x40, 0x00, 0x00,  # '1'
+    0x62, 0x73, 0x59, 0x49, 0x6f, 0x66, 0x00, 0x00,  # '2'
+    0x22, 0x63, 0x49, 0x49, 0x7f, 0x36, 0x00, 0x00,  # '3'
+    0x18, 0x1c, 0x16, 0x53, 0x7f, 0x7f, 0x50, 0x00,  # '4'
+    0x27, 0x67, 0x45, 0x45, 0x7d, 0x39, 0x00, 0x00,  # '5'
+    0x3c, 0x7e, 0x4b, 0x49, 0x79, 0x30, 0x00, 0x00,  # '6'
+    0x03, 0x03, 0x71, 0x79, 0x0f, 0x07, 0x00, 0x00,  # '7'
+    0x36, 0x7f, 0x49, 0x49, 0x7f, 0x36, 0x00, 0x00,  # '8'
+    0x06, 0x4f, 0x49, 0x69, 0x3f, 0x1e, 0x00, 0x00,  # '9'
+    0x00, 0x00, 0x66, 0x66, 0x00, 0x00, 0x00, 0x00,  # ':'
+    0x00, 0x80, 0xe6, 0x66, 0x00, 0x00, 0x00, 0x00,  # ';'
+    0x08, 0x1c, 0x36, 0x63, 0x41, 0x00, 0x00, 0x00,  # '<'
+    0x24, 0x24, 0x24, 0x24, 0x24, 0x24, 0x00, 0x00,  # '='
+    0x00, 0x41, 0x63, 0x36, 0x1c, 0x08, 0x00, 0x00,  # '>'
+    0x02, 0x03, 0x51, 0x59, 0x0f, 0x06, 0x00, 0x00,  # '?'
+    0x3e, 0x7f, 0x41, 0x5d, 0x5d, 0x1f, 0x1e, 0x00,  # '@'
+    0x7c, 0x7e, 0x13, 0x13, 0x7e, 0x7c, 0x00, 0x00,  # 'A'
+    0x41, 0x7f, 0x7f, 0x49, 0x49, 0x7f, 0x36, 0x00,  # 'B'
+    0x1c, 0x3e, 0x63, 0x41, 0x41, 0x63, 0x22, 0x00,  # 'C'
+    0x41, 0x7f, 0x7f, 0x41, 0x63, 0x3e, 0x1c, 0x00,  # 'D'
+    0x41, 0x7f, 0x7f, 0x49, 0x5d, 0x41, 0x63, 0x00,  # 'E'
+    0x41, 0x7f, 0x7f, 0x49, 0x1d, 0x01, 0x03, 0x00,  # 'F'
+    0x1c, 0x3e, 0x63, 0x41, 0x51, 0x73, 0x72, 0x00,  # 'G'
+    0x7f, 0x7f, 0x08, 0x08, 0x7f, 0x7f, 0x00, 0x00,  # 'H'
+    0x00, 0x41, 0x7f, 0x7f, 0x41, 0x00, 0x00, 0x00,  # 'I'
+    0x30, 0x70, 0x40, 0x41, 0x7f, 0x3f, 0x01, 0x00,  # 'J'
+    0x41, 0x7f, 0x7f, 0x08, 0x1c, 0x77, 0x63, 0x00,  # 'K'
+    0x41, 0x7f, 0x7f, 0x41, 0x40, 0x60, 0x70, 0x00,  # 'L'
+    0x7f, 0x7f, 0x0e, 0x1c, 0x0e, 0x7f, 0x7f, 0x00,  # 'M'
+    0x7f, 0x7f, 0x06, 0x0c, 0x18, 0x7f, 0x7f, 0x00,  # 'N'
+    0x1c, 0x3e, 0x63, 0x41, 0x63, 0x3e, 0x1c, 0x00,  # 'O'
+    0x41, 0x7f, 0x7f, 0x49, 0x09, 0x0f, 0x06, 0x00,  # 'P'
+    0x1e, 0x3f, 0x21, 0x71, 0x7f, 0x5e, 0x00, 0x00,  # 'Q'
+    0x41, 0x7f, 0x7f, 0x09, 0x19, 0x7f, 0x66, 0x00,  # 'R'
+    0x26, 0x6f, 0x4d, 0x59, 0x73, 0x32, 0x00, 0x00,  # 'S'
+    0x03, 0x41, 0x7f, 0x7f, 0x41, 0x03, 0x00, 0x00,  # 'T'
+    0x7f, 0x7f, 0x40, 0x40, 0x7f, 0x7f, 0x00, 0x00,  # 'U'
+    0x1f, 0x3f, 0x60, 0x60, 0x3f, 0x1f, 0x00, 0x00,  # 'V'
+    0x7f, 0x7f, 0x30, 0x18, 0x30, 0x7f, 0x7f, 0x00,  # 'W'
+    0x43, 0x67, 0x3c, 0x18, 0x3c, 0x67, 0x43, 0x00,  # 'X'
+    0x07, 0x4f, 0x78, 0x78, 0x4f, 0x07, 0x00, 0x00,  # 'Y'
+    0x47, 0x63, 0x71, 0x59, 0x4d, 0x67, 0x73, 0x00,  # 'Z'
+    0x00, 0x7f, 0x7f, 0x41, 0x41, 0x00, 0x00, 0x00,  # '['
+    0x01, 0x03, 0x06, 0x0c, 0x18, 0x30, 0x60, 0x00,  # '\\'
+    0x00, 0x41, 0x41, 0x7f, 0x7f, 0x00, 0x00, 0x00,  # ']'
+    0x08, 0x0c, 0x06, 0x03, 0x06, 0x0c, 0x08, 0x00,  # '^'
+    0x80, 0x80, 0x80, 0x80, 0x80, 0x80, 0x80, 0x80,  # '_'
+    0x00, 0x00, 0x03, 0x07, 0x04, 0x00, 0x00, 0x00,  # '`'
+    0x20, 0x74, 0x54, 0x54, 0x3c, 0x78, 0x40, 0x00,  # 'a'
+    0x41, 0x7f, 0x3f, 0x48, 0x48, 0x78, 0x30, 0x00,  # 'b'
+    0x38, 0x7c, 0x44, 0x44, 0x6c, 0x28, 0x00, 0x00,  # 'c'
+    0x30, 0x78, 0x48, 0x49, 0x3f, 0x7f, 0x40, 0x00,  # 'd'
+    0x38, 0x7c, 0x54, 0x54, 0x5c, 0x18, 0x00, 0x00,  # 'e'
+    0x48, 0x7e, 0x7f, 0x49, 0x03, 0x02, 0x00, 0x00,  # 'f'
+    0x98, 0xbc, 0xa4, 0xa4, 0xf8, 0x7c, 0x04, 0x00,  # 'g'
+    0x41, 0x7f, 0x7f, 0x08, 0x04, 0x7c, 0x78, 0x00,  # 'h'
+    0x00, 0x44, 0x7d, 0x7d, 0x40, 0x00, 0x00, 0x00,  # 'i'
+    0x60, 0xe0, 0x80, 0x80, 0xfd, 0x7d, 0x00, 0x00,  # 'j'
+    0x41, 0x7f, 0x7f, 0x10, 0x38, 0x6c, 0x44, 0x00,  # 'k'
+    0x00, 0x41, 0x7f, 0x7f, 0x40, 0x00, 0x00, 0x00,  # 'l'
+    0x7c, 0x7c, 0x18, 0x38, 0x1c, 0x7c, 0x78, 0x00,  # 'm'
+    0x7c, 0x7c, 0x04, 0x04, 0x7c, 0x78, 0x00, 0x00,  # 'n'
+    0x38, 0x7c, 0x44, 0x44, 0x7c, 0x38, 0x00, 0x00,  # 'o'
+    0x84, 0xfc, 0xf8, 0xa4, 0x24, 0x3c, 0x18, 0x00,  # 'p'
+    0x18, 0x3c, 0x24, 0xa4, 0xf8, 0xfc, 0x84, 0x00,  # 'q'
+    0x44, 0x7c, 0x78, 0x4c, 0x04, 0x1c, 0x18, 0x00,  # 'r'
+    0x48, 0x5c, 0x54, 0x54, 0x74, 0x24, 0x00, 0x00,  # 's'
+    0x00, 0x04, 0x3e, 0x7f, 0x44, 0x24, 0x00, 0x00,  # 't'
+    0x3c, 0x7c, 0x40, 0x40, 0x3c, 0x7c, 0x40, 0x00,  # 'u'
+    0x1c, 0x3c, 0x60, 0x60, 0x3c, 0x1c, 0x00, 0x00,  # 'v'
+    0x3c, 0x7c, 0x70, 0x38, 0x70, 0x7c, 0x3c, 0x00,  # 'w'
+    0x44, 0x6c, 0x38, 0x10, 0x38, 0x6c, 0x44, 0x00,  # 'x'
+    0x9c, 0xbc, 0xa0, 0xa0, 0xfc, 0x7c, 0x00, 0x00,  # 'y'
+    0x4c, 0x64, 0x74, 0x5c, 0x4c, 0x64, 0x00, 0x00,  # 'z'
+    0x08, 0x08, 0x3e, 0x77, 0x41, 0x41, 0x00, 0x00,  # '{'
+    0x00, 0x00, 0x00, 0x77, 0x77, 0x00, 0x00, 0x00,  # '|'
+    0x41, 0x41, 0x77, 0x3e, 0x08, 0x08, 0x00, 0x00,  # '}'
+    0x02, 0x03, 0x01, 0x03, 0x02, 0x03, 0x01, 0x00,  # '~'
+    0x70, 0x78, 0x4c, 0x46, 0x4c, 0x78, 0x70, 0x00,  # '\x7f'
+))
+
+
+def _glyph(ch):
+    code = ord(ch)
+    if code < 32 or code > 127:
+        code = 127
+    cols = np.frombuffer(_FONT, dtype=np.uint8, count=8, offset=(code - 32) * 8)
+    # mask[row, col]
+    return ((cols[None, :] >> np.arange(8)[:, None]) & 1).astype(bool)
+
+
+class FrameBuffer:
+
+    def __init__(self, buffer, width, height, format, stride=None):
+        if format not in (RGB565, GS8, GS4_HMSB):
+            raise ValueError("invalid format")
+        self._buffer = buffer
+        self._width = width
+        self._height = height
+        self._format = format
+        self._stride = width if stride is None else stride
+        if height == 0 or width == 0:
+            span = 0
+        else:
+            # Like MicroPython, the last row only needs `width` pixels
+            span = (height - 1) * self._stride + width
+        if format == RGB565:
+            need = span * 2
+        elif format == GS8:
+            need = span
+        else:
+            need = (self._stride * height + 1) >> 1
+        if len(buffer) < need:
+            raise ValueError("buffer too small")
+        if format == GS4_HMSB:
+            self._pix = None
+            self._raw = np.frombuffer(buffer, dtype=np.uint8, count=need)
+        else:
+            dtype = "<u2" if format == RGB565 else np.uint8
+            flat = np.frombuffer(buffer, dtype=dtype, count=span)
+            if span == 0:
+                self._pix = flat.reshape(0, 0)
+            else:
+                self._pix = np.lib.stride_tricks.as_strided(
+                    flat, shape=(height, width),
+                    strides=(self._stride * flat.itemsize, flat.itemsize))
+
+    # -- pixel storage -----------------------------------------------------
+
+    def _values(self):
+        # Returns an (height, stride) array of pixel values. For packed
+        # formats this is a copy that must be handed back to _store().
+        if self._pix is not None:
+            return self._pix
+        nib = np.empty(self._raw.size * 2, dtype=np.uint8)
+        nib[0::2] = self._raw >> 4
+        nib[1::2] = self._raw & 0x0F
+        return nib[:self._stride * self._height].reshape(self._height, self._stride)
+
+    def _store(self, values):
+        if self._pix is not None:
+            return
+        flat = np.zeros(self._raw.size * 2, dtype=np.uint8)
+        flat[:values.size] = values.reshape(-1)
+        self._raw[:] = (flat[0::2] << 4) | (flat[1::2] & 0x0F)
+
+    def _mask(self, c):
+        if self._format == RGB565:
+            return c & 0xFFFF
+        if self._format == GS8:
+            return c & 0xFF
+        return c & 0x0F
+
+    def _clip(self, x, y, w, h):
+        x0 = max(x, 0)
+        y0 = max(y, 0)
+        x1 = min(x + w, self._width)
+        y1 = min(y + h, self._height)
+        if x1 <= x0 or y1 <= y0:
+            return None
+        return x0, y0, x1, y1
+
+    # -- primitives --------------------------------------------------------
+
+    # Primitives never call each other through self: device code overrides
+    # them in subclasses, and the C implementation does not dispatch either.
+
+    def fill(self, c):
+        self._fill_rect(0, 0, self._width, self._height, c)
+
+    def fill_rect(self, x, y, w, h, c):
+        self._fill_rect(x, y, w, h, c)
+
+    def _fill_rect(self, x, y, w, h, c):
+        pix = self._pix
+        if pix is not None:
+            # Fast path: the hottest call of every game
+            x1 = x + w
+            y1 = y + h
+            if x < 0:
+                x = 0
+            if y < 0:
+                y = 0
+            if x1 > self._width:
+                x1 = self._width
+            if y1 > self._height:
+                y1 = self._height
+            if x1 > x and y1 > y:
+                pix[y:y1, x:x1] = c & (0xFFFF if self._format == RGB565 else 0xFF)
+            return
+        box = self._clip(x, y, w, h)
+        if box is None:
+            return
+        x0, y0, x1, y1 = box
+        v = self._values()
+        v[y0:y1, x0:x1] = self._mask(c)
+        self._store(v)
+
+    def pixel(self, x, y, c=None):
+        if not (0 <= x < self._width and 0 <= y < self._height):
+            return None
+        v = self._values()
+        if c is None:
+            return int(v[y, x])
+        v[y, x] = self._mask(c)
+        self._store(v)
+
+    def hline(self, x, y, w, c):
+        self._fill_rect(x, y, w, 1, c)
+
+    def vline(self, x, y, h, c):
+        self._fill_rect(x, y, 1, h, c)
+
+    def rect(self, x, y, w, h, c, f=False):
+        if f:
+            self._fill_rect(x, y, w, h, c)
+            return
+        self._fill_rect(x, y, w, 1, c)
+        self._fill_rect(x, y + h - 1, w, 1, c)
+        self._fill_rect(x, y, 1, h, c)
+        self._fill_rect(x + w - 1, y, 1, h, c)
+
+    def line(self, x1, y1, x2, y2, c):
+        v = self._values()
+        c = self._mask(c)
+        dx = abs(x2 - x1)
+        dy = -abs(y2 - y1)
+        sx = 1 if x1 < x2 else -1
+        sy = 1 if y1 < y2 else -1
+        err = dx + dy
+        while True:
+            if 0 <= x1 < self._width and 0 <= y1 < self._height:
+                v[y1, x1] = c
+            if x1 == x2 and y1 == y2:
+                break
+            e2 = 2 * err
+            if e2 >= dy:
+                err += dy
+                x1 += sx
+            if e2 <= dx:
+                err += dx
+                y1 += sy
+        self._store(v)
+
+    def ellipse(self, x, y, xr, yr, c, f=False, m=0xF):
+        if xr <= 0 or yr <= 0:
+            FrameBuffer.pixel(self, x, y, c)
+            return
+        yy, xx = np.mgrid[-yr:yr + 1, -xr:xr + 1]
+        d = (xx / xr) ** 2 + (yy / yr) ** 2
+        inside = d <= 1.0
+        if not f:
+            inner = ((xx / max(xr - 1, 1)) ** 2 + (yy / max(yr - 1, 1)) ** 2) <= 1.0
+            inside &= ~inner
+        v = self._values()
+        for (py, px) in zip(*np.nonzero(inside)):
+            qx = px - xr
+            qy = py - yr
+            quad = (1 if qx >= 0 and qy <= 0 else 0) | (2 if qx <= 0 and qy <= 0 else 0) \
+                | (4 if qx <= 0 and qy >= 0 else 0) | (8 if qx >= 0 and qy >= 0 else 0)
+            if not quad & m:
+                continue
+            tx = x + qx
+            ty = y + qy
+            if 0 <= tx < self._width and 0 <= ty < self._height:
+                v[ty, tx] = self._mask(c)
+        self._store(v)
+
+    def poly(self, x, y, coords, c, f=False):
+        pts = [(x + coords[i], y + coords[i + 1]) for i in range(0, len(coords) - 1, 2)]
+        if not pts:
+            return
+        if f:
+            # Even-odd fill through the pixel centres of every row
+            for py in range(min(p[1] for p in pts), max(p[1] for p in pts) + 1):
+                xs = []
+                for i in range(len(pts)):
+                    (x1, y1), (x2, y2) = pts[i], pts[i - 1]
+                    if (y1 <= py < y2) or (y2 <= py < y1):
+                        xs.append(x1 + (py - y1) * (x2 - x1) / (y2 - y1))
+                xs.sort()
+                for i in range(0, len(xs) - 1, 2):
+                    a = int(round(xs[i]))
+                    FrameBuffer.hline(self, a, py, int(round(xs[i + 1])) - a + 1, c)
+        for i in range(len(pts)):
+            (x1, y1), (x2, y2) = pts[i - 1], pts[i]
+            FrameBuffer.line(self, x1, y1, x2, y2, c)
+
+    def text(self, s, x, y, c=1):
+        v = self._values()
+        c = self._mask(c)
+        for ch in s:
+            box = self._clip(x, y, 8, 8)
+            if box is not None:
+                x0, y0, x1, y1 = box
+                g = _glyph(ch)[y0 - y:y1 - y, x0 - x:x1 - x]
+                region = v[y0:y1, x0:x1]
+                region[g] = c
+            x += 8
+        self._store(v)
+
+    def scroll(self, xstep, ystep):
+        v = self._values()
+        src = v.copy()
+        h, w = self._height, self._width
+        ys = slice(max(ystep, 0), h + min(ystep, 0))
+        yd = slice(max(-ystep, 0), h - max(ystep, 0))
+        xs = slice(max(xstep, 0), w + min(xstep, 0))
+        xd = slice(max(-xstep, 0), w - max(xstep, 0))
+        v[ys, xs] = src[yd, xd]
+        self._store(v)
+
+    def blit(self, fbuf, x, y, key=-1, palette=None):
+        if isinstance(fbuf, tuple):
+            fbuf = FrameBuffer(*fbuf)
+        box = self._clip(x, y, fbuf._width, fbuf._height)
+        if box is None:
+            return
+        x0, y0, x1, y1 = box
+        src = fbuf._values()[y0 - y:y1 - y, x0 - x:x1 - x].astype(np.int64)
+        if palette is not None:
+            src = palette._values()[0].astype(np.int64)[np.clip(src, 0, palette._width - 1)]
+        v = self._values()
+        dst = v[y0:y1, x0:x1]
+        if key == -1:
+            dst[...] = src & self._mask(-1)
+        else:
+            keep = src != key
+            dst[keep] = src[keep] & self._mask(-1)
+        self._store(v)
@@ -0,0 +1,23 @@
+"""
+Host stand-in for MicroPython's ``gc`` module, given to the device modules
+when they ``import gc``. CPython's ``gc`` does the collecting; ``mem_free()``
+and ``mem_alloc()`` report a pretend device heap of HEAP_SIZE bytes.
+"""
+from gc import *  # noqa: F401,F403
+
+HEAP_SIZE = 192 * 1024
+
+_heap = {"free": HEAP_SIZE}
+
+
+def mem_free():
+    return _heap["free"]
+
+
+def mem_alloc():
+    return HEAP_SIZE - _heap["free"]
+
+
+def set_mem_free(n):
+    # Pretend the device heap has n bytes left (for testing fallbacks).
+    _heap["free"] = n
@@ -0,0 +1,262 @@
+"""
+Host stand-in for the parts of MicroPython's ``machine`` module that the
+Pico Game Boy code uses. SPI traffic is decoded by the virtual panel, input
+pins follow the button script and time only moves through the virtual clock.
+"""
+from .clock import clock
+from .panel import panel as _lcd
+
+_SIO_GPIO_IN = 0xD0000004
+POLL_COST_US = 10
+
+
+class Reset(BaseException):
+    pass
+
+
+class _PinState:
+
+    def __init__(self, id_):
+        self.id = id_
+        self.mode = Pin.IN
+        self.pull = None
+        self._level = 0
+        self.handler = None
+        self.trigger = 0
+
+    @property
+    def level(self):
+        return self._level
+
+    @level.setter
+    def level(self, value):
+        self._level = value
+        if isinstance(self.id, int):
+            # Keep the word that mem32 reads up to date
+            bit = 1 << self.id
+            _gpio_in[0] = _gpio_in[0] | bit if value else _gpio_in[0] & ~bit
+
+
+_pins = {}
+_gpio_in = [0]  # Levels of the numbered pins, bit n for GPIO n
+
+
+def _state(id_):
+    if id_ not in _pins:
+        _pins[id_] = _PinState(id_)
+    return _pins[id_]
+
+
+def set_level(id_, level):
+    # Drive an input pin from the outside (used by the button script).
+    st = _state(id_)
+    level = 1 if level else 0
+    old = st.level
+    st.level = level
+    if st.handler is not None and old != level:
+        edge = Pin.IRQ_RISING if level else Pin.IRQ_FALLING
+        if st.trigger & edge:
+            st.handler(Pin(id_))
+
+
+def level(id_):
+    return _state(id_).level
+
+
+class Pin:
+    IN = 0
+    OUT = 1
+    OPEN_DRAIN = 2
+    PULL_UP = 1
+    PULL_DOWN = 2
+    IRQ_LOW_LEVEL = 1
+    IRQ_HIGH_LEVEL = 2
+    IRQ_FALLING = 4
+    IRQ_RISING = 8
+
+    def __init__(self, id_, mode=-1, pull=-1, value=None):
+        self._id = id_
+        self._st = _state(id_)
+        self.init(mode, pull, value=value)
+
+    def init(self, mode=-1, pull=-1, value=None):
+        st = self._st
+        if mode != -1:
+            st.mode = mode
+        if pull != -1:
+            st.pull = pull
+            if pull == Pin.PULL_UP and st.mode == Pin.IN:
+                st.level = 1
+        if value is not None:
+            st.level = 1 if value else 0
+
+    def value(self, x=None):
+        if x is None:
+            # Reading a pin costs a little interpreter time, which keeps
+            # busy-polling loops moving through virtual time.
+            clock.advance(POLL_COST_US)
+            return self._st.level
+        self._st.level = 1 if x else 0
+
+    __call__ = value
+
+    def on(self):
+        self._st.level = 1
+
+    def off(self):
+        self._st.level = 0
+
+    def high(self):
+        self.on()
+
+    def low(self):
+        self.off()
+
+    def irq(self, handler=None, trigger=IRQ_FALLING | IRQ_RISING, hard=False):
+        self._st.handler = handler
+        self._st.trigger = trigger if handler is not None else 0
+
+    def __eq__(self, other):
+        return isinstance(other, Pin) and other._id == self._id
+
+    def __hash__(self):
+        return hash(self._id)
+
+    def __repr__(self):
+        return "Pin(%d)" % self._id
+
+
+class _Mem:
+
+    def __getitem__(self, addr):
+        if addr == _SIO_GPIO_IN:
+            clock.advance(POLL_COST_US)
+            return _gpio_in[0]
+        return 0
+
+    def __setitem__(self, addr, value):
+        pass
+
+
+mem32 = _Mem()
+
+
+class PWM:
+
+    def __init__(self, pin, freq=None, duty_u16=None):
+        self.pin = pin
+        self._freq = 0
+        self._duty = 0
+        self.writes = 0
+        if freq is not None:
+            self.freq(freq)
+        if duty_u16 is not None:
+            self.duty_u16(duty_u16)
+
+    def freq(self, value=None):
+        if value is None:
+            return self._freq
+        self._freq = value
+
+    def duty_u16(self, value=None):
+        if value is None:
+            return self._duty
+        self._duty = value & 0xFFFF
+        self.writes += 1
+
+    def deinit(self):
+        self._duty = 0
+
+
+class SPI:
+
+    def __init__(self, id_, baudrate=1000000, polarity=0, phase=0, bits=8,
+                 firstbit=0, sck=None, mosi=None, miso=None):
+        self.baudrate = baudrate
+        self.bytes_written = 0
+        self._debt_us = 0.0
+
+    def init(self, baudrate=None, **kwargs):
+        if baudrate is not None:
+            self.baudrate = baudrate
+
+    def write(self, buf):
+        n = len(buf)
+        self.bytes_written += n
+        _lcd.feed(level(_lcd.dc_pin), buf)
+        self._debt_us += n * 8 * 1000000 / self.baudrate
+        whole = int(self._debt_us)
+        if whole:
+            self._debt_us -= whole
+            clock.advance(whole)
+
+    def deinit(self):
+        pass
+
+
+class Timer:
+    ONE_SHOT = 0
+    PERIODIC = 1
+
+    def __init__(self, id_=-1, **kwargs):
+        self._callback = None
+        self._tick = None
+        if kwargs:
+            self.init(**kwargs)
+
+    def init(self, mode=PERIODIC, freq=None, period=None, callback=None, hard=True):
+        self.deinit()
+        if freq is not None:
+            self._period_us = 1000000.0 / freq
+        else:
+            self._period_us = float(period if period is not None else 1000) * 1000
+        self._mode = mode
+        self._callback = callback
+        self._next = clock.now_us + self._period_us
+
+        def tick(c):
+            if self._tick is not tick:
+                return
+            if self._mode == Timer.PERIODIC:
+                self._next += self._period_us
+                c.at(int(self._next), tick)
+            else:
+                self._tick = None
+            if self._callback is not None:
+                self._callback(self)
+
+        self._tick = tick
+        clock.at(int(self._next), tick)
+
+    def deinit(self):
+        if self._tick is not None:
+            clock.cancel(self._tick)
+            self._tick = None
+
+
+def freq(hz=None):
+    return 125000000
+
+
+def reset():
+    raise Reset()
+
+
+def soft_reset():
+    raise Reset()
+
+
+def idle():
+    clock.advance(100)
+
+
+def disable_irq():
+    return 0
+
+
+def enable_irq(state=0):
+    pass
+
+
+def unique_id():
+    return b"HOST0000"
@@ -0,0 +1,32 @@
+"""
+Host stand-in for the ``micropython`` module.
+"""
+from .clock import clock
+
+
+def const(expr):
+    return expr
+
+
+def schedule(fn, arg):
+    clock.schedule(fn, arg)
+
+
+def alloc_emergency_exception_buf(size):
+    pass
+
+
+def mem_info(verbose=False):
+    print("mem: host")
+
+
+def opt_level(level=None):
+    return 0
+
+
+def native(fn):
+    return fn
+
+
+def viper(fn):
+    return fn
@@ -0,0 +1,209 @@
+"""
+Virtual ILI9341 panel. It decodes the command stream written by ``Chimera``
+(SET_COLUMN, SET_PAGE, WRITE_RAM, MADCTL, VSCRDEF, VSCRSADD) into a frame
+memory image and keeps a few counters for benchmarks.
+"""
+import struct
+import zlib
+
+import numpy as np
+
+SET_COLUMN = 0x2A
+SET_PAGE = 0x2B
+WRITE_RAM = 0x2C
+VSCRDEF = 0x33
+MADCTL = 0x36
+VSCRSADD = 0x37
+
+_MY = 0x80
+_MX = 0x40
+_MV = 0x20
+
+
+class Panel:
+
+    def __init__(self, dc_pin=15, lines=320, columns=240):
+        self.dc_pin = dc_pin
+        self.lines = lines
+        self.columns = columns
+        self.reset()
+
+    def reset(self):
+        self.madctl = 0
+        # Frame memory in the physical layout of the chip: one row per gate
+        # line. MADCTL decides how window coordinates map onto it.
+        self.gram = np.zeros((self.lines, self.columns), dtype=np.uint16)
+        self.x0 = self.y0 = 0
+        self.x1 = self.columns - 1
+        self.y1 = self.lines - 1
+        self.tfa = 0
+        self.vsa = self.lines
+        self.bfa = 0
+        self.vsp = 0
+        self._cmd = None
+        self._params = bytearray()
+        self._pos = 0
+        self._carry = None
+        self.commands = 0
+        self.ram_writes = 0
+        self.pixel_bytes = 0
+
+    def size(self):
+        # (width, height) of the screen as seen through MADCTL
+        if self.madctl & _MV:
+            return self.lines, self.columns
+        return self.columns, self.lines
+
+    def _physical(self, x, y):
+        # Frame memory (line, column) for screen coordinates (x, y)
+        if self.madctl & _MV:
+            line, col = x, y
+        else:
+            line, col = y, x
+        if self.madctl & _MY:
+            line = self.lines - 1 - line
+        if self.madctl & _MX:
+            col = self.columns - 1 - col
+        return line, col
+
+    def feed(self, dc, data):
+        if not dc:
+            for b in bytes(data):
+                self._command(b)
+            return
+        if self._cmd == WRITE_RAM:
+            self._pixels(data)
+            return
+        self._params.extend(data)
+        self._apply()
+
+    def _command(self, b):
+        self.commands += 1
+        self._cmd = b
+        self._params = bytearray()
+        self._carry = None
+        if b == WRITE_RAM:
+            self.ram_writes += 1
+            self._pos = 0
+
+    def _apply(self):
+        p = self._params
+        if self._cmd == SET_COLUMN and len(p) >= 4:
+            self.x0 = (p[0] << 8) | p[1]
+            self.x1 = (p[2] << 8) | p[3]
+        elif self._cmd == SET_PAGE and len(p) >= 4:
+            self.y0 = (p[0] << 8) | p[1]
+            self.y1 = (p[2] << 8) | p[3]
+        elif self._cmd == MADCTL and len(p) >= 1:
+            old = self.size()
+            self.madctl = p[0]
+            if self.size() != old:
+                # The column/page end registers follow MV, as on the real chip
+                w, h = self.size()
+                self.x0 = self.y0 = 0
+                self.x1 = w - 1
+                self.y1 = h - 1
+        elif self._cmd == VSCRDEF and len(p) >= 6:
+            self.tfa = (p[0] << 8) | p[1]
+            self.vsa = (p[2] << 8) | p[3]
+            self.bfa = (p[4] << 8) | p[5]
+        elif self._cmd == VSCRSADD and len(p) >= 2:
+            self.vsp = (p[0] << 8) | p[1]
+
+    def _pixels(self, data):
+        raw = bytes(data)
+        self.pixel_bytes += len(raw)
+        if self._carry is not None:
+            raw = bytes((self._carry,)) + raw
+            self._carry = None
+        if len(raw) & 1:
+            self._carry = raw[-1]
+            raw = raw[:-1]
+        if not raw:
+            return
+        values = np.frombuffer(raw, dtype=">u2")
+        w, h = self.size()
+        x0 = min(self.x0, w - 1)
+        x1 = min(self.x1, w - 1)
+        y0 = min(self.y0, h - 1)
+        y1 = min(self.y1, h - 1)
+        ww = x1 - x0 + 1
+        wh = y1 - y0 + 1
+        if ww <= 0 or wh <= 0:
+            return
+        # Copy whole rows of the window at once where the data allows
+        screen = self._screen()
+        total = ww * wh
+        pos = self._pos
+        i = 0
+        n = values.size
+        while i < n:
+            r, c = divmod(pos, ww)
+            if c == 0 and n - i >= ww:
+                rows = min((n - i) // ww, wh - r)
+                k = rows * ww
+                screen[y0 + r:y0 + r + rows, x0:x1 + 1] = values[i:i + k].reshape(rows, ww)
+            else:
+                k = min(ww - c, n - i)
+                screen[y0 + r, x0 + c:x0 + c + k] = values[i:i + k]
+            i += k
+            pos = (pos + k) % total
+        self._pos = pos
+
+    def _screen(self):
+        # View of the frame memory indexed [y, x] in screen coordinates
+        base = self.gram
+        if self.madctl & _MY:
+            base = base[::-1, :]
+        if self.madctl & _MX:
+            base = base[:, ::-1]
+        return base.T if self.madctl & _MV else base
+
+    def image(self):
+        # What the viewer sees, in screen coordinates: frame memory with
+        # vertical scrolling applied to the gate lines.
+        w, h = self.size()
+        yy, xx = np.mgrid[0:h, 0:w]
+        line, col = self._physical(xx, yy)
+        shown = np.arange(self.lines)
+        area = (shown >= self.tfa) & (shown < self.tfa + self.vsa)
+        if self.vsa:
+            shown[area] = self.tfa + ((shown[area] - self.tfa) + (self.vsp - self.tfa)) % self.vsa
+        return self.gram[shown[line], col]
+
+    def rgb(self):
+        img = self.image().astype(np.uint32)
+        r = ((img >> 11) & 0x1F) * 255 // 31
+        g = ((img >> 5) & 0x3F) * 255 // 63
+        b = (img & 0x1F) * 255 // 31
+        return np.dstack((r, g, b)).astype(np.uint8)
+
+    def save_ppm(self, path):
+        rgb = self.rgb()
+        with open(path, "wb") as f:
+            f.write(b"P6\n%d %d\n255\n" % (rgb.shape[1], rgb.shape[0]))
+            f.write(rgb.tobytes())
+
+    def save_png(self, path):
+        rgb = self.rgb()
+        h, w = rgb.shape[:2]
+        rows = b"".join(b"\x00" + rgb[y].tobytes() for y in range(h))
+
+        def chunk(tag, body):
+            return (struct.pack(">I", len(body)) + tag + body
+                    + struct.pack(">I", zlib.crc32(tag + body) & 0xFFFFFFFF))
+
+        with open(path, "wb") as f:
+            f.write(b"\x89PNG\r\n\x1a\n")
+            f.write(chunk(b"IHDR", struct.pack(">IIBBBBB", w, h, 8, 2, 0, 0, 0)))
+            f.write(chunk(b"IDAT", zlib.compress(rows)))
+            f.write(chunk(b"IEND", b""))
+
+    def save(self, path):
+        if path.endswith(".png"):
+            self.save_png(path)
+        else:
+            self.save_ppm(path)
+
+
+panel = Panel()
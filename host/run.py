@@ -0,0 +1,59 @@
+"""
+Run a device script or game entry point headlessly.
+
+    python -m host.run main.py --seconds 20 --script "300:A/80"
+    python -m host.run tetris:tetris_main --seconds 60 --screenshot out.ppm
+
+A ``module:function`` target is called with a fresh PicoGameBoy.
+"""
+import argparse
+import os
+import random
+import runpy
+import sys
+import time as _time
+
+import host
+from host import panel
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m host.run")
+    ap.add_argument("target", help="script path or module:function")
+    ap.add_argument("--seconds", type=float, default=30.0,
+                    help="virtual time budget")
+    ap.add_argument("--script", default="", help="button script")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--screenshot", help="write the final panel image (.png or .ppm)")
+    args = ap.parse_args(argv)
+
+    sys.path.insert(0, os.getcwd())
+    random.seed(args.seed)
+    clock = host.install(seconds=args.seconds, script=args.script)
+    start = _time.perf_counter()
+    reason = "finished"
+    try:
+        if ":" in args.target:
+            mod, fn = args.target.split(":")
+            entry = getattr(__import__(mod), fn)
+            if entry.__code__.co_argcount:
+                from PicoGameBoy import PicoGameBoy
+                entry(PicoGameBoy())
+            else:
+                entry()
+        else:
+            runpy.run_path(args.target, {"__builtins__": host.device_builtins},
+                           run_name="__main__")
+    except host.Timeout:
+        reason = "time budget reached"
+    wall = _time.perf_counter() - start
+    virt = clock.now_us / 1e6
+    print("%s: %.2f s virtual in %.2f s wall (x%.1f), %d RAM writes, %d pixel bytes"
+          % (reason, virt, wall, virt / wall if wall else 0.0,
+             panel.ram_writes, panel.pixel_bytes))
+    if args.screenshot:
+        panel.save(args.screenshot)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+# Tests of the device modules, run on the host stand-ins:
+#
+#   python3 -m pytest host/tests
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import host  # noqa: E402
+
+host.install()
@@ -0,0 +1,74 @@
+# AssetPack files written by write_pack() and read back by the games
+
+import os
+import struct
+
+import pytest
+
+import host
+
+from AssetPack import AssetPack, write_pack, PCM8
+
+RGB565 = 1
+GS8 = 6
+
+
+def make_pack(tmp_path):
+    path = str(tmp_path / 'test.pgba')
+    sprite = bytes(range(2 * 4 * 3))
+    indexed = bytes([0, 1, 2, 1, 0, 1, 2, 1, 0])
+    sound = bytes([128, 200, 56, 128])
+    write_pack(path, [
+        ('t_rgb', 4, 3, RGB565, sprite, None),
+        ('t_gs8', 3, 3, GS8, indexed, [0x0000, 0xFFFF, 0x1F00], 0),
+        ('t_sound', 8000, 1, PCM8, sound, None),
+    ])
+    return path, sprite, indexed, sound
+
+
+def test_round_trip(tmp_path):
+    path, sprite, indexed, sound = make_pack(tmp_path)
+    with AssetPack(path) as pack:
+        assert sorted(pack.names()) == ['t_gs8', 't_rgb', 't_sound']
+        assert pack.info('t_rgb') == (4, 3, RGB565, len(sprite))
+        assert bytes(pack.read('t_rgb')) == sprite
+        assert pack.palette('t_rgb') is None
+        assert pack.key('t_rgb') == -1
+        assert bytes(pack.read('t_gs8')) == indexed
+        assert pack.palette('t_gs8') == [0x0000, 0xFFFF, 0x1F00]
+        assert pack.key('t_gs8') == 0
+        assert pack.info('t_sound') == (8000, 1, PCM8, 4)
+        assert bytes(pack.read('t_sound')) == sound
+
+
+def test_read_into_buffer(tmp_path):
+    path, sprite, _, _ = make_pack(tmp_path)
+    buf = bytearray(64)
+    with AssetPack(path) as pack:
+        assert pack.read('t_rgb', buf) is buf
+        assert bytes(buf[:len(sprite)]) == sprite
+        with pytest.raises(ValueError):
+            pack.read('t_rgb', bytearray(4))
+
+
+def test_bad_files(tmp_path):
+    path = str(tmp_path / 'bad.pgba')
+    with open(path, 'wb') as f:
+        f.write(struct.pack('<4sHH', b'NOPE', 1, 0))
+    with pytest.raises(ValueError):
+        AssetPack(path)
+    with open(path, 'wb') as f:
+        f.write(struct.pack('<4sHH', b'PGBA', 99, 0))
+    with pytest.raises(ValueError):
+        AssetPack(path)
+    with pytest.raises(ValueError):
+        write_pack(path, [('a_name_longer_than_16', 1, 1, RGB565, b'\0\0', None)])
+
+
+def test_game_packs():
+    # The packs shipped with the games open and hold what they load
+    with AssetPack(os.path.join(host.ROOT, 'tetris.pgba')) as pack:
+        for name in ('wall', 'bottom', 'corner', 'left', 'right', 'top'):
+            w, h, _, size = pack.info('tetris_' + name)
+            assert (w, h) == (12, 12)
+            assert len(pack.read('tetris_' + name)) == size
@@ -0,0 +1,164 @@
+# Chimera: what show() sends after each kind of drawing, indexed pixels
+# and the core 1 frame pipeline
+
+from array import array
+
+import utime
+
+import host
+from Chimera import Chimera
+from host.panel import panel
+
+
+def screen():
+    fb = Chimera()
+    fb.show(full=True)
+    return fb
+
+
+def sent(fb, **kw):
+    # Pixel bytes one show() sends to the panel
+    before = panel.pixel_bytes
+    fb.show(**kw)
+    return panel.pixel_bytes - before
+
+
+def test_nothing_drawn_sends_nothing():
+    fb = screen()
+    assert sent(fb) == 0
+
+
+def test_show_sends_the_damage():
+    fb = screen()
+    fb.fill_rect(10, 20, 30, 40, 0xFFFF)
+    fb.fill_rect(200, 100, 8, 8, 0xFFFF)
+    assert sent(fb) == (30 * 40 + 8 * 8) * 2
+    assert fb._dirty == []
+
+
+def test_touching_rectangles_grow_one():
+    fb = screen()
+    fb.fill_rect(10, 10, 10, 10, 1)
+    fb.fill_rect(20, 10, 10, 10, 1)  # Touches the first on its right
+    fb.fill_rect(15, 15, 2, 2, 1)  # Inside
+    assert fb._dirty == [[10, 10, 30, 20]]
+    fb.fill_rect(100, 100, 5, 5, 1)
+    assert len(fb._dirty) == 2
+
+
+def test_offscreen_and_clipped():
+    fb = screen()
+    fb.fill_rect(-50, -50, 10, 10, 1)
+    fb.fill_rect(400, 10, 10, 10, 1)
+    assert fb._dirty == []
+    fb.fill_rect(-5, 230, 20, 20, 1)
+    assert fb._dirty == [[0, 230, 15, 240]]
+
+
+def test_merge_keeps_the_count():
+    fb = screen()
+    for i in range(fb.MAX_DIRTY + 5):
+        fb.pixel(7 * i, 3 * i, 1)
+    assert len(fb._dirty) <= fb.MAX_DIRTY
+    # Every pixel drawn is still covered
+    for i in range(fb.MAX_DIRTY + 5):
+        x, y = 7 * i, 3 * i
+        assert any(r[0] <= x < r[2] and r[1] <= y < r[3] for r in fb._dirty)
+
+
+def test_large_damage_sends_the_frame():
+    fb = screen()
+    fb.fill_rect(0, 0, 300, 200, 1)
+    assert sent(fb) == fb.width * fb.height * 2
+
+
+def test_poly_damages_its_box():
+    fb = screen()
+    fb.poly(100, 50, array('h', [0, 0, 30, 10, 5, 40]), 0xFFFF, True)
+    assert fb._dirty == [[100, 50, 131, 91]]
+
+
+def test_render_leaves_the_frame_damage_alone():
+    fb = screen()
+    fb.fill_rect(0, 0, 5, 5, 1)
+    fb.render(lambda f: f.fill_rect(10, 10, 20, 20, 0xFFFF))
+    assert fb._dirty == [[0, 0, 5, 5]]
+
+
+def test_get_pixel_returns_colors_in_every_bpp():
+    red = Chimera.color(255, 0, 0)
+    blue = Chimera.color(0, 0, 255)
+    for bpp in (16, 8, 4):
+        fb = Chimera(bpp=bpp)
+        c = fb.palette_index(red) if bpp != 16 else red
+        fb.fill_rect(5, 5, 3, 3, c)
+        assert fb.get_pixel(6, 6) == red
+        assert fb.get_pixel(0, 0) == 0
+        if bpp != 16:
+            fb.set_palette(c, blue)  # Follows palette changes
+            assert fb.get_pixel(6, 6) == blue
+
+
+def test_strips_skip_damage_tracking():
+    fb = screen()
+    calls = []
+    damage = fb.damage
+    fb.damage = lambda *a: calls.append(a) or damage(*a)
+
+    def draw(f):
+        f.fill_rect(10, 10, 20, 20, 0xFFFF)
+        f.line(0, 0, 50, 50, 1)
+        f.text('hi', 4, 4, 1)
+        f.poly(0, 0, array('h', [0, 0, 9, 0, 9, 9]), 1)
+        f.blit((bytearray(8), 2, 2, 1), 0, 0)
+
+    fb.render(draw)
+    fb.refresh(0, 0, 40, 40, draw)
+    assert calls == []
+    assert fb._offscreen is False
+    fb.fill_rect(0, 0, 5, 5, 1)
+    assert calls == [(0, 0, 5, 5)]
+    del fb.damage
+
+
+def test_pipeline_swaps_and_presents_on_core_1():
+    fb = screen()
+    assert fb.start_pipeline()
+    try:
+        a, b = fb._buffers
+        assert fb.buffer is a
+        red = Chimera.color(255, 0, 0)
+        fb.fill_rect(0, 0, fb.width, 100, red)
+        before = panel.pixel_bytes
+        t = utime.ticks_us()
+        fb.show()  # swap()
+        queued = utime.ticks_diff(utime.ticks_us(), t)
+        # Drawing goes on in the other buffer, brought up to date
+        assert fb.buffer is b
+        assert bytes(b) == bytes(a)
+        fb.fill_rect(0, 100, 10, 10, 0xFFFF)
+        fb.wait()
+        # Core 1 sent the first frame while core 0 copied and drew
+        sent = fb.width * 100 * 2
+        assert panel.pixel_bytes - before == sent
+        assert queued < sent * 8 // 62  # Less than the transfer at 62.5 MHz
+        assert panel.image()[99, fb.width - 1] == 0xF800
+        assert panel.image()[100, 0] != 0xFFFF  # Not shown yet
+        fb.show()
+        fb.wait()
+        assert fb.buffer is a
+        assert panel.image()[100, 0] == 0xFFFF
+        assert bytes(a) == bytes(b)
+    finally:
+        fb.stop_pipeline()
+    assert not fb.pipelined and fb._buffers is None
+
+
+def test_pipeline_needs_the_heap():
+    fb = screen()
+    host.set_mem_free(fb.width * fb.height * 2)
+    try:
+        assert not fb.start_pipeline()
+    finally:
+        host.set_mem_free(host.HEAP_SIZE)
+    assert not fb.pipelined
@@ -0,0 +1,96 @@
+# Interrupt queue of PicoGameBoy.start_events()/events(): bounce, short
+# taps, overflow and ring wrap
+
+import pytest
+import utime
+
+from host import machine, BUTTONS
+from PicoGameBoy import PicoGameBoy
+
+
+@pytest.fixture
+def pgb():
+    for pin in BUTTONS.values():
+        machine.set_level(pin, 1)
+    g = PicoGameBoy()
+    g.start_events(8)
+    yield g
+    g.stop_events()
+    for pin in BUTTONS.values():
+        machine.set_level(pin, 1)
+
+
+def hold(name, down=True):
+    machine.set_level(BUTTONS[name], 0 if down else 1)
+
+
+def edges(pgb):
+    return [(b, e) for b, e, t in pgb.events()]
+
+
+def test_press_and_release(pgb):
+    hold('A')
+    utime.sleep_ms(50)
+    hold('A', False)
+    assert edges(pgb) == [(pgb.A, pgb.PRESS), (pgb.A, pgb.RELEASE)]
+    assert edges(pgb) == []
+
+
+def test_bounce_is_ignored(pgb):
+    hold('B')
+    utime.sleep_ms(2)
+    hold('B', False)  # Bounces up and down again within DEBOUNCE_MS
+    utime.sleep_ms(2)
+    hold('B')
+    utime.sleep_ms(50)
+    assert edges(pgb) == [(pgb.B, pgb.PRESS)]
+    hold('B', False)
+    utime.sleep_ms(50)
+    assert edges(pgb) == [(pgb.B, pgb.RELEASE)]
+
+
+def test_short_tap_is_not_stuck(pgb):
+    hold('LEFT')
+    utime.sleep_ms(5)
+    hold('LEFT', False)  # Released within DEBOUNCE_MS, no edge after it
+    assert edges(pgb) == [(pgb.LEFT, pgb.PRESS)]
+    utime.sleep_ms(pgb.DEBOUNCE_MS)
+    # Once the pin has settled, the dropped release is sent
+    assert edges(pgb) == [(pgb.LEFT, pgb.RELEASE)]
+    assert edges(pgb) == []
+
+
+def test_overflow_counts_dropped(pgb):
+    # A ring of 8 holds 7 edges
+    for i in range(5):
+        hold('UP')
+        utime.sleep_ms(30)
+        hold('UP', False)
+        utime.sleep_ms(30)
+    assert pgb.dropped_events() == 3
+    # The 7 queued edges end on a press; the pin is up, so the missing
+    # release is added
+    assert edges(pgb) == [(pgb.UP, pgb.PRESS), (pgb.UP, pgb.RELEASE)] * 4
+    assert edges(pgb) == []
+
+
+def test_ring_wraps(pgb):
+    seen = []
+    for i in range(6):
+        hold('RIGHT')
+        utime.sleep_ms(30)
+        hold('RIGHT', False)
+        utime.sleep_ms(30)
+        seen += edges(pgb)
+    assert seen == [(pgb.RIGHT, pgb.PRESS), (pgb.RIGHT, pgb.RELEASE)] * 6
+    assert pgb.dropped_events() == 0
+
+
+def test_event_times(pgb):
+    t0 = utime.ticks_us()
+    hold('A')
+    utime.sleep_ms(40)
+    hold('A', False)
+    (_, _, t1), (_, _, t2) = pgb.events()
+    assert 0 <= utime.ticks_diff(t1, t0) < 1000
+    assert 40000 <= utime.ticks_diff(t2, t1) < 41000
@@ -0,0 +1,85 @@
+# Hashlife against a set of live cells stepped one generation at a time
+
+import random
+
+from Hashlife import Hashlife, parse_rle
+
+ACORN = ('x = 7, y = 3, rule = B3/S23', 'bo5b$3bo3b$2o2b3o!')
+
+
+def reference(cells, n):
+    for _ in range(n):
+        counts = {}
+        for x, y in cells:
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    if dx or dy:
+                        k = (x + dx, y + dy)
+                        counts[k] = counts.get(k, 0) + 1
+        cells = {k for k, c in counts.items() if c == 3 or (c == 2 and k in cells)}
+    return cells
+
+
+def live(life, cells, margin=40):
+    xs = [x for x, _ in cells] or [0]
+    ys = [y for _, y in cells] or [0]
+    return {(x, y) for x in range(min(xs) - margin, max(xs) + margin)
+            for y in range(min(ys) - margin, max(ys) + margin) if life.get(x, y)}
+
+
+def random_cells(seed, size=12, percent=40):
+    rnd = random.Random(seed)
+    return {(x - size // 2, y - size // 2) for x in range(size) for y in range(size)
+            if rnd.randrange(100) < percent}
+
+
+def test_steps_match_reference():
+    for seed in range(4):
+        cells = random_cells(seed)
+        life = Hashlife(max_nodes=1 << 16)
+        life.load(cells)
+        total = 0
+        for n in (1, 2, 3, 8, 13):
+            life.step(n)
+            total += n
+            cells = reference(cells, n)
+            assert life.generation == total
+            assert life.population() == len(cells)
+            assert live(life, cells) == cells
+
+
+def test_small_cache_collects():
+    # A cache far too small for the pattern is collected on the way
+    cells = random_cells(11)
+    life = Hashlife(max_nodes=200)
+    life.load(cells)
+    life.step(32)
+    assert live(life, reference(cells, 32)) == reference(cells, 32)
+
+
+def test_set_and_get():
+    life = Hashlife(max_nodes=1 << 12)
+    life.set(1000, -1000)
+    life.set(-3, 4)
+    assert life.get(1000, -1000) == 1 and life.get(-3, 4) == 1
+    assert life.population() == 2
+    life.set(-3, 4, False)
+    assert life.get(-3, 4) == 0 and life.population() == 1
+
+
+def test_acorn():
+    width, height, cells = parse_rle(ACORN)
+    assert (width, height, len(cells)) == (7, 3, 7)
+    life = Hashlife()
+    life.load(cells)
+    life.step(5206)
+    assert life.population() == 633
+
+
+def test_rle_rule():
+    try:
+        parse_rle(['x = 1, y = 1, rule = B36/S23', 'o!'])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('HighLife accepted as Life')
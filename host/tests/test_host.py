@@ -0,0 +1,18 @@
+# The host backend leaves CPython's modules alone
+
+import gc
+
+import host
+import Chimera
+
+
+def test_device_modules_get_the_gc_shim():
+    assert Chimera.gc is host.gc
+    assert not hasattr(gc, 'mem_free')
+    host.set_mem_free(1000)
+    try:
+        assert Chimera.gc.mem_free() == 1000
+        assert Chimera.gc.mem_alloc() == host.HEAP_SIZE - 1000
+    finally:
+        host.set_mem_free(host.HEAP_SIZE)
+    Chimera.gc.collect()  # CPython's own
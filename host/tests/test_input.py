@@ -0,0 +1,75 @@
+# Button snapshots of PicoGameBoy.update_input(): edges and debouncing
+
+import pytest
+import utime
+
+from host import machine, BUTTONS
+from host.clock import clock
+from PicoGameBoy import PicoGameBoy
+
+
+@pytest.fixture
+def pgb():
+    for pin in BUTTONS.values():
+        machine.set_level(pin, 1)
+    g = PicoGameBoy()
+    g.update_input()
+    utime.sleep_ms(100)
+    yield g
+    for pin in BUTTONS.values():
+        machine.set_level(pin, 1)
+
+
+def hold(name, down=True):
+    machine.set_level(BUTTONS[name], 0 if down else 1)
+
+
+def test_edges(pgb):
+    hold('A')
+    hold('LEFT')
+    assert pgb.update_input() == pgb.A | pgb.LEFT
+    assert pgb.pressed(pgb.A) and pgb.pressed(pgb.LEFT) and not pgb.pressed(pgb.B)
+    assert pgb.just_pressed() == pgb.A | pgb.LEFT
+    utime.sleep_ms(50)
+    pgb.update_input()
+    assert pgb.just_pressed() == 0
+    assert pgb.pressed() == pgb.A | pgb.LEFT
+    hold('A', False)
+    utime.sleep_ms(50)
+    pgb.update_input()
+    assert pgb.just_released() == pgb.A
+    assert pgb.pressed() == pgb.LEFT
+
+
+def test_bounce_is_ignored(pgb):
+    hold('B')
+    pgb.update_input()
+    utime.sleep_ms(5)
+    hold('B', False)  # Bounces up within DEBOUNCE_MS
+    assert pgb.update_input() == pgb.B
+    utime.sleep_ms(pgb.DEBOUNCE_MS)
+    assert pgb.update_input() == 0
+    assert pgb.just_released(pgb.B)
+
+
+def test_snapshot_holds_until_next_update(pgb):
+    hold('DOWN')
+    pgb.update_input()
+    hold('DOWN', False)
+    utime.sleep_ms(50)
+    # Pin changes show only at the next update_input()
+    assert pgb.pressed(pgb.DOWN)
+    pgb.update_input()
+    assert not pgb.pressed(pgb.DOWN)
+
+
+def test_first_press_near_the_ticks_wrap():
+    # ticks_ms() half a period away from 0: a button that never changed
+    # must not look like it changed within DEBOUNCE_MS
+    clock.advance(((1 << 29) + 5 - utime.ticks_ms() % (1 << 30)) % (1 << 30) * 1000)
+    for pin in BUTTONS.values():
+        machine.set_level(pin, 1)
+    g = PicoGameBoy()
+    hold('A')
+    assert g.update_input() == g.A
+    hold('A', False)
@@ -0,0 +1,92 @@
+# Change tracking of Life: changed[] after step() and edits, and the
+# GameOfLife drawing of only those changes
+
+import random
+
+from GameOfLife import CELL_SIZE, draw_board, draw_changes
+from Life import Life
+from PicoGameBoy import PicoGameBoy
+from test_life_engine import reference
+
+
+def check_run(w, h, wrap, seed, steps=30):
+    random.seed(seed)
+    life = Life(w, h, wrap)
+    life.randomize(35)
+    for _ in range(steps):
+        before = life.rows[:]
+        expected = reference(before, w, h, wrap)
+        life.step()
+        assert life.rows == expected
+        assert life.changed == [a ^ b for a, b in zip(before, expected)]
+
+
+def test_changed_bounded():
+    for seed in range(5):
+        check_run(23, 17, False, seed)
+
+
+def test_changed_wrap():
+    for seed in range(5):
+        check_run(23, 17, True, seed)
+
+
+def test_edit_between_steps():
+    # set() and load() must wake the rows step() would skip as stable
+    random.seed(7)
+    w, h = 20, 12
+    life = Life(w, h)
+    for _ in range(40):
+        life.step()  # Empty and settled
+    life.set(5, 5)
+    life.set(6, 5)
+    life.set(7, 5)  # A blinker
+    expected = reference(life.rows, w, h, False)
+    life.step()
+    assert life.rows == expected
+    rows = [random.getrandbits(w) for _ in range(h)]
+    life.load(rows)
+    life.step()
+    assert life.rows == reference(rows, w, h, False)
+
+
+def test_draw_changes_paints_and_damages_only_changes():
+    pgb = PicoGameBoy()
+    board = Life(pgb.width // CELL_SIZE, pgb.height // CELL_SIZE)
+    for x, y in ((4, 6), (5, 6), (6, 6),  # Blinkers in two bands of rows
+                 (20, 20), (20, 21), (20, 22),
+                 (12, 12), (13, 12), (12, 13), (13, 13)):  # A block
+        board.set(x, y)
+    draw_board(pgb, board)
+    pgb.show(full=True)
+    board.step()
+
+    filled = set()
+    shown = []
+    fill_rect = pgb.fill_rect
+    show = pgb.show
+
+    def spy_fill(x, y, w, h, c):
+        for i in range(x // CELL_SIZE, (x + w) // CELL_SIZE):
+            filled.add((i, y // CELL_SIZE))
+        fill_rect(x, y, w, h, c)
+
+    def spy_show(*args, **kw):
+        shown.append([r[:] for r in pgb._dirty])
+        show(*args, **kw)
+
+    pgb.fill_rect = spy_fill
+    pgb.show = spy_show
+    draw_changes(pgb, board)
+    del pgb.fill_rect, pgb.show
+
+    changed = {(x, y) for y in range(board.height) for x in range(board.width)
+               if board.changed[y] >> x & 1}
+    assert filled == changed
+    # One show() per band, its damage inside the changed cells of the band
+    c = CELL_SIZE
+    assert shown == [[[4 * c, 5 * c, 7 * c, 8 * c]], [[19 * c, 20 * c, 22 * c, 23 * c]]]
+    # The screen is the same as a full redraw
+    painted = bytes(pgb.buffer)
+    draw_board(pgb, board)
+    assert bytes(pgb.buffer) == painted
@@ -0,0 +1,61 @@
+# Life.step() against a cell by cell reference
+
+import random
+
+from Life import Life
+
+
+def reference(rows, w, h, wrap):
+    # The next generation, counting the 8 neighbours of every cell
+    new = []
+    for y in range(h):
+        row = 0
+        for x in range(w):
+            n = 0
+            for dy in (-1, 0, 1):
+                for dx in (-1, 0, 1):
+                    if not (dx or dy):
+                        continue
+                    xx = x + dx
+                    yy = y + dy
+                    if wrap:
+                        xx %= w
+                        yy %= h
+                    elif not (0 <= xx < w and 0 <= yy < h):
+                        continue
+                    n += rows[yy] >> xx & 1
+            if n == 3 or (n == 2 and rows[y] >> x & 1):
+                row |= 1 << x
+        new.append(row)
+    return new
+
+
+def check_run(w, h, wrap, seed, steps=30):
+    random.seed(seed)
+    life = Life(w, h, wrap)
+    life.randomize(35)
+    for _ in range(steps):
+        expected = reference(life.rows, w, h, wrap)
+        life.step()
+        assert life.rows == expected
+
+
+def test_step_bounded():
+    for seed in range(5):
+        check_run(23, 17, False, seed)
+
+
+def test_step_wrap():
+    for seed in range(5):
+        check_run(23, 17, True, seed)
+
+
+def test_population_and_clear():
+    life = Life(10, 10)
+    for x, y in ((1, 1), (2, 1), (3, 1), (9, 9)):
+        life.set(x, y)
+    assert life.population() == 4
+    assert life.get(2, 1) == 1 and life.get(2, 2) == 0
+    life.clear()
+    assert life.population() == 0
+    assert life.generation == 0
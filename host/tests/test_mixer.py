@@ -0,0 +1,85 @@
+# Command queue and music ring of Mixer, with core 1's side driven by hand
+
+import struct
+
+from Mixer import Mixer
+
+
+class Speaker:
+    def duty_u16(self, v):
+        pass
+
+
+class SmallMixer(Mixer):
+    # Small enough for the positions to wrap quickly
+    RING = 64
+    QUEUE = 4
+
+    def __init__(self, pwm):
+        super().__init__(pwm)
+        self.applied = []
+
+    def _apply(self, *cmd):
+        self.applied.append(cmd)
+        return super()._apply(*cmd)
+
+
+def wav(data, rate=8000):
+    fmt = struct.pack('<HHIIHH', 1, 1, rate, rate, 1, 8)
+    body = (b'WAVE' + b'fmt ' + struct.pack('<I', len(fmt)) + fmt
+            + b'data' + struct.pack('<I', len(data)) + bytes(data))
+    return b'RIFF' + struct.pack('<I', len(body)) + body
+
+
+def test_command_queue_wraps_in_order():
+    m = SmallMixer(Speaker())
+    sent = []
+    for batch in range(5):
+        # QUEUE - 1 commands fill the queue
+        for i in range(m.QUEUE - 1):
+            level = batch * 10 + i
+            m.volume(m.SFX1, level / 256)
+            sent.append((4, m.SFX1, level, 0, 0))
+        assert m._command()
+        assert m._queue_pos[0] == m._queue_pos[1]
+    assert m.applied == sent
+    assert m._vol[m.SFX1] == sent[-1][2]
+
+
+def test_commands_set_channels():
+    m = SmallMixer(Speaker())
+    m.tone(m.SFX1, 1000, ms=10, volume=0.5)
+    m.stop_channel(m.SFX2)
+    m._command()
+    assert m._kind[m.SFX1] == 2  # Square wave
+    assert m._left[m.SFX1] == 80
+    assert m._vol[m.SFX1] == 128
+    assert m._kind[m.SFX2] == 0
+    m._send(6, 0)  # Quit
+    m.tone(m.SFX2, 500)
+    assert not m._command()
+    assert m._queue_pos[1] != m._queue_pos[0]  # The tone waits after the quit
+
+
+def test_music_ring_wraps(tmp_path):
+    data = bytes((i * 7) & 0xFF for i in range(300))
+    path = tmp_path / 'music.wav'
+    path.write_bytes(wav(data))
+    m = SmallMixer(Speaker())
+    m.play_music(str(path))
+    assert m.music_playing()
+    m._command()  # Core 1 starts the new music
+    out = bytearray(m.BLOCK)
+    played = bytearray()
+    read_out = False
+    while m.music_playing():
+        m.pump()
+        if m._file is None:
+            read_out = True  # The file is read but the ring is not played
+        r = m._ring_pos[1]
+        m._mix(out)
+        # Full volume music alone comes out unchanged
+        played += out[:(m._ring_pos[1] - r) % m.RING]
+    assert read_out
+    assert played == data
+    assert m._ring_pos[0] == 300 % m.RING
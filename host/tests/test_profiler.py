@@ -0,0 +1,71 @@
+# Profiler attached to a PicoGameBoy: section times, SPI bytes and p95
+
+import utime
+
+from PicoGameBoy import PicoGameBoy
+from Profiler import Profiler, _CountingSPI
+
+
+def test_attach_times_methods_and_counts_spi():
+    pgb = PicoGameBoy()
+    pgb.show(full=True)
+    prof = Profiler(window=8)
+    prof.attach(pgb)
+    assert isinstance(pgb.spi, _CountingSPI)
+    bus = pgb.spi.spi
+    prof.frame()
+    sent = []
+    for k in range(8):
+        before = bus.bytes_written
+        pgb.fill_rect(0, 0, 40, 10 * (k + 1), 0xFFFF)
+        pgb.show()
+        sent.append(bus.bytes_written - before)
+        prof.frame()
+    # Every byte on the bus is counted, frame by frame
+    spi = prof.stats('spi')
+    assert spi == (min(sent), sum(sent) // 8, max(sent), sorted(sent)[7])
+    assert spi[0] >= 40 * 10 * 2
+    # show() waits on the bus, fill_rect() does not
+    show = prof.stats('show')
+    assert show[0] > 0 and show[2] > show[0]
+    frame = prof.stats('frame')
+    assert frame[0] >= show[0] and frame[2] >= show[2]
+    assert prof.stats('rect') == (0, 0, 0, 0)
+    prof.detach()
+    assert not isinstance(pgb.spi, _CountingSPI)
+    assert 'show' not in pgb.__dict__
+
+
+def test_sections_and_p95():
+    prof = Profiler(window=20)
+    prof.frame()
+    for ms in range(1, 21):
+        prof.begin('logic')
+        utime.sleep_ms(ms)
+        prof.end('logic')
+        prof.frame()
+    lo, avg, hi, p95 = prof.stats('logic')
+    assert lo // 1000 == 1 and hi // 1000 == 20
+    assert avg // 100 == 105  # 10.5 ms
+    assert p95 // 1000 == 19  # 19 of the 20 frames take at most 19 ms
+    # Only the last `window` frames count
+    for _ in range(20):
+        prof.begin('logic')
+        utime.sleep_ms(2)
+        prof.end('logic')
+        prof.frame()
+    assert prof.stats('logic')[2] // 1000 == 2
+
+
+def test_disabled_does_nothing():
+    pgb = PicoGameBoy()
+    prof = Profiler(enabled=False)
+    prof.attach(pgb)
+    assert not isinstance(pgb.spi, _CountingSPI)
+    prof.begin('logic')
+    prof.end('logic')
+    prof.frame()
+    assert prof.stats('frame') is None
+    prof.enable()
+    assert isinstance(pgb.spi, _CountingSPI)
+    prof.detach()
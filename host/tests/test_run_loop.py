@@ -0,0 +1,73 @@
+# Fixed-step game loop of PicoGameBoy.run_loop(): update pacing, frame
+# cap, catch-up after slow frames and the exit on True
+
+import utime
+
+from PicoGameBoy import PicoGameBoy
+
+
+def run(pgb, seconds, ups=30, fps=0):
+    ups_log = []
+    frames = []
+    end = utime.ticks_add(utime.ticks_us(), int(seconds * 1000000))
+
+    def update():
+        ups_log.append(utime.ticks_us())
+        return utime.ticks_diff(utime.ticks_us(), end) >= 0
+
+    def render():
+        frames.append(utime.ticks_us())
+
+    pgb.run_loop(update, render, ups, fps)
+    return ups_log, frames
+
+
+def test_ups_pacing():
+    ups_log, frames = run(PicoGameBoy(), 1, ups=50)
+    assert 50 <= len(ups_log) <= 52
+    steps = {utime.ticks_diff(b, a) // 1000 for a, b in zip(ups_log, ups_log[1:])}
+    assert steps <= {19, 20, 21}
+    assert len(frames) == len(ups_log) - 1
+
+
+def test_fps_cap():
+    ups_log, frames = run(PicoGameBoy(), 1, ups=60, fps=20)
+    assert 60 <= len(ups_log) <= 62
+    assert 19 <= len(frames) <= 21
+    gaps = [utime.ticks_diff(b, a) for a, b in zip(frames, frames[1:])]
+    assert min(gaps) >= 50000 - 1000
+
+
+def test_catch_up_is_bounded():
+    # A 200 ms frame at 100 ups leaves 20 steps due, but only max_updates
+    # of them run, then the loop waits a full step again
+    pgb = PicoGameBoy()
+    ups_log = []
+    slow = [True]
+
+    def update():
+        ups_log.append(utime.ticks_us())
+        return len(ups_log) == 12
+
+    def render():
+        if slow[0] and len(ups_log) == 2:
+            slow[0] = False
+            utime.sleep_ms(200)
+
+    pgb.run_loop(update, render, ups=100, max_updates=3)
+    gaps = [utime.ticks_diff(b, a) // 1000 for a, b in zip(ups_log, ups_log[1:])]
+    assert gaps[0] == 10
+    assert gaps[1] >= 200
+    assert gaps[2:4] == [0, 0]  # Catching up
+    assert all(9 <= g <= 11 for g in gaps[4:])
+
+
+def test_returns_on_true():
+    calls = []
+
+    def update():
+        calls.append(1)
+        return len(calls) == 4
+
+    PicoGameBoy().run_loop(update, lambda: None, ups=1000)
+    assert len(calls) == 4
@@ -0,0 +1,134 @@
+# Rules of TetrisCore: replays, line clears, game over and bot games
+
+from TetrisCore import (Field, TetrisCore as Core, check, play,
+                        GRID_ROWS, GRID_COLS, LINE_SCORE)
+
+
+def pieces(core, count):
+    out = [core.n]
+    for _ in range(count - 1):
+        core.n = core.next_n
+        core.next_n = core._random_piece()
+        out.append(core.n)
+    return out
+
+
+def test_seed_determinism():
+    assert pieces(Core(7), 50) == pieces(Core(7), 50)
+    assert pieces(Core(7), 50) != pieces(Core(8), 50)
+    a = play(3, max_pieces=40)
+    b = play(3, max_pieces=40)
+    assert (a.score, a.pieces, a.field.rows) == (b.score, b.pieces, b.field.rows)
+    assert [bytes(c) for c in a.field.colors] == [bytes(c) for c in b.field.colors]
+
+
+def test_multi_line_clear():
+    field = Field()
+    # Rows 17 to 19 full but for column 0; row 16 has one block in column 5
+    for i in (17, 18, 19):
+        for j in range(1, GRID_COLS):
+            field.set(j, i, 2)
+    field.set(5, 16, 3)
+    field.set(0, 16, 4)
+    # A vertical I in column 0 completes rows 17, 18 and 19 only
+    full = field.lock([0, 0, 0, 0], [15, 17, 18, 19], 1)
+    assert full == [17, 18, 19]
+    field.remove_lines(full)
+    assert field.rows[:18] == [0] * 18
+    assert field.rows[18] == 1  # Row 15
+    assert field.rows[19] == 1 | 1 << 5  # Row 16
+    assert field.colors[19][0] == 4 and field.colors[19][5] == 3
+    assert field.colors[18][0] == 1
+
+
+def test_core_scores_cleared_lines():
+    core = Core(1)
+    core.n = 0  # A vertical I in column 6
+    core._spawn()
+    assert core.x == [6] * 4
+    for i in range(GRID_ROWS - 4, GRID_ROWS):
+        for j in range(GRID_COLS):
+            if j != 6:
+                core.field.set(j, i, 2)
+    core.field.set(0, GRID_ROWS - 5, 3)
+    while not core.pieces:
+        core.step(core.DOWN, 50)
+    assert core.cleared == [16, 17, 18, 19]
+    assert core.lines == 4 and core.score == 4 * LINE_SCORE
+    assert core.field.rows == [0] * (GRID_ROWS - 1) + [1]
+    check(core)
+
+
+def test_spawn_collision_ends_the_game():
+    core = Core(1)
+    # Blocks everywhere under row 3 but in one column, out of the way of
+    # the falling tetromino: it lands at the top and the next one has no
+    # room
+    for i in range(2, GRID_ROWS):
+        for j in range(GRID_COLS):
+            if j != 0:
+                core.field.set(j, i, 1)
+    while not core.game_over:
+        core.step(core.DOWN, 50)
+    assert core.pieces == 1
+    steps = core.pieces
+    core.step(core.DOWN, 50)  # Nothing moves any more
+    assert core.pieces == steps and not core.fell
+
+
+def test_bot_game_stays_valid():
+    core = play(5, bot=True, max_pieces=60, step_ms=50)
+    assert core.pieces == 60 or core.game_over
+    assert core.lines > 0
+    check(core)
+
+
+def test_random_game_stays_valid():
+    core = play(5, bot=False, max_pieces=60, step_ms=50)
+    check(core)
+
+
+def test_collision_at_the_edges():
+    field = Field()
+    row = [5, 5, 5, 5]
+    assert not field.collision([0, 1, 2, 3], row)
+    assert not field.collision([6, 7, 8, 9], row)
+    assert field.collision([-1, 0, 1, 2], row)
+    assert field.collision([7, 8, 9, 10], row)
+    assert not field.collision([4, 4, 4, 4], [16, 17, 18, 19])
+    assert field.collision([4, 4, 4, 4], [17, 18, 19, 20])
+    field.set(4, 19, 1)
+    assert field.collision([4, 4, 4, 4], [16, 17, 18, 19])
+    assert not field.collision([3, 3, 3, 3], [16, 17, 18, 19])
+
+
+def test_collision_above_the_top():
+    # Blocks above the grid only collide with the walls
+    field = Field()
+    for j in range(GRID_COLS):
+        field.set(j, 0, 1)
+    assert not field.collision([4, 4, 4, 4], [-4, -3, -2, -1])
+    assert field.collision([4, 4, 4, 4], [-3, -2, -1, 0])
+    assert field.collision([-1, 0, 0, 0], [-4, -3, -2, -1])
+    assert field.collision([9, 10, 9, 9], [-4, -3, -2, -1])
+
+
+def test_remove_lines_keeps_colors_with_rows():
+    field = Field()
+    # Row i holds one block of type i + 1 in column i % GRID_COLS, rows 12
+    # and 15 are full
+    for i in range(GRID_ROWS):
+        field.set(i % GRID_COLS, i, i + 1)
+    for i in (12, 15):
+        for j in range(GRID_COLS):
+            field.set(j, i, 7)
+    field.remove_lines([12, 15])
+    assert field.rows[:2] == [0, 0]
+    assert bytes(field.colors[0]) == bytes(field.colors[1]) == bytes(GRID_COLS)
+    for i in range(2, GRID_ROWS):
+        for j in range(GRID_COLS):
+            assert (field.rows[i] >> j & 1) == (field.colors[i][j] != 0)
+    kept = [i for i in range(GRID_ROWS) if i not in (12, 15)]
+    assert [max(c) for c in field.colors[2:]] == [i + 1 for i in kept]
+    # The cleared rows' colors are reused for the new rows, not shared
+    assert len({id(c) for c in field.colors}) == GRID_ROWS
@@ -0,0 +1,106 @@
+# WAV parsing and double-buffered playback of WavPlayer
+
+import struct
+
+import pytest
+import utime
+
+from WavPlayer import WavPlayer, parse_wav
+
+
+class Speaker:
+    # PWM stand-in that keeps every duty cycle written
+    def __init__(self):
+        self.duty = []
+
+    def duty_u16(self, v):
+        self.duty.append(v)
+
+    def played(self):
+        return self.duty[1:]  # After the silence of play() stopping
+
+
+def wav(data, rate=8000, bits=8, channels=1, tag=1, before=()):
+    # WAV bytes with the chunks `before` (id, payload) between fmt and data
+    align = channels * bits // 8
+    fmt = struct.pack('<HHIIHH', tag, channels, rate, rate * align, align, bits)
+    body = b'WAVE' + b'fmt ' + struct.pack('<I', len(fmt)) + fmt
+    for name, payload in before:
+        body += name + struct.pack('<I', len(payload)) + payload + b'\0' * (len(payload) & 1)
+    body += b'data' + struct.pack('<I', len(data)) + bytes(data)
+    return b'RIFF' + struct.pack('<I', len(body)) + body
+
+
+def write(tmp_path, data, **kw):
+    path = tmp_path / 'sound.wav'
+    path.write_bytes(wav(data, **kw))
+    return str(path)
+
+
+def test_parse_plain(tmp_path):
+    with open(write(tmp_path, range(10)), 'rb') as f:
+        assert parse_wav(f) == (8000, 8, 1, 44, 10)
+
+
+def test_parse_skips_chunks_before_data(tmp_path):
+    path = write(tmp_path, range(10), before=[(b'LIST', b'INFOabcd')])
+    with open(path, 'rb') as f:
+        rate, bits, channels, offset, size = parse_wav(f)
+        f.seek(offset)
+        assert f.read(size) == bytes(range(10))
+    assert offset == 44 + 16
+
+
+def test_parse_pads_odd_chunks(tmp_path):
+    path = write(tmp_path, range(4), before=[(b'junk', b'abc')])
+    with open(path, 'rb') as f:
+        offset, size = parse_wav(f)[3:]
+        f.seek(offset)
+        assert f.read(size) == bytes(range(4))
+    assert offset == 44 + 12
+
+
+def test_parse_16_bit_stereo(tmp_path):
+    with open(write(tmp_path, bytes(8), rate=22050, bits=16, channels=2), 'rb') as f:
+        assert parse_wav(f) == (22050, 16, 2, 44, 8)
+
+
+def test_parse_rejects_non_pcm(tmp_path):
+    with open(write(tmp_path, bytes(8), bits=16, tag=3), 'rb') as f:
+        with pytest.raises(ValueError):
+            parse_wav(f)
+
+
+def test_buffers_hand_off_and_stop(tmp_path):
+    data = bytes(range(40))
+    speaker = Speaker()
+    player = WavPlayer(speaker, block=16)
+    player.play(write(tmp_path, data))
+    assert player.playing()
+    utime.sleep_ms(10)  # 80 ticks at 8 kHz
+    assert not player.playing()
+    assert player._file is None
+    assert speaker.played() == [v * 256 for v in data] + [0]
+
+
+def test_16_bit_stereo_plays_the_high_byte_of_the_left_channel(tmp_path):
+    # Frames of (left, right) little endian signed samples
+    frames = [(-32768, 1), (0, 2), (0x1234, 3), (32767, 4)]
+    data = b''.join(struct.pack('<hh', l, r) for l, r in frames)
+    speaker = Speaker()
+    player = WavPlayer(speaker, block=8)
+    player.play(write(tmp_path, data, bits=16, channels=2))
+    utime.sleep_ms(5)
+    assert speaker.played() == [0x00 * 256, 0x80 * 256, 0x92 * 256, 0xFF * 256, 0]
+
+
+def test_loop_restarts(tmp_path):
+    data = bytes(range(1, 11))
+    speaker = Speaker()
+    player = WavPlayer(speaker, block=4)
+    player.play(write(tmp_path, data), loop=True)
+    utime.sleep_us(25 * 125 + 60)
+    assert player.playing()
+    player.stop()
+    assert speaker.played()[:25] == [v * 256 for v in (data * 3)[:25]]
+    assert speaker.duty[-1] == 0
@@ -0,0 +1,44 @@
+"""
+Host stand-in for MicroPython's ``time``/``utime`` module, driven by the
+virtual clock. Anything not overridden here falls through to CPython's time.
+"""
+from time import *  # noqa: F401,F403
+from time import time as _wall  # noqa: F401
+from .clock import clock
+
+_PERIOD = 1 << 30
+
+
+def ticks_us():
+    clock.advance(1)
+    return clock.time_us() % _PERIOD
+
+
+def ticks_ms():
+    clock.advance(1)
+    return (clock.time_us() // 1000) % _PERIOD
+
+
+def ticks_cpu():
+    return ticks_us()
+
+
+def ticks_add(ticks, delta):
+    return (ticks + delta) % _PERIOD
+
+
+def ticks_diff(ticks1, ticks2):
+    half = _PERIOD // 2
+    return ((ticks1 - ticks2 + half) % _PERIOD) - half
+
+
+def sleep(seconds):
+    clock.advance(seconds * 1000000)
+
+
+def sleep_ms(ms):
+    clock.advance(ms * 1000)
+
+
+def sleep_us(us):
+    clock.advance(us)
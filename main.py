@@ -1,29 +1,70 @@
 from PicoGameBoy import PicoGameBoy
 import time
 import gc
-import Tetris
-import GameOfLife
-import FlapBird
+import sys
 
-menu_itens = ["Tetris", "GameOfLife", "FlapBird", "Exit"]
+# The games of the menu: (name, module, entry function, takes the
+# PicoGameBoy). A game is imported only when it is chosen, and every module
+# it brought in is dropped when it returns, so the heap holds one game at a
+# time and the menu starts without loading any of them.
+# A game that does not take the PicoGameBoy makes its own display: the
+# frame buffer of the menu is freed while it runs.
+GAMES = (
+    ("Tetris", "tetris", "tetris_main", True),
+    ("GameOfLife", "GameOfLife", "gameoflife_main", True),
+    # Frees the frame buffer for its node cache and takes it back
+    ("LifeExplorer", "LifeExplorer", "lifeexplorer_main", True),
+    ("FlapBird", "FlapBird", "FlapBird_main", False),
+)
+
+menu_itens = [game[0] for game in GAMES] + ["Exit"]
+
+def run_game(pgb, game):
+    name, module, entry, takes_pgb = game
+    loaded = set(sys.modules)
+    start = getattr(__import__(module), entry)
+    if takes_pgb:
+        start(pgb)
+    else:
+        # First, delete the buffer of the current program
+        pgb.reset_buffer()
+        start()
+        # Then, recreate the buffer for this program
+        pgb.create_buffer()
+    # Unload the game and the modules only it needed
+    start = None
+    for m in list(sys.modules):
+        if m not in loaded:
+            del sys.modules[m]
+    gc.collect()
+
+def draw_menu_item(pgb, items, i, selected):
+    # Only the line of the item is repainted, so show() sends just that strip
+    color = PicoGameBoy.color(255, 255, 255) if i == selected else PicoGameBoy.color(100, 100, 100)
+    pgb.fill_rect(10, 10 + i * 10, 8 * (len(items[i]) + 3), 8, PicoGameBoy.color(0, 0, 0))
+    pgb.text("-> " + items[i] if i == selected else "   " + items[i], 10, 10 + i * 10, color)
 
 def display_menu(pgb, items):
     selected = 0
+    pgb.fill(PicoGameBoy.color(0, 0, 0))
+    for i in range(len(items)):
+        draw_menu_item(pgb, items, i, selected)
+    drawn = selected
     while True:
-        pgb.fill(PicoGameBoy.color(0, 0, 0))
-        for i, item in enumerate(items):
-            color = PicoGameBoy.color(255, 255, 255) if i == selected else PicoGameBoy.color(100, 100, 100)
-            pgb.text("-> " + item if i == selected else "   " + item, 10, 10 + i * 10, color)
+        if drawn != selected:
+            draw_menu_item(pgb, items, drawn, selected)
+            draw_menu_item(pgb, items, selected, selected)
+            drawn = selected
         pgb.show()
 
-        if pgb.button_up():
+        # Move once per press; choose on release so the game does not
+        # start with A still held down
+        pgb.update_input()
+        if pgb.just_pressed(pgb.UP):
             selected = (selected - 1) % len(items)
-            time.sleep(0.2)  # Debounce
-        elif pgb.button_down():
+        elif pgb.just_pressed(pgb.DOWN):
             selected = (selected + 1) % len(items)
-            time.sleep(0.2)  # Debounce
-        elif pgb.button_A():
-            time.sleep(0.2)  # Debounce
+        elif pgb.just_released(pgb.A):
             return items[selected]
 def main():
     """
@@ -46,23 +87,11 @@ def main():
         gc.collect()
         selected_option = display_menu(pgb, menu_itens)
 
-        if selected_option == "Tetris":
-            # Example of a game that receives PGB as a parameter
-            Tetris.tetris_main(pgb)
-            
-        elif selected_option == "GameOfLife":
-            GameOfLife.gameoflife_main(pgb)
-            
-        elif selected_option == "FlapBird":
-            # Example of a game that does not receives PGB as a parameter
-            # First, delete the buffer of the current program
-            pgb.reset_buffer()
-            # Call the game program
-            FlapBird.FlapBird_main()
-            # Then, recreate the buffer for this program
-            pgb.create_buffer()
-            
-        elif selected_option == "Exit":
+        for game in GAMES:
+            if game[0] == selected_option:
+                run_game(pgb, game)
+
+        if selected_option == "Exit":
             pgb.fill(BLACK)
             pgb.center_text("Exiting...", WHITE)
             pgb.show()
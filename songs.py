@@ -1,15 +1,7 @@
-from micropython import const
-from PicoGameBoy import PicoGameBoy
-from framebuf import FrameBuffer
-import time
-from random import randint
-import _thread
-import gc
-import adaptation
-import tetris
+# songs.py
+# Background music of the games
+# The music plays on the PicoGameBoy mixer when start_audio() succeeded,
+# else from a timer on core 0, and loops until pgb.stop_sound()
 
 def tetris(pgb):
-    while True:
-        pgb.play_sound("tetris.wav", readbytes=1, sleep = True)
-        if (GAME_OVER == True):
-            break
\ No newline at end of file
+    pgb.play_sound("tetris.wav", loop=True)
@@ -1,114 +1,191 @@
 from micropython import const
 from PicoGameBoy import PicoGameBoy
+from AssetPack import AssetPack
 from framebuf import FrameBuffer
 import time
 from random import randint
-import _thread
+import songs
+from TetrisCore import TetrisCore, Field, GRID_ROWS, GRID_COLS, tetrominos
 
-song_state = True
-GAME_OVER = False
+BLOCK_SIZE = const(12) # Size of a single tetromino block in pixels
+GRID_OFFSET = const(5)
+
+# Game Boy Color Tetrominos colors
+tetrominos_colors =[PicoGameBoy.color(239,146,132),
+             PicoGameBoy.color(222,146,239),
+             PicoGameBoy.color(239,170,132),
+             PicoGameBoy.color(165,211,132),
+             PicoGameBoy.color(99,219,222),
+             PicoGameBoy.color(231,97,115),
+             PicoGameBoy.color(0,0,0)]
+
+# Color scheme
+BLACK = PicoGameBoy.color(0,0,0)
+WHITE = PicoGameBoy.color(255,255,255)
+GREEN = PicoGameBoy.color(95, 185, 116)
+GRID_BACKGROUND_COLOR = PicoGameBoy.color(255,211,132)
+BACKGROUND_COLOR = PicoGameBoy.color(99,154,132)
+BACKGROUND_COLOR2 = PicoGameBoy.color(57,89,41)
+TEXT_COLOR = BLACK
+TEXT_BACKGROUND_COLOR = WHITE
+
+HUD_X = (GRID_OFFSET+GRID_COLS+2)*BLOCK_SIZE+1  # Left of the HUD texts
+HUD_ROWS = (10, 13, 16)  # Rows of the SCORE, LEVEL and LINES boxes
+
+# States of the game loop
+PLAYING = const(0)
+CLEARING = const(1)  # Completed lines blinking
+GAME_OVER = const(2)  # Game over box on screen
+BLINK_MS = const(50)  # Duration of a white or black phase of the lines
+BLINKS = const(3)
+GAME_OVER_MS = const(3500)  # Back to the menu then, or at a button press
+GAME_OVER_OPEN_MS = const(250)  # The game over box opens ...
+GAME_OVER_BLINK_MS = const(500)  # ... then its text blinks
+
+def load_sprites(pgb):
+    # 12x12 pixel images, loaded from the asset pack:
+    # (WALL, BOTTOM, CORNER, LEFT, RIGHT, TOP)
+    with AssetPack("tetris.pgba") as pack:
+        return tuple(pgb.load_sprite(pack, "tetris_" + name) for name in
+                     ("wall", "bottom", "corner", "left", "right", "top"))
+
+
+def draw_background(pgb, sprites):
+    # the parts of the screen that never change: the checkered
+    # background, the walls, the boxes of the scores and the frame of the
+    # next tetromino box; drawn once, then only the grid and the changing
+    # texts are repainted
+    WALL, BOTTOM, CORNER, LEFT, RIGHT, TOP = sprites
+    pgb.fill(BACKGROUND_COLOR)
+    
+    for i in range(0,int(240/BLOCK_SIZE),2):
+        for j in range(0,int(324/BLOCK_SIZE),2):
+            pgb.fill_rect(j*BLOCK_SIZE,i*BLOCK_SIZE,BLOCK_SIZE,BLOCK_SIZE,BACKGROUND_COLOR2)
+            pgb.fill_rect((j+1)*BLOCK_SIZE,(i+1)*BLOCK_SIZE,BLOCK_SIZE,BLOCK_SIZE,BACKGROUND_COLOR2)
+            
+    pgb.fill_rect(GRID_OFFSET*BLOCK_SIZE,0,
+                  GRID_COLS*BLOCK_SIZE,GRID_ROWS*BLOCK_SIZE,
+                  GRID_BACKGROUND_COLOR)
+    
+    # add walls
+    for i in range(GRID_ROWS):
+        pgb.sprite(WALL,(GRID_OFFSET-1)*BLOCK_SIZE,i*BLOCK_SIZE)
+        pgb.sprite(WALL,(GRID_OFFSET+GRID_COLS)*BLOCK_SIZE,i*BLOCK_SIZE)
+    
+    # boxes of the texts (SCORE, LEVEL, LINES)
+    for row, label in zip(HUD_ROWS, ("SCORE", "LEVEL", "LINES")):
+        pgb.fill_rect((GRID_OFFSET+GRID_COLS+1)*BLOCK_SIZE+1,row*BLOCK_SIZE,
+                      BLOCK_SIZE*7,BLOCK_SIZE*2,
+                      TEXT_BACKGROUND_COLOR)
+        pgb.text(label,HUD_X,row*BLOCK_SIZE+1,TEXT_COLOR)
+    
+    # next tetromino box
+    pgb.fill_rect((GRID_OFFSET+GRID_COLS + 2)*BLOCK_SIZE,2*BLOCK_SIZE,
+                  BLOCK_SIZE*6 ,BLOCK_SIZE*7,TEXT_BACKGROUND_COLOR)
+    
+    pgb.sprite(CORNER,(GRID_OFFSET+GRID_COLS+2)*BLOCK_SIZE,2*BLOCK_SIZE) #upper left corner
+    pgb.sprite(TOP,(GRID_OFFSET+GRID_COLS+3)*BLOCK_SIZE,2*BLOCK_SIZE) #top border
+    pgb.sprite(TOP,(GRID_OFFSET+GRID_COLS+4)*BLOCK_SIZE,2*BLOCK_SIZE) #
+    pgb.sprite(TOP,(GRID_OFFSET+GRID_COLS+5)*BLOCK_SIZE,2*BLOCK_SIZE) #
+    pgb.sprite(TOP,(GRID_OFFSET+GRID_COLS+6)*BLOCK_SIZE,2*BLOCK_SIZE) #
+    pgb.sprite(CORNER,(GRID_OFFSET+GRID_COLS+7)*BLOCK_SIZE,2*BLOCK_SIZE) #upper right corner
+    
+    pgb.sprite(CORNER,(GRID_OFFSET+GRID_COLS+2)*BLOCK_SIZE,8*BLOCK_SIZE) #lower left corner
+    pgb.sprite(BOTTOM,(GRID_OFFSET+GRID_COLS+3)*BLOCK_SIZE,8*BLOCK_SIZE) #lower border
+    pgb.sprite(BOTTOM,(GRID_OFFSET+GRID_COLS+4)*BLOCK_SIZE,8*BLOCK_SIZE) #
+    pgb.sprite(BOTTOM,(GRID_OFFSET+GRID_COLS+5)*BLOCK_SIZE,8*BLOCK_SIZE) #
+    pgb.sprite(BOTTOM,(GRID_OFFSET+GRID_COLS+6)*BLOCK_SIZE,8*BLOCK_SIZE) #
+    pgb.sprite(CORNER,(GRID_OFFSET+GRID_COLS+7)*BLOCK_SIZE,8*BLOCK_SIZE) #lower right corner
+    
+    for k in range(3,8):
+        pgb.sprite(LEFT,(GRID_OFFSET+GRID_COLS+2)*BLOCK_SIZE,k*BLOCK_SIZE) #left border
+        pgb.sprite(RIGHT,(GRID_OFFSET+GRID_COLS+7)*BLOCK_SIZE,k*BLOCK_SIZE) #right border
+
+
+def draw_hud(pgb, lines, level, score):
+    # the values under SCORE, LEVEL and LINES
+    for row, value in zip(HUD_ROWS, (score, level, lines)):
+        pgb.fill_rect(HUD_X,(row+1)*BLOCK_SIZE+1,8*8,8,TEXT_BACKGROUND_COLOR)
+        pgb.text("%8s" % value,HUD_X,(row+1)*BLOCK_SIZE+1,TEXT_COLOR)
+
+
+def draw_next(pgb, next_n):
+    # the next tetromino, inside the frame of its box
+    pgb.fill_rect((GRID_OFFSET+GRID_COLS+3)*BLOCK_SIZE,3*BLOCK_SIZE,
+                  BLOCK_SIZE*4,BLOCK_SIZE*5,TEXT_BACKGROUND_COLOR)
+    for i in range(4):
+        draw_block(pgb,(GRID_OFFSET+GRID_COLS - 1)+tetrominos[next_n][i] % 2,
+                   3+int(tetrominos[next_n][i] / 2), next_n)
+
+
+def draw_block(pgb,j,i,n):
+    # draw a tetris block of type n at the ith row and jth column
+    # of the grid
+
+    x = (GRID_OFFSET+j)*BLOCK_SIZE
+    y = i*BLOCK_SIZE
+    
+    pgb.fill_rect(x,y,BLOCK_SIZE,BLOCK_SIZE,tetrominos_colors[n]) # main color
+    pgb.rect(x,y,BLOCK_SIZE,BLOCK_SIZE,BLACK) # black border
+    pgb.line(x+3,y+3,x+5,y+3,WHITE)
+    pgb.line(x+3,y+3,x+3,y+5,WHITE)
+
+
+def shown_field():
+    # a Field for draw_field() to remember what the grid on the screen
+    # holds; rows of -1 are not known and get repainted
+    shown = Field()
+    for i in range(GRID_ROWS):
+        shown.rows[i] = -1
+    return shown
+
+
+_row = bytearray(GRID_COLS)  # block types of a row with the falling tetromino
+
+def draw_field(pgb, field, shown, x=None, y=None, n=0):
+    # draw the blocks of the field and the falling tetromino (columns x,
+    # rows y, type n), repainting only the rows of the grid that differ
+    # from shown, which is then updated to match
+    for i in range(GRID_ROWS):
+        mask = field.rows[i]
+        colors = field.colors[i]
+        if x is not None and (i == y[0] or i == y[1] or i == y[2] or i == y[3]):
+            _row[:] = colors
+            for k in range(4):
+                if y[k] == i:
+                    mask |= 1 << x[k]
+                    _row[x[k]] = n
+            colors = _row
+        if mask == shown.rows[i] and colors == shown.colors[i]:
+            continue
+        shown.rows[i] = mask
+        shown.colors[i][:] = colors
+        pgb.fill_rect(GRID_OFFSET*BLOCK_SIZE,i*BLOCK_SIZE,
+                      GRID_COLS*BLOCK_SIZE,BLOCK_SIZE,
+                      GRID_BACKGROUND_COLOR)
+        for j in range(GRID_COLS):
+            if mask >> j & 1:
+                draw_block(pgb,j,i,colors[j])
 
-def song(pgb):
-    while song_state:
-        pgb.play_sound("tetris.wav", readbytes=1, sleep = True)
 
 def tetris_main(gameboy):
     # tetris.py by Vincent Mistler for YouMakeTech
     # Tetris game for the Raspberry Pi Pico Game Boy
+    # The rules are in TetrisCore; this is the screen, sound and buttons
 
-    BLOCK_SIZE = const(12) # Size of a single tetromino block in pixels
-    GRID_OFFSET = const(5)
-    GRID_ROWS  = const(20)
-    GRID_COLS  = const(10)
-    
-    global GAME_OVER
     pgb = gameboy
     
-    #th1 = _thread.start_new_thread(song, (pgb, ))
-
-    # image definitions 12x12 pixels
-    tetris_wall=bytearray(b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\xf7\x9e\xf7\x9e\xf7\x9emX\x00\x00\x00\x00\xf7\x9e\xf7\x9e\xf7\x9emX\x00\x00\x00\x00\xf7\x9e\xf7\x9e\xf7\x9emX\x00\x00\x00\x00\xf7\x9e\xf7\x9e\xf7\x9emX\x00\x00\x00\x00mXmXmX3\x91\x00\x00\x00\x00mXmXmX3\x91\x00\x00\x00\x00mX3\x913\x913\x91\x00\x00\x00\x00mX3\x913\x913\x91\x00\x00\x00\x00mX3\x913\x913\x91\x00\x00\x00\x00mX3\x913\x913\x91\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00mX\x00\x00\x00\x00\xf7\x9e\xf7\x9e\xf7\x9emX\x00\x00\x00\x00\xf7\x9e\xf7\x9e\xf7\x9emX\x00\x00\x00\x00\xf7\x9e\xf7\x9e\xf7\x9emX\x00\x00\x00\x00\xf7\x9e\xf7\x9e\xf7\x9e3\x91\x00\x00\x00\x00mXmXmX3\x91\x00\x00\x00\x00mXmXmX3\x91\x00\x00\x00\x00mX3\x913\x913\x91\x00\x00\x00\x00mX3\x913\x913\x91\x00\x00\x00\x00mX3\x913\x913\x91\x00\x00\x00\x00mX3\x913\x91')
-    bottom_border=bytearray(b'\xeeP\xf6\x90\xf6\x90\xf6\x90\xf6\x90\xf6\x90\xf6\x90\xf6\x90\xf6\x90\xf6\x90\xf6\x90\xeeP\xf6p\xfe\xb1\xfe\xb1\xfe\xb1\xfe\xb1\xfe\xb1\xfe\xb1\xfe\xb1\xfe\xb1\xfe\xb1\xfe\xb1\xf6p\xdd\x0f\xe5P\xe5P\xe5P\xe5P\xe5P\xe5P\xe5P\xe5P\xe5P\xe5P\xdd\x0fI\x84I\x84I\x84I\x84I\x84I\x84I\x84I\x84I\x84I\x84I\x84I\x84@\xc3H\xc4H\xc4H\xc4H\xc4H\xc4H\xc4H\xc4H\xc4H\xc4H\xc4@\xc3\xd3\r\xdb.\xdb.\xdb.\xdb.\xdb.\xdb.\xdb.\xdb.\xdb.\xdb.\xd3\r\xe4\xef\xed0\xed0\xed0\xed0\xed0\xed0\xed0\xed0\xed0\xed0\xe4\xef\xe5P\xf5p\xf5p\xf5p\xf5p\xf5p\xf5p\xf5p\xf5p\xf5p\xf5p\xe5P\xf6p\xfe\xb1\xfe\xb1\xfe\xb1\xfe\xb1\xfe\xb1\xfe\xb1\xfe\xb1\xfe\xb1\xfe\xb1\xfe\xb1\xf6p\xe5P\xf5p\xf5p\xf5p\xf5p\xf5p\xf5p\xf5p\xf5p\xf5p\xf5p\xe5P\xdc\xef\xe5\x0f\xe5\x0f\xe5\x0f\xe5\x0f\xe5\x0f\xe5\x0f\xe5\x0f\xe5\x0f\xe5\x0f\xe5\x0f\xdc\xefI\x84I\xa4I\xa4I\xa4I\xa4I\xa4I\xa4I\xa4I\xa4I\xa4I\xa4I\x84')
-    corner=bytearray(b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\x00\x00\x00\x00mX\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xffmX\x00\x00\x00\x00mXmX\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xffmXmX\x00\x00\x00\x00mXmXmX\xff\xff\xff\xff\xff\xff\xff\xffmXmXmX\x00\x00\x00\x00mXmXmXmX\xff\xff\xff\xffmXmXmXmX\x00\x00\x00\x00mXmXmXmX3\x913\x91mXmXmXmX\x00\x00\x00\x00mXmXmX3\x913\x913\x913\x91mXmXmX\x00\x00\x00\x00mXmX3\x913\x913\x913\x913\x913\x91mXmX\x00\x00\x00\x00mX3\x913\x913\x913\x913\x913\x913\x913\x91mX\x00\x00\x00\x003\x913\x913\x913\x913\x913\x913\x913\x913\x913\x91\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00')
-    left_border=bytearray(b'\x00\x00\xe3\x0e\xe3\x0e\xedP\xe3\x0e\xe3\x0e\xe3\x0e\x00\x00\x00\x00\xedP\xedP\xedP\x00\x00\xedP\xedP\xfe\xd1\xedP\xedP\xe3\x0e\x00\x00\x00\x00\xedP\xfe\xd1\xfe\xd1\x00\x00\xedP\xedP\xfe\xd1\xedP\xedP\xe3\x0e\x00\x00\x00\x00\xedP\xfe\xd1\xfe\xd1\x00\x00\xedP\xedP\xfe\xd1\xedP\xedP\xe3\x0e\x00\x00\x00\x00\xedP\xfe\xd1\xfe\xd1\x00\x00\xe3\x0e\xe3\x0e\xedP\xe3\x0e\xe3\x0e\x00\x00\x00\x00\x00\x00\xedP\xfe\xd1\xfe\xd1\x00\x00\xe3\x0e\xe3\x0e\xedP\xe3\x0e\xe3\x0e\x00\x00\x00\x00\x00\x00\xedP\xfe\xd1\xfe\xd1\x00\x00\xfe\xd1\xfe\xd1\xfe\xd1\xfe\xd1\xfe\xd1\xedP\x00\x00\x00\x00\xedP\xfe\xd1\xfe\xd1\x00\x00\xedP\xedP\xfe\xd1\xedP\xedP\xe3\x0e\x00\x00\x00\x00\xedP\xfe\xd1\xfe\xd1\x00\x00\xedP\xedP\xfe\xd1\xedP\xedP\xe3\x0e\x00\x00\x00\x00\xedP\xfe\xd1\xfe\xd1\x00\x00\xe3\x0e\xe3\x0e\xedP\xe3\x0e\xe3\x0e\x00\x00\x00\x00\x00\x00\xedP\xfe\xd1\xfe\xd1\x00\x00\xfe\xd1\xfe\xd1\xfe\xd1\xfe\xd1\xfe\xd1\xedP\x00\x00\x00\x00\xedP\xfe\xd1\xfe\xd1\x00\x00\xfe\xd1\xfe\xd1\xfe\xd1\xfe\xd1\xfe\xd1\xedP\x00\x00\x00\x00\xedP\xfe\xd1\xfe\xd1')
-    right_border=bytearray(b'\xedP\xedP\xedP\x00\x00\x00\x00\xe3\x0e\xe3\x0e\xe3\x0e\xedP\xe3\x0e\xe3\x0e\x00\x00\xfe\xd1\xfe\xd1\xedP\x00\x00\x00\x00\xe3\x0e\xedP\xedP\xfe\xd1\xedP\xedP\x00\x00\xfe\xd1\xfe\xd1\xedP\x00\x00\x00\x00\xe3\x0e\xedP\xedP\xfe\xd1\xedP\xedP\x00\x00\xfe\xd1\xfe\xd1\xedP\x00\x00\x00\x00\xe3\x0e\xedP\xedP\xfe\xd1\xedP\xedP\x00\x00\xfe\xd1\xfe\xd1\xedP\x00\x00\x00\x00\x00\x00\xe3\x0e\xe3\x0e\xedP\xe3\x0e\xe3\x0e\x00\x00\xfe\xd1\xfe\xd1\xedP\x00\x00\x00\x00\x00\x00\xe3\x0e\xe3\x0e\xedP\xe3\x0e\xe3\x0e\x00\x00\xfe\xd1\xfe\xd1\xedP\x00\x00\x00\x00\xedP\xfe\xd1\xfe\xd1\xfe\xd1\xfe\xd1\xfe\xd1\x00\x00\xfe\xd1\xfe\xd1\xedP\x00\x00\x00\x00\xe3\x0e\xedP\xedP\xfe\xd1\xedP\xedP\x00\x00\xfe\xd1\xfe\xd1\xedP\x00\x00\x00\x00\xe3\x0e\xedP\xedP\xfe\xd1\xedP\xedP\x00\x00\xfe\xd1\xfe\xd1\xedP\x00\x00\x00\x00\x00\x00\xe3\x0e\xe3\x0e\xedP\xe3\x0e\xe3\x0e\x00\x00\xfe\xd1\xfe\xd1\xedP\x00\x00\x00\x00\xedP\xfe\xd1\xfe\xd1\xfe\xd1\xfe\xd1\xfe\xd1\x00\x00\xfe\xd1\xfe\xd1\xedP\x00\x00\x00\x00\xedP\xfe\xd1\xfe\xd1\xfe\xd1\xfe\xd1\xfe\xd1\x00\x00')
-    top_border=bytearray(b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\xedP\xedP\xedP\xedP\xedP\xedP\xedP\xedP\xedP\xedP\xedP\xedP\xedP\xedP\xedP\xedP\xedP\xedP\xedP\xedP\xedP\xedP\xedP\xedP\xfe\xd1\xfe\xd1\xfe\xd1\xfe\xd1\xfe\xd1\xfe\xd1\xfe\xd1\xfe\xd1\xfe\xd1\xfe\xd1\xfe\xd1\xfe\xd1\xedP\xedP\xedP\xedP\xedP\xedP\xedP\xedP\xedP\xedP\xedP\xedP\xedP\xedP\xedP\xedP\xedP\xedP\xedP\xedP\xedP\xedP\xedP\xedP\xe3\x0e\xe3\x0e\xe3\x0e\xe3\x0e\xe3\x0e\xe3\x0e\xe3\x0e\xe3\x0e\xe3\x0e\xe3\x0e\xe3\x0e\xe3\x0e\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\xedP\xedP\xedP\xedP\xedP\xedP\xedP\xedP\xedP\xedP\xedP\xedP\xfe\xd1\xfe\xd1\xfe\xd1\xfe\xd1\xfe\xd1\xfe\xd1\xfe\xd1\xfe\xd1\xfe\xd1\xfe\xd1\xfe\xd1\xfe\xd1\xfe\xd1\xfe\xd1\xfe\xd1\xfe\xd1\xfe\xd1\xfe\xd1\xfe\xd1\xfe\xd1\xfe\xd1\xfe\xd1\xfe\xd1\xfe\xd1')
-
-    pgb.add_sprite(tetris_wall,12,12) #0
-    pgb.add_sprite(bottom_border,12,12) #1
-    pgb.add_sprite(corner,12,12) #2
-    pgb.add_sprite(left_border,12,12) #3
-    pgb.add_sprite(right_border,12,12) #4
-    pgb.add_sprite(top_border,12,12) #5 
-
-
-    field = [[-1 for col in range(GRID_COLS)] for row in range(GRID_ROWS)]
-
-    # shape of the 7 tetrominos
-    # [0][1]
-    # [2][3]
-    # [4][5]
-    # [6][7]
-    # e.g. [3,4,5,7] is:
-    #    [ ]
-    # [ ][ ]
-    #    [ ]
-    tetrominos = [[1,3,5,7],
-                  [2,4,5,7],
-                  [3,5,4,6],
-                  [3,5,4,7],
-                  [2,3,5,7],
-                  [3,5,7,6],
-                  [2,3,4,5]]
-
-    # Game Boy Color Tetrominos colors
-    tetrominos_colors =[PicoGameBoy.color(239,146,132),
-                 PicoGameBoy.color(222,146,239),
-                 PicoGameBoy.color(239,170,132),
-                 PicoGameBoy.color(165,211,132),
-                 PicoGameBoy.color(99,219,222),
-                 PicoGameBoy.color(231,97,115),
-                 PicoGameBoy.color(0,0,0)]
-
-    # Color scheme
-    BLACK = PicoGameBoy.color(0,0,0)
-    WHITE = PicoGameBoy.color(255,255,255)
-    GREEN = PicoGameBoy.color(95, 185, 116)
-    GRID_BACKGROUND_COLOR = PicoGameBoy.color(255,211,132)
-    BACKGROUND_COLOR = PicoGameBoy.color(99,154,132)
-    BACKGROUND_COLOR2 = PicoGameBoy.color(57,89,41)
-    TEXT_COLOR = BLACK
-    TEXT_BACKGROUND_COLOR = WHITE
-
-    lines = 0
-    level = 0
-    score = 0
-    last_button="NONE"
-    has_rotated=False
-    now = time.ticks_ms()
-    n = randint(0, 6)
-    next_n = randint(0, 6)
-    x=[0,0,0,0]
-    y=[0,0,0,0]
-    prev_x=[0,0,0,0]
-    prev_y=[0,0,0,0]
-    for i in range(0,4):
-        x[i]=(tetrominos[n][i]) % 2;
-        y[i]=int(tetrominos[n][i] / 2);
-        
-        x[i]+=int(GRID_COLS/2)
+    # music and sound effects are mixed on core 1 when it is free
+    if pgb.start_audio():
+        songs.tetris(pgb)
 
+    sprites = load_sprites(pgb)
 
-    def collision(x,y):
-        for i in range(4):
-            # check collision against the border
-            if x[i]<0 or x[i]>=GRID_COLS or y[i]>=GRID_ROWS:
-                return True
-            # check collision against another triomino
-            if field[y[i]][x[i]]>=0:
-                return True
-                
-        return False
+    game = TetrisCore(randint(1, 0x3FFFFFFF))
+    field = game.field
+    # the first step counts from here, so the tetromino falls at once
+    # when the title screen is left
+    last = time.ticks_ms()
 
     def title_screen():
         # title screen
@@ -134,91 +211,21 @@ def tetris_main(gameboy):
                     time.sleep(0.020)
                 now = time.ticks_ms()
                 
-    def game_over_screen():
-        global GAME_OVER
-        GAME_OVER = True
-        song_state = False
-        pgb.fill_rect(100,87,120,60,BLACK)
-        pgb.center_text("GAME OVER",WHITE)
-        pgb.show()
-        time.sleep(3.500)
-
-
-    def draw_background():
-        pgb.fill(BACKGROUND_COLOR)
-        
-        for i in range(0,int(240/BLOCK_SIZE),2):
-            for j in range(0,int(324/BLOCK_SIZE),2):
-                pgb.fill_rect(j*BLOCK_SIZE,i*BLOCK_SIZE,BLOCK_SIZE,BLOCK_SIZE,BACKGROUND_COLOR2)
-                pgb.fill_rect((j+1)*BLOCK_SIZE,(i+1)*BLOCK_SIZE,BLOCK_SIZE,BLOCK_SIZE,BACKGROUND_COLOR2)
-                
-        pgb.fill_rect(GRID_OFFSET*BLOCK_SIZE,0,
-                      GRID_COLS*BLOCK_SIZE,GRID_ROWS*BLOCK_SIZE,
-                      GRID_BACKGROUND_COLOR)
-        
-        # add walls
-        for i in range(GRID_ROWS):
-            pgb.sprite(0,(GRID_OFFSET-1)*BLOCK_SIZE,i*BLOCK_SIZE)
-            pgb.sprite(0,(GRID_OFFSET+GRID_COLS)*BLOCK_SIZE,i*BLOCK_SIZE)
-        
-        # draw text (LINES)
-        pgb.fill_rect((GRID_OFFSET+GRID_COLS+1)*BLOCK_SIZE+1,16*BLOCK_SIZE,
-                      BLOCK_SIZE*7,BLOCK_SIZE*2,
-                      TEXT_BACKGROUND_COLOR)
-        pgb.text("LINES",(GRID_OFFSET+GRID_COLS+2)*BLOCK_SIZE+1,16*BLOCK_SIZE+1,TEXT_COLOR)
-        pgb.text("%8s" % lines,(GRID_OFFSET+GRID_COLS+2)*BLOCK_SIZE+1,17*BLOCK_SIZE+1,TEXT_COLOR)
-        
-        # draw text (LEVEL)
-        pgb.fill_rect((GRID_OFFSET+GRID_COLS+1)*BLOCK_SIZE+1,13*BLOCK_SIZE,
-                      BLOCK_SIZE*7,BLOCK_SIZE*2,
-                      TEXT_BACKGROUND_COLOR)
-        pgb.text("LEVEL",(GRID_OFFSET+GRID_COLS+2)*BLOCK_SIZE+1,13*BLOCK_SIZE+1,TEXT_COLOR)
-        pgb.text("%8s" % level,(GRID_OFFSET+GRID_COLS+2)*BLOCK_SIZE+1,14*BLOCK_SIZE+1,TEXT_COLOR)
-        
-        # draw text (SCORE)
-        pgb.fill_rect((GRID_OFFSET+GRID_COLS+1)*BLOCK_SIZE+1,10*BLOCK_SIZE,
-                      BLOCK_SIZE*7,BLOCK_SIZE*2,
-                      TEXT_BACKGROUND_COLOR)
-        pgb.text("SCORE",(GRID_OFFSET+GRID_COLS+2)*BLOCK_SIZE+1,10*BLOCK_SIZE+1,TEXT_COLOR)
-        pgb.text("%8s" % score,(GRID_OFFSET+GRID_COLS+2)*BLOCK_SIZE+1,11*BLOCK_SIZE+1,TEXT_COLOR)
-        
-        # next tetromino box
-        pgb.fill_rect((GRID_OFFSET+GRID_COLS + 2)*BLOCK_SIZE,2*BLOCK_SIZE,
-                      BLOCK_SIZE*6 ,BLOCK_SIZE*7,TEXT_BACKGROUND_COLOR)
-        
-        pgb.sprite(2,(GRID_OFFSET+GRID_COLS+2)*BLOCK_SIZE,2*BLOCK_SIZE) #upper left corner
-        pgb.sprite(5,(GRID_OFFSET+GRID_COLS+3)*BLOCK_SIZE,2*BLOCK_SIZE) #top border
-        pgb.sprite(5,(GRID_OFFSET+GRID_COLS+4)*BLOCK_SIZE,2*BLOCK_SIZE) #
-        pgb.sprite(5,(GRID_OFFSET+GRID_COLS+5)*BLOCK_SIZE,2*BLOCK_SIZE) #
-        pgb.sprite(5,(GRID_OFFSET+GRID_COLS+6)*BLOCK_SIZE,2*BLOCK_SIZE) #
-        pgb.sprite(2,(GRID_OFFSET+GRID_COLS+7)*BLOCK_SIZE,2*BLOCK_SIZE) #upper right corner
-        
-        pgb.sprite(2,(GRID_OFFSET+GRID_COLS+2)*BLOCK_SIZE,8*BLOCK_SIZE) #lower left corner
-        pgb.sprite(1,(GRID_OFFSET+GRID_COLS+3)*BLOCK_SIZE,8*BLOCK_SIZE) #lower border
-        pgb.sprite(1,(GRID_OFFSET+GRID_COLS+4)*BLOCK_SIZE,8*BLOCK_SIZE) #
-        pgb.sprite(1,(GRID_OFFSET+GRID_COLS+5)*BLOCK_SIZE,8*BLOCK_SIZE) #
-        pgb.sprite(1,(GRID_OFFSET+GRID_COLS+6)*BLOCK_SIZE,8*BLOCK_SIZE) #
-        pgb.sprite(2,(GRID_OFFSET+GRID_COLS+7)*BLOCK_SIZE,8*BLOCK_SIZE) #lower right corner
-        
-        for k in range(3,8):
-            pgb.sprite(3,(GRID_OFFSET+GRID_COLS+2)*BLOCK_SIZE,k*BLOCK_SIZE) #left border
-            pgb.sprite(4,(GRID_OFFSET+GRID_COLS+7)*BLOCK_SIZE,k*BLOCK_SIZE) #right border
-        
-        for i in range(4):
-            draw_block((GRID_OFFSET+GRID_COLS - 1)+tetrominos[next_n][i] % 2,
-                       3+int(tetrominos[next_n][i] / 2), next_n)
-
-    def draw_block(j,i,n):
-        # draw a tetris block of type n at the ith row and jth column
-        # of the grid
-
-        x = (GRID_OFFSET+j)*BLOCK_SIZE
-        y = i*BLOCK_SIZE
-        
-        pgb.fill_rect(x,y,BLOCK_SIZE,BLOCK_SIZE,tetrominos_colors[n]) # main color
-        pgb.rect(x,y,BLOCK_SIZE,BLOCK_SIZE,BLACK) # black border
-        pgb.line(x+3,y+3,x+5,y+3,WHITE)
-        pgb.line(x+3,y+3,x+3,y+5,WHITE)
+    def game_over_screen(t, shown):
+        # the game over box t ms after the end: it opens from its middle
+        # line, then GAME OVER blinks; draws it unless the phase is the
+        # one shown, and returns the phase
+        if t < GAME_OVER_OPEN_MS:
+            h = 30 * t // GAME_OVER_OPEN_MS + 1
+            if h != shown:
+                pgb.fill_rect(100,117-h,120,2*h,BLACK)
+            return h
+        phase = 32 + (t - GAME_OVER_OPEN_MS) // GAME_OVER_BLINK_MS
+        if phase != shown:
+            pgb.fill_rect(100,87,120,60,BLACK)
+            if not phase & 1:
+                pgb.center_text("GAME OVER",WHITE)
+        return phase
 
 
     #####################################################################
@@ -226,170 +233,130 @@ def tetris_main(gameboy):
     # show title screen and wait for a button
     title_screen()
 
+    # the static layer stays in the frame buffer from now on; the
+    # texts and the next tetromino are repainted when they change
+    draw_background(pgb, sprites)
+    shown_hud = None
+    shown_next = None
+    shown = shown_field()
+
+    # queue the rotate presses, so that a tap during the line
+    # animation still rotates the next tetromino
+    pgb.start_events()
+
+    # the game stops while an animation plays, but the loop goes on:
+    # the animations are drawn frame by frame as their time comes
+    state = PLAYING
+    state_ms = 0  # ticks_ms when the animation started
+    blinks = -1  # phase of the animation shown so far
+
     # game loop
     while True:
-        dx=0
-        dy=1
-        rotate=False
-        delay=500
-
-        if pgb.button_A() or pgb.button_B():
-            if last_button!="UP":
-                rotate=True
-            last_button="UP"
-        elif pgb.button_left():
-                last_button="LEFT"
-                dx=-1
-        elif pgb.button_right():
-                last_button="RIGHT"
-                dx=1
-        elif pgb.button_down():
-            last_button="DOWN"
-            delay=0
-        elif pgb.button_off():
-            #pgb.power_off()
-            pass
-        else:
-            last_button="NONE"
-
-        # save current position to restore it
-        # in case the requested move generates a collision
-        for i in range(4):
-            prev_x[i] = x[i]
-            prev_y[i] = y[i]
-        
-        # move left & right
-        for i in range(4):
-            x[i]+=dx
-            
-        if collision(x, y):
-            # collision detected => impossible move
-            # => restore previous position
-            for i in range(4):
-                x[i] = prev_x[i]
-                y[i] = prev_y[i]
-            
-        # rotate
-        if rotate:
-            # center of rotation
-            x0 = x[1]
-            y0 = y[1]
-            for i in range(4):
-                x_=y[i]-y0
-                y_=x[i]-x0
-                x[i]=x0-x_
-                y[i]=y0+y_
-            
-            if collision(x, y):
-                # collision detected => impossible move
-                # => restore previous position
-                for i in range(4):
-                    x[i] = prev_x[i]
-                    y[i] = prev_y[i]
+        ticks_ms = time.ticks_ms()
+
+        if state == GAME_OVER:
+            # a button leaves once the box is open
+            t = time.ticks_diff(ticks_ms, state_ms)
+            pgb.update_input()
+            if t >= GAME_OVER_MS or (t >= GAME_OVER_OPEN_MS and pgb.just_pressed()):
+                break
+            phase = game_over_screen(t, blinks)
+            if phase != blinks:
+                blinks = phase
+                pgb.show()
             else:
-                has_rotated=True
+                time.sleep(0.005)
+            continue
 
-        # move down
-        ticks_ms = time.ticks_ms()
-        if time.ticks_diff(ticks_ms, now) > delay:
-            # print(str(time.ticks_diff(ticks_ms, now)))
-            now = ticks_ms
-            
-            if has_rotated:
+        if state == CLEARING:
+            # all the completed lines blink white <-> black together,
+            # only their rows are sent to the screen
+            phase = time.ticks_diff(ticks_ms, state_ms) // BLINK_MS
+            if phase >= 2 * BLINKS:
+                pgb.sound(0)
+                state = PLAYING
+                # the tetromino starts to fall after the animation
+                last = ticks_ms
+            elif phase != blinks:
+                blinks = phase
+                pgb.sound(2000 if phase & 1 else 1100)
+                for i in game.cleared:
+                    pgb.fill_rect(GRID_OFFSET*BLOCK_SIZE,i*BLOCK_SIZE,
+                                  GRID_COLS*BLOCK_SIZE,BLOCK_SIZE,
+                                  BLACK if phase & 1 else WHITE)
+                    shown.rows[i] = -1
+                pgb.show()
+                continue
+            else:
+                time.sleep(0.005)
+                continue
+
+        buttons = 0
+
+        for button, edge, t in pgb.events():
+            if edge == PicoGameBoy.PRESS and button & (PicoGameBoy.A | PicoGameBoy.B):
+                buttons = TetrisCore.ROTATE
+
+        # one snapshot of the buttons held for the whole frame
+        pgb.update_input()
+        if pgb.pressed(PicoGameBoy.A | PicoGameBoy.B):
+            pass
+        elif pgb.pressed(PicoGameBoy.LEFT):
+            buttons |= TetrisCore.LEFT
+        elif pgb.pressed(PicoGameBoy.RIGHT):
+            buttons |= TetrisCore.RIGHT
+        elif pgb.pressed(PicoGameBoy.DOWN):
+            buttons |= TetrisCore.DOWN
+
+        game.step(buttons, time.ticks_diff(ticks_ms, last))
+        last = ticks_ms
+
+        if game.fell:
+            if game.rotated:
                 freq=180
-            elif delay>0:
+            elif not buttons & TetrisCore.DOWN:
                 freq=140
             else:
                 freq=0
             pgb.sound(freq)
-            has_rotated = False
-                
-            for i in range(4):
-                prev_x[i]=x[i]
-                prev_y[i]=y[i]
-                y[i]+=dy
-               
-            if collision(x,y):
-                # collision detected
-                
-                # collision at the top of the screen?
-                # => game over
-                for i in range(4):
-                    if prev_y[i]<=1:
-                        pgb.sound(0)
-                        game_over_screen()
-                
-                # => Store the last good position in the field
-                for i in range(4):
-                    field[prev_y[i]][prev_x[i]]=n
-                
-                # => choose randomly the next trinomino
-                n = next_n
-                next_n = randint(0, 6)
-                for i in range(4):
-                    x[i]=(tetrominos[n][i]) % 2;
-                    y[i]=int(tetrominos[n][i] / 2);
-                    
-                    x[i]+=int(GRID_COLS/2)
-                    
-    
-        # check lines
-        k=GRID_ROWS-1
-        for i in range(GRID_ROWS-1,0,-1):
-            count=0
-            for j in range(GRID_COLS):
-                if field[i][j]>=0:
-                    count+=1
-                field[k][j]=field[i][j]
-            if count<GRID_COLS:
-                k-=1
-            else:
-                # ith line complete
-                lines+=1
-                score+=40
-                
-                # make the line blink white <-> black
-                
-                for l in range(3):
-                    pgb.sound(1100)
-                    pgb.fill_rect(GRID_OFFSET*BLOCK_SIZE,i*BLOCK_SIZE,
-                                  GRID_COLS*BLOCK_SIZE,BLOCK_SIZE,WHITE)
-                    pgb.show()
-                    time.sleep(0.050)
-                    pgb.sound(2000)
-                    pgb.fill_rect(GRID_OFFSET*BLOCK_SIZE,i*BLOCK_SIZE,
-                                  GRID_COLS*BLOCK_SIZE,BLOCK_SIZE,BLACK)
-                    pgb.show()
-                    time.sleep(0.050)
-                pgb.sound(0)
-                
+
+        if game.game_over:
+            pgb.sound(0)
+            pgb.stop_sound()
+            state = GAME_OVER
+            state_ms = ticks_ms
+            blinks = -1
+            continue
+
+        if game.cleared:
+            # the frame buffer still shows the lines; the field below
+            # is drawn once they are gone
+            state = CLEARING
+            state_ms = ticks_ms
+            blinks = -1
+            continue
         
         #####################################################################
         # update screen 
-        
-        # background
-        draw_background()
-
-        # draw all the previous blocks
-        for i in range(GRID_ROWS):
-            for j in range(GRID_COLS):
-                if field[i][j]>=0:
-                    # non empty
-                    draw_block(j,i,field[i][j])
-        
-        # draw the current block
-        for i in range(4):
-            draw_block(x[i],y[i],n)
+
+        # scores and next tetromino, when they changed
+        if shown_hud != (game.lines, game.level, game.score):
+            shown_hud = (game.lines, game.level, game.score)
+            draw_hud(pgb, game.lines, game.level, game.score)
+        if shown_next != game.next_n:
+            shown_next = game.next_n
+            draw_next(pgb, game.next_n)
+
+        # the rows of the grid where the blocks or the current tetromino
+        # moved since the last frame
+        draw_field(pgb, field, shown, game.x, game.y, game.n)
         
         # transfer the frame buffer to the actual screen over the SPI bus
         pgb.show()
 
         pgb.sound(0)
-        global GAME_OVER
-        if GAME_OVER:
-            pgb.clear_ghost_array()
-            break
-        
-    if GAME_OVER:
-        GAME_OVER = False
-        return
+
+    pgb.stop_events()
+    pgb.stop_audio()
+    for handle in sprites:
+        pgb.remove_sprite(handle)
@@ -0,0 +1,267 @@
+# pgb_assets.py
+# Host-side asset compiler for the Raspberry Pi Pico Game Boy
+#
+# Runs with CPython on the development machine, never on the Pico. Images
+# become the pixel data that Chimera and FrameBuffer.blit() use as they
+# are (byte-swapped RGB565, or GS8/GS4 indexes with a Chimera.color
+# palette) and sounds become unsigned 8-bit mono at the rate of the mixer
+# with the volume already applied, so the games never convert anything.
+#
+#   python3 tools/pgb_assets.py pack game.pgba NAME=FILE[:OPTION...] ...
+#   python3 tools/pgb_assets.py wav music.wav source.wav [--rate R] [--volume V]
+#   python3 tools/pgb_assets.py list game.pgba
+#
+# Image options (PNG, BMP, anything Pillow opens):
+#   key=#rrggbb    pixels of this color are transparent, like alpha < 128
+#   format=F       rgb565, gs8, gs4 or auto (default: the smallest that
+#                  holds the colors; gs4 needs an even width)
+# Sound options (8 or 16 bit PCM WAV, any rate, mono or stereo):
+#   rate=R         sample rate of the entry, 8000 by default
+#   volume=V       gain from 0 to 1 applied while converting
+#
+# Transparent pixels get a color that no opaque pixel uses (or palette
+# index 0 holding such a color), stored as the key of the entry, so
+# PicoGameBoy.load_sprite() skips them without being told.
+#
+# Pillow is only needed for images.
+
+import argparse
+import os
+import struct
+import sys
+import wave
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from AssetPack import AssetPack, write_pack, PCM8  # noqa: E402
+
+# framebuf formats
+RGB565 = 1
+GS4_HMSB = 2
+GS8 = 6
+
+RATE = 8000
+# Preferred colors for transparent pixels, tried in order
+KEY_COLORS = (0xF81F, 0x07E0, 0x001F, 0xF800)
+
+
+def rgb565(r, g, b):
+    # Same rounding as Chimera.color, but not byte-swapped
+    return ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+
+
+def swap(c):
+    # RGB565 value to the word Chimera.color returns
+    return ((c & 0xFF) << 8) | (c >> 8)
+
+
+def parse_color(text):
+    text = text.lstrip('#')
+    if len(text) != 6:
+        raise ValueError('Colors are written as #rrggbb, not %s.' % text)
+    v = int(text, 16)
+    return v >> 16, (v >> 8) & 0xFF, v & 0xFF
+
+
+def free_color(used):
+    # An RGB565 color not in `used`
+    for c in KEY_COLORS:
+        if c not in used:
+            return c
+    for c in range(0x10000):
+        if c not in used:
+            return c
+    raise ValueError('Every RGB565 color is used, none is left for transparency.')
+
+
+def load_image(path, key=None):
+    """
+    Read the image at `path` and return (width, height, pixels) where pixels
+    is a list of RGB565 values, None for transparent pixels.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        raise SystemExit('Converting images needs Pillow: pip install Pillow')
+    with Image.open(path) as im:
+        im = im.convert('RGBA')
+        w, h = im.size
+        data = im.tobytes()
+        pixels = []
+        for i in range(0, len(data), 4):
+            r, g, b, a = data[i:i + 4]
+            if a < 128 or (r, g, b) == key:
+                pixels.append(None)
+            else:
+                pixels.append(rgb565(r, g, b))
+    return w, h, pixels
+
+
+def compile_image(name, w, h, pixels, fmt='auto'):
+    """
+    Encode the pixels of load_image() as an AssetPack entry tuple (name, w,
+    h, format, data, palette, key).
+    """
+    opaque = set(p for p in pixels if p is not None)
+    keyed = None in pixels
+    colors = len(opaque) + (1 if keyed else 0)
+    if fmt == 'auto':
+        if colors <= 16 and w % 2 == 0:
+            fmt = 'gs4'
+        elif colors <= 256:
+            fmt = 'gs8'
+        else:
+            fmt = 'rgb565'
+    if fmt == 'rgb565':
+        key = free_color(opaque) if keyed else -1
+        data = bytearray()
+        for p in pixels:
+            data += struct.pack('>H', key if p is None else p)
+        return name, w, h, RGB565, data, None, swap(key) if keyed else -1
+    limit = 16 if fmt == 'gs4' else 256
+    if fmt not in ('gs4', 'gs8'):
+        raise ValueError('Unknown format %s.' % fmt)
+    if colors > limit:
+        raise ValueError('%s has %d colors, %s holds %d.' % (name, colors, fmt, limit))
+    if fmt == 'gs4' and w % 2:
+        raise ValueError('%s is %d pixels wide, gs4 needs an even width.' % (name, w))
+    # blit() compares the key after the palette lookup, so the transparent
+    # index must hold a color no opaque index has
+    palette = ([free_color(opaque)] if keyed else []) + sorted(opaque)
+    index = {c: i for i, c in enumerate(palette)}
+    codes = [0 if p is None else index[p] for p in pixels]
+    if fmt == 'gs8':
+        data = bytearray(codes)
+        fmt = GS8
+    else:
+        data = bytearray((codes[i] << 4) | codes[i + 1] for i in range(0, len(codes), 2))
+        fmt = GS4_HMSB
+    return name, w, h, fmt, data, [swap(c) for c in palette], 0 if keyed else -1
+
+
+def load_sound(path, rate=RATE, volume=1.0):
+    """
+    Read the 8 or 16 bit PCM WAV file at `path` and return its samples as
+    unsigned 8-bit mono at `rate`, scaled by `volume`.
+    """
+    with wave.open(path, 'rb') as f:
+        channels = f.getnchannels()
+        width = f.getsampwidth()
+        src_rate = f.getframerate()
+        raw = f.readframes(f.getnframes())
+    if width == 1:
+        values = [b - 128 for b in raw]
+        full = 128.0
+    elif width == 2:
+        values = list(struct.unpack('<%dh' % (len(raw) // 2), raw))
+        full = 32768.0
+    else:
+        raise ValueError('%s: only 8 and 16 bit WAV files are supported.' % path)
+    # Downmix to mono in -1..1
+    n = len(values) // channels
+    mono = [sum(values[i * channels:(i + 1) * channels]) / (channels * full) for i in range(n)]
+    # Linear resampling
+    out_n = n * rate // src_rate
+    out = bytearray(out_n)
+    for i in range(out_n):
+        t = i * src_rate / rate
+        j = int(t)
+        a = mono[j]
+        b = mono[j + 1] if j + 1 < n else a
+        s = (a + (b - a) * (t - j)) * volume
+        out[i] = min(max(int(round(s * 128)) + 128, 0), 255)
+    return out
+
+
+def compile_sound(name, path, rate=RATE, volume=1.0):
+    return name, rate, 1, PCM8, load_sound(path, rate, volume), None
+
+
+def parse_item(item):
+    # 'name=path:opt=value:...' to (name, path, {opt: value})
+    name, sep, rest = item.partition('=')
+    if not sep or not rest:
+        raise ValueError('Items are written NAME=FILE[:OPTION=VALUE...], not %s.' % item)
+    parts = rest.split(':')
+    options = {}
+    for opt in parts[1:]:
+        k, sep, v = opt.partition('=')
+        if not sep:
+            raise ValueError('Option %s of %s has no value.' % (opt, name))
+        options[k] = v
+    return name, parts[0], options
+
+
+def compile_item(item):
+    name, path, options = parse_item(item)
+    if path.lower().endswith('.wav'):
+        unknown = set(options) - {'rate', 'volume'}
+        if unknown:
+            raise ValueError('Unknown sound options %s.' % ', '.join(sorted(unknown)))
+        return compile_sound(name, path, int(options.get('rate', RATE)),
+                             float(options.get('volume', 1)))
+    unknown = set(options) - {'key', 'format'}
+    if unknown:
+        raise ValueError('Unknown image options %s.' % ', '.join(sorted(unknown)))
+    key = parse_color(options['key']) if 'key' in options else None
+    w, h, pixels = load_image(path, key)
+    return compile_image(name, w, h, pixels, options.get('format', 'auto'))
+
+
+def write_wav(path, samples, rate):
+    # 8-bit mono WAV for Mixer.play_music() and PicoGameBoy.play_sound()
+    with wave.open(path, 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(1)
+        f.setframerate(rate)
+        f.writeframes(bytes(samples))
+
+
+FORMATS = {RGB565: 'rgb565', GS4_HMSB: 'gs4', GS8: 'gs8', PCM8: 'pcm8'}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Pico Game Boy asset compiler')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('pack', help='compile images and sounds into an asset pack')
+    p.add_argument('output')
+    p.add_argument('items', nargs='+', metavar='NAME=FILE[:OPTION=VALUE...]')
+    p = sub.add_parser('wav', help='convert a WAV file to 8-bit mono for streaming')
+    p.add_argument('output')
+    p.add_argument('input')
+    p.add_argument('--rate', type=int, default=RATE)
+    p.add_argument('--volume', type=float, default=1.0)
+    p = sub.add_parser('list', help='show the entries of an asset pack')
+    p.add_argument('pack')
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == 'pack':
+            assets = [compile_item(item) for item in args.items]
+            write_pack(args.output, assets)
+            size = os.path.getsize(args.output)
+            print('%s: %d entries, %d bytes' % (args.output, len(assets), size))
+        elif args.command == 'wav':
+            samples = load_sound(args.input, args.rate, args.volume)
+            write_wav(args.output, samples, args.rate)
+            print('%s: %d samples at %d Hz' % (args.output, len(samples), args.rate))
+        else:
+            with AssetPack(args.pack) as pack:
+                for name in pack.names():
+                    w, h, fmt, size = pack.info(name)
+                    palette = pack.palette(name)
+                    key = pack.key(name)
+                    if fmt == PCM8:
+                        print('%-16s pcm8   %d Hz, %d samples' % (name, w, size))
+                    else:
+                        print('%-16s %-6s %dx%d, %d bytes%s%s' % (
+                            name, FORMATS.get(fmt, fmt), w, h, size,
+                            ', %d colors' % len(palette) if palette else '',
+                            '' if key == -1 else ', key index %d' % key if palette
+                            else ', key 0x%04x' % key))
+    except (ValueError, OSError) as e:
+        raise SystemExit('error: %s' % e)
+
+
+if __name__ == '__main__':
+    main()